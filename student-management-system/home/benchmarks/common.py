@@ -0,0 +1,141 @@
+# benchmarks/common.py
+"""
+Shared setup for the standalone benchmark scripts.
+
+Each script runs against a throwaway SQLite database in a temp directory, so
+it never touches db.sqlite3:
+
+    python benchmarks/export_semester_data.py --rows 100000
+"""
+import atexit
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    """Point Django at a fresh temp database, migrate it and return its path"""
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'home.settings')
+
+    from django.conf import settings
+    db_dir = tempfile.mkdtemp(prefix='bench_')
+    atexit.register(shutil.rmtree, db_dir, ignore_errors=True)
+    db_path = Path(db_dir) / 'bench.sqlite3'
+    settings.DATABASES['default']['NAME'] = db_path
+
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    return db_path
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB (ru_maxrss is KiB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed(label, func, repeat):
+    """Print the median time, query count and row count of ``repeat`` runs of func; returns its last result"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            rows = func()
+            timings.append(time.perf_counter() - started)
+    print(f"{label:<32} {statistics.median(timings) * 1000:8.1f} ms  {len(queries)} queries  {len(rows)} rows")
+    return rows
+
+
+def measure(label, func):
+    """Run func in a forked child so every measurement gets its own peak RSS"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        from django.db import connections
+        connections.close_all()
+        before = peak_rss_mb()
+        started = time.perf_counter()
+        detail = func()
+        elapsed = time.perf_counter() - started
+        os.write(write_fd, f"{elapsed:.2f}s  peak RSS {peak_rss_mb():.1f} MiB (+{peak_rss_mb() - before:.1f})  {detail}".encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        result = pipe.read()
+    os.waitpid(pid, 0)
+    print(f"{label:<28} {result}")
+
+
+def seed_students(count, prefix='bench'):
+    """Bulk create students (with users and parents) and return them"""
+    from django.contrib.auth import get_user_model
+    from student.models import Student, Parent
+
+    users = get_user_model().objects.bulk_create([
+        get_user_model()(
+            username=f'{prefix}{i}@example.com',
+            email=f'{prefix}{i}@example.com',
+            password='!',
+            is_student=True
+        ) for i in range(count)
+    ], batch_size=500)
+    parents = Parent.objects.bulk_create([
+        Parent(
+            father_name=f'Father{i}', father_mobile='9876543210', father_email=f'father{i}@example.com',
+            mother_name=f'Mother{i}', mother_mobile='8765432109', mother_email=f'mother{i}@example.com',
+            present_address='123 Street', permanent_address='456 Avenue'
+        ) for i in range(count)
+    ], batch_size=500)
+    return Student.objects.bulk_create([
+        Student(
+            user=user, parent=parent,
+            first_name=f'Student{i}', last_name=f'Last{i}',
+            gender='Male', date_of_birth='2000-01-01', student_class='10', religion='Unknown',
+            joining_date='2025-08-01', mobile_number='1234567890', admission_number=f'ADM{i:05d}',
+            section='A', email=f'{prefix}{i}@example.com'
+        ) for i, (user, parent) in enumerate(zip(users, parents))
+    ], batch_size=500)
+
+
+def seed_semester(name='Benchmark', department_name='Benchmarks'):
+    """Create a department and a semester (with its default batch)"""
+    from department.models import Department
+    from semesters.models import Semester
+
+    department = Department.objects.create(department_name=department_name, department_start_date='2020-01-01')
+    return Semester.objects.create(
+        semester_name=name,
+        academic_year='2025-2026',
+        department=department,
+        start_date='2025-09-01',
+        end_date='2025-12-20'
+    )
+
+
+def seed_teachers(count, prefix='bench'):
+    """Bulk create teachers (every tenth one inactive) and return them"""
+    from teachers.models import Teacher
+
+    return Teacher.objects.bulk_create([
+        Teacher(
+            first_name=f'Teacher{i}', last_name=f'Last{i}', gender='Male', date_of_birth='1980-01-01',
+            mobile='1234567890', joining_date='2020-01-01', qualification='MSc',
+            username=f'{prefix}{i}', email=f'{prefix}{i}@example.com', address='123 Street',
+            city='City', state='State', zip_code='12345', country='Country', is_active=i % 10 != 0
+        ) for i in range(count)
+    ], batch_size=500)
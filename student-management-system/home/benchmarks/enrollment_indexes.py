@@ -0,0 +1,156 @@
+# benchmarks/enrollment_indexes.py
+"""
+Query plans of the enrollment lookups the semesters views run, without and
+with the partial indexes over active enrollments (semesters migration 0007).
+
+Seeds several years of semesters whose enrollments are mostly completed or
+dropped, drops the indexes, prints EXPLAIN QUERY PLAN and timings for each
+query, then recreates them and prints the same again.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import setup_django, seed_students, seed_semester
+
+
+def seed(semesters, students_per_semester, subjects_per_semester, subjects_per_student, current):
+    from semesters.models import Semester, Batch, SemesterSubject, SemesterEnrollment, SubjectEnrollment
+    from subjects.models import Subject
+
+    department = seed_semester().department
+    # Each semester gets its default batch from bulk_create, plus a second section
+    rows = Semester.objects.bulk_create([
+        Semester(
+            semester_name=f'Semester {i}', academic_year='2025-2026', department=department,
+            start_date='2025-09-01', end_date='2025-12-20',
+            status='running' if i >= semesters - current else 'completed'
+        ) for i in range(semesters)
+    ])
+    Batch.objects.bulk_create([
+        Batch(semester=semester, batch_name=f'{semester.semester_name} - Section B', academic_year='2025-2026')
+        for semester in rows
+    ])
+    batches = list(Batch.objects.filter(semester__in=rows).order_by('id'))
+    subjects = [Subject.objects.create(subject_name=f'Subject {i}', class_name='10') for i in range(subjects_per_semester)]
+    semester_subjects = SemesterSubject.objects.bulk_create([
+        SemesterSubject(semester=semester, subject=subject) for semester in rows for subject in subjects
+    ], batch_size=500)
+    students = seed_students(students_per_semester * 2)
+
+    rng = random.Random(0)
+    for semester in rows:
+        status = 'active' if semester.status == 'running' else 'completed'
+        sections = [batch for batch in batches if batch.semester_id == semester.id]
+        offered = [subject for subject in semester_subjects if subject.semester_id == semester.id]
+        enrollments = SemesterEnrollment.objects.bulk_create([
+            SemesterEnrollment(
+                semester=semester, student=student, batch=sections[index % 2],
+                status='dropped' if rng.random() < 0.1 else status
+            ) for index, student in enumerate(rng.sample(students, students_per_semester))
+        ], batch_size=500)
+        SubjectEnrollment.objects.bulk_create([
+            SubjectEnrollment(
+                semester_subject=subject, student_id=enrollment.student_id,
+                semester_enrollment=enrollment, status=enrollment.status
+            ) for enrollment in enrollments for subject in rng.sample(offered, subjects_per_student)
+        ], batch_size=500)
+    return rows[-1]
+
+
+def view_queries(semester):
+    """The enrollment lookups of the semesters views, as lazy querysets"""
+    from django.db.models import Count, Exists, OuterRef, Q
+    from semesters.models import Semester, SemesterSubject, SemesterEnrollment, SubjectEnrollment
+    from student.models import Student
+
+    batch = semester.batches.order_by('id').first()
+    semester_subject = SemesterSubject.objects.filter(semester=semester).order_by('id').first()
+    enrollment = SemesterEnrollment.objects.filter(semester=semester, status='active').order_by('id').first()
+    student_id = enrollment.student_id
+    active_subject = SubjectEnrollment.objects.filter(semester_subject=semester_subject, status='active')
+    semester_enrollment_ids = list(active_subject.values_list('semester_enrollment_id', flat=True)[:200])
+
+    return {
+        'dashboard active students': SemesterEnrollment.objects.filter(status='active').order_by().values(
+            'student_id'
+        ).distinct(),
+        'semester_detail student count': Semester.objects.filter(pk=semester.pk).annotate(
+            student_count=Count('semester_enrollments', filter=Q(semester_enrollments__status='active'))
+        ),
+        'batch_detail enrolled': SemesterEnrollment.objects.filter(batch=batch, status='active'),
+        'available students (semester)': Student.objects.exclude(
+            id__in=SemesterEnrollment.objects.filter(semester=semester, status='active').values('student_id')
+        ).values('id'),
+        'move/remove batch lookup': SemesterEnrollment.objects.filter(
+            batch=batch, student_id=student_id, status='active'
+        ).values('id'),
+        'enrolled in semester check': SemesterEnrollment.objects.filter(
+            semester=semester, student_id=student_id, status='active'
+        ).values('id'),
+        'subject roster enrolled': Student.objects.filter(Exists(active_subject.filter(student=OuterRef('pk')))).values('id'),
+        'subject roster available': Student.objects.exclude(id__in=active_subject.values('student_id')).values('id'),
+        'remaining subjects (grouped)': SubjectEnrollment.objects.filter(
+            semester_enrollment_id__in=semester_enrollment_ids, status='active'
+        ).exclude(semester_subject=semester_subject).order_by().values('semester_enrollment_id').annotate(count=Count('id')),
+        'remaining subjects (student)': SubjectEnrollment.objects.filter(
+            semester_enrollment__semester=semester, student_id=student_id, status='active'
+        ).values('id'),
+    }
+
+
+def report(queries, repeat):
+    for label, queryset in queries.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append(time.perf_counter() - started)
+        print(f"  {label:<32} {statistics.median(timings) * 1000:8.2f} ms")
+        for line in queryset.explain().splitlines():
+            print(f"      {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--semesters', type=int, default=24)
+    parser.add_argument('--students', type=int, default=1500, help="Enrollments per semester")
+    parser.add_argument('--subjects', type=int, default=6, help="Subjects per semester")
+    parser.add_argument('--subjects-per-student', type=int, default=4)
+    parser.add_argument('--current', type=int, default=2, help="Semesters still running")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    semester = seed(args.semesters, args.students, args.subjects, args.subjects_per_student, args.current)
+    print(f"Seeded {args.semesters} semesters ({args.semesters * args.students} semester enrollments) in {db_path}")
+
+    from django.db import connection
+    from semesters.models import SemesterEnrollment, SubjectEnrollment
+
+    indexes = [(model, index) for model in (SemesterEnrollment, SubjectEnrollment) for index in model._meta.indexes]
+    queries = view_queries(semester)
+
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    print("\nWithout the active enrollment indexes")
+    report(queries, args.repeat)
+
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.add_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    print("\nWith the active enrollment indexes")
+    report(queries, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
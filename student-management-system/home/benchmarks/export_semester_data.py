@@ -0,0 +1,68 @@
+# benchmarks/export_semester_data.py
+"""
+Time and peak RSS of the semester CSV export.
+
+Seeds one semester with --rows active subject enrollments, then compares the
+streaming export (consumed chunk by chunk, as StreamingHttpResponse does)
+against materialising the whole CSV in memory, which is what the old
+HttpResponse export did.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import setup_django, measure, seed_students, seed_semester
+
+
+def seed(rows, subjects):
+    from semesters.models import SemesterSubject, SemesterEnrollment, SubjectEnrollment
+    from subjects.models import Subject
+
+    semester = seed_semester()
+    batch = semester.batches.get()
+    students = seed_students(-(-rows // subjects))
+    semester_enrollments = SemesterEnrollment.objects.bulk_create([
+        SemesterEnrollment(semester=semester, student=student, batch=batch) for student in students
+    ], batch_size=500)
+
+    for index in range(subjects):
+        semester_subject = SemesterSubject.objects.create(
+            semester=semester,
+            subject=Subject.objects.create(subject_name=f'Subject {index:02d}', class_name='10')
+        )
+        SubjectEnrollment.objects.bulk_create([
+            SubjectEnrollment(semester_subject=semester_subject, student=enrollment.student, semester_enrollment=enrollment)
+            for enrollment in semester_enrollments[:rows - index * len(students)]
+        ], batch_size=500)
+    return semester
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--subjects', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    semester = seed(args.rows, args.subjects)
+    print(f"Seeded {args.rows} enrollment rows in {db_path}")
+
+    from semesters.services.export import semester_export_rows, csv_chunks, gzip_chunks
+
+    def streamed():
+        return f"{sum(len(chunk) for chunk in csv_chunks(semester_export_rows(semester))):,} bytes"
+
+    def streamed_gzip():
+        return f"{sum(len(chunk) for chunk in gzip_chunks(csv_chunks(semester_export_rows(semester)))):,} bytes"
+
+    def buffered():
+        return f"{len(b''.join(list(csv_chunks(list(semester_export_rows(semester)))))):,} bytes"
+
+    measure('streaming', streamed)
+    measure('streaming + gzip', streamed_gzip)
+    measure('fully buffered', buffered)
+
+
+if __name__ == '__main__':
+    main()
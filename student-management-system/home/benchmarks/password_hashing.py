@@ -0,0 +1,47 @@
+# benchmarks/password_hashing.py
+"""
+Wall time of hashing passwords for --accounts new accounts, one after the
+other in this process (what create_user/set_password per account costs)
+against home_auth.hashing fanning them out over --workers processes, plus a
+parallel mass reset of that many seeded accounts.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import setup_django, measure, seed_students
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--accounts', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None, help="Default: PASSWORD_HASH_WORKERS or one per CPU")
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    seed_students(args.accounts)
+    print(f"Seeded {args.accounts} accounts in {db_path}")
+
+    from django.contrib.auth import get_user_model
+    from home_auth.hashing import hash_passwords, reset_passwords, worker_count
+
+    workers = worker_count(args.workers)
+    passwords = ['student@1234'] * args.accounts
+
+    def serial():
+        return f"{len(hash_passwords(passwords, workers=1))} hashes"
+
+    def parallel():
+        return f"{len(hash_passwords(passwords, workers=workers))} hashes"
+
+    def reset():
+        return f"{reset_passwords(get_user_model().objects.all(), 'changed@1234', workers=workers)} accounts"
+
+    measure('serial', serial)
+    measure(f'process pool ({workers} workers)', parallel)
+    measure(f'mass reset ({workers} workers)', reset)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/semester_list.py
+"""
+Query time of the semester_list page over a large semester history.
+
+Compares the old list query (three joined Count()s, prefetches and OFFSET
+pagination) with the subquery counts and keyset pagination now used by
+semester_list, on the first page and on a deep page.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import setup_django, seed_students, seed_semester, timed
+
+PER_PAGE = 10
+
+
+def seed(semesters, students_per_semester, subjects_per_semester):
+    from semesters.models import Semester, SemesterSubject, SemesterEnrollment
+    from subjects.models import Subject
+
+    department = seed_semester().department
+    # bulk_create assigns the IDs and slugs and adds each semester's default batch
+    rows = Semester.objects.bulk_create([
+        Semester(
+            semester_name=f'Semester {i}', academic_year='2025-2026', department=department,
+            start_date='2025-09-01', end_date='2025-12-20'
+        ) for i in range(semesters)
+    ], batch_size=500)
+    subjects = [Subject.objects.create(subject_name=f'Subject {i}', class_name='10') for i in range(subjects_per_semester)]
+    SemesterSubject.objects.bulk_create([
+        SemesterSubject(semester=semester, subject=subject) for semester in rows for subject in subjects
+    ], batch_size=500)
+    students = seed_students(students_per_semester)
+    SemesterEnrollment.objects.bulk_create([
+        SemesterEnrollment(semester=semester, student=student) for semester in rows for student in students
+    ], batch_size=500)
+
+
+def old_page_queryset():
+    from django.db.models import Count, Q
+    from semesters.models import Semester
+
+    return Semester.objects.select_related('department', 'created_by').prefetch_related(
+        'semester_subjects__teacher',
+        'semester_subjects__subject',
+        'semester_enrollments',
+        'batches'
+    ).annotate(
+        student_count=Count('semester_enrollments', filter=Q(semester_enrollments__status='active')),
+        subject_count=Count('semester_subjects'),
+        batch_count=Count('batches')
+    )
+
+
+def old_page(page_number):
+    from django.core.paginator import Paginator
+    return list(Paginator(old_page_queryset(), PER_PAGE).get_page(page_number))
+
+
+def new_page(cursor):
+    from school.pagination import KeysetPaginator, subquery_count
+    from semesters.models import Semester, Batch, SemesterSubject, SemesterEnrollment
+
+    semesters = Semester.objects.select_related('department').annotate(
+        student_count=subquery_count(SemesterEnrollment.objects.filter(status='active'), 'semester'),
+        subject_count=subquery_count(SemesterSubject.objects.all(), 'semester'),
+        batch_count=subquery_count(Batch.objects.all(), 'semester')
+    )
+    return list(KeysetPaginator(semesters, PER_PAGE, ordering=('-created_at', 'id')).get_page(after=cursor))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--semesters', type=int, default=5000)
+    parser.add_argument('--students', type=int, default=10, help="Enrollments per semester")
+    parser.add_argument('--subjects', type=int, default=3, help="Subjects per semester")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    if args.semesters < 2 * PER_PAGE:
+        parser.error(f"--semesters must be at least {2 * PER_PAGE} to have a deep page")
+
+    db_path = setup_django()
+    seed(args.semesters, args.students, args.subjects)
+    print(f"Seeded {args.semesters} semesters in {db_path}")
+
+    from school.pagination import KeysetPaginator
+    from semesters.models import Semester
+
+    # A few pages from the end, but never before page 2
+    deep_page = max(2, args.semesters // PER_PAGE - 5)
+    # Cursor pointing at the last row of the page before deep_page
+    paginator = KeysetPaginator(Semester.objects.all(), PER_PAGE, ordering=('-created_at', 'id'))
+    anchor = Semester.objects.order_by('-created_at', 'id')[(deep_page - 1) * PER_PAGE - 1]
+    deep_cursor = paginator.encode_cursor(anchor)
+
+    timed('OFFSET + joined counts, page 1', lambda: old_page(1), args.repeat)
+    timed('keyset + subqueries, page 1', lambda: new_page(None), args.repeat)
+    timed(f'OFFSET + joined counts, page {deep_page}', lambda: old_page(deep_page), args.repeat)
+    new_deep = timed(f'keyset + subqueries, page {deep_page}', lambda: new_page(deep_cursor), args.repeat)
+
+    # Joined counts multiply each other, the subqueries do not
+    semester = new_deep[0]
+    inflated = old_page_queryset().get(pk=semester.pk)
+    print(f"counts for {semester.semester_name}: joined {inflated.student_count}/{inflated.subject_count}/{inflated.batch_count}, "
+          f"subqueries {semester.student_count}/{semester.subject_count}/{semester.batch_count} (students/subjects/batches)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/student_list.py
+"""
+Query time of the student directory at --students students.
+
+Compares the old student_list (every column plus the parent join, the whole
+table rendered, and a full evaluation for the emptiness check) with the
+keyset paginated, projected pages of student.directory, on the first page
+and on a deep page.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import setup_django, seed_students, timed
+
+
+def old_list():
+    from student.models import Student
+
+    students = Student.objects.select_related('parent').all()
+    bool(students)
+    return list(students)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    seed_students(args.students)
+    print(f"Seeded {args.students} students in {db_path}")
+
+    from school.pagination import KeysetPaginator
+    from student import directory
+    from student.models import Student
+
+    anchor = Student.objects.order_by('id')[args.students - directory.PER_PAGE * 5]
+    deep_cursor = KeysetPaginator(Student.objects.all(), directory.PER_PAGE, ('id',)).encode_cursor(anchor)
+
+    timed('old list (all rows + parent)', old_list, min(args.repeat, 3))
+    timed('keyset page 1', lambda: list(directory.directory_page()), args.repeat)
+    timed('keyset deep page', lambda: list(directory.directory_page(after=deep_cursor)), args.repeat)
+    timed('count estimate (cold)', lambda: [directory.forget_count(), directory.count_estimate()], args.repeat)
+    timed('count estimate (cached)', lambda: [directory.count_estimate()], args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/student_search.py
+"""
+Student search latency: the old icontains OR chain against the indexed
+search in student.search (FTS5 trigram on SQLite), over --students rows.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import setup_django, seed_students
+
+QUERIES = ['student1234', 'last19999', 'bench4242@', 'ben-000777', 'student12 last12', 'nobody-matches']
+LIMIT = 15
+
+
+def old_search(query):
+    from django.db.models import Q
+    from student.models import Student
+
+    return list(Student.objects.filter(
+        Q(user__email__icontains=query) |
+        Q(first_name__icontains=query) |
+        Q(last_name__icontains=query) |
+        Q(student_id__icontains=query),
+        user__is_active=True
+    ).select_related('user')[:LIMIT])
+
+
+def new_search(query):
+    from student.models import Student
+    from student.search import search_students
+
+    return list(search_students(query, Student.objects.filter(user__is_active=True)).select_related('user')[:LIMIT])
+
+
+def timed(func, query, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = func(query)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--students', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    seed_students(args.students)
+    print(f"Seeded {args.students} students in {db_path}")
+
+    from student.search import rebuild_index
+    started = time.perf_counter()
+    rebuild_index()
+    print(f"Index rebuilt in {time.perf_counter() - started:.1f}s")
+
+    print(f"{'query':<20} {'icontains OR':>16} {'indexed search':>16}")
+    for query in QUERIES:
+        old_ms, old_rows = timed(old_search, query, args.repeat)
+        new_ms, new_rows = timed(new_search, query, args.repeat)
+        print(f"{query:<20} {old_ms:9.1f} ms ({old_rows:2d}) {new_ms:9.1f} ms ({new_rows:2d})")
+
+
+if __name__ == '__main__':
+    main()
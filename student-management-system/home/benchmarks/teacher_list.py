@@ -0,0 +1,59 @@
+# benchmarks/teacher_list.py
+"""
+Query time of the teacher directory at --teachers teachers.
+
+Compares the old teacher_list (every column of every teacher rendered in one
+table) with the keyset paginated, projected pages of teachers.directory:
+the first page, a deep page, a department filtered page, the JSON variant
+and the cached total count.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import setup_django, seed_semester, seed_teachers, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--teachers', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    teachers = seed_teachers(args.teachers)
+    print(f"Seeded {args.teachers} teachers in {db_path}")
+
+    from school.pagination import KeysetPaginator
+    from semesters.models import SemesterSubject
+    from subjects.models import Subject
+    from teachers import directory
+    from teachers.models import Teacher
+
+    # One department teaching 200 subjects, each with its own teacher
+    semester = seed_semester()
+    subjects = Subject.objects.bulk_create([Subject(subject_name=f'Subject {i}', class_name='10') for i in range(200)])
+    SemesterSubject.objects.bulk_create([
+        SemesterSubject(semester=semester, subject=subject, teacher=teacher)
+        for subject, teacher in zip(subjects, teachers[::args.teachers // 200 or 1])
+    ])
+    department = semester.department_id
+
+    anchor = Teacher.objects.order_by('id')[args.teachers - directory.PER_PAGE * 5]
+    deep_cursor = KeysetPaginator(Teacher.objects.all(), directory.PER_PAGE, ('id',)).encode_cursor(anchor)
+
+    timed('old list (all rows)', lambda: list(Teacher.objects.all()), min(args.repeat, 3))
+    timed('keyset page 1', lambda: list(directory.directory_page()), args.repeat)
+    timed('keyset deep page', lambda: list(directory.directory_page(after=deep_cursor)), args.repeat)
+    timed('department page', lambda: list(directory.directory_page(department=department)), args.repeat)
+    timed('active page', lambda: list(directory.directory_page(active=True)), args.repeat)
+    timed('json page (100)', lambda: [
+        directory.teacher_json(teacher) for teacher in directory.directory_page(per_page=directory.MAX_PER_PAGE)
+    ], args.repeat)
+    timed('count (cold)', lambda: [directory.forget_counts(), directory.count(department=department)], args.repeat)
+    timed('count (cached)', lambda: [directory.count(department=department)], args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/teacher_search.py
+"""
+Teacher autocomplete latency: the old icontains OR chain (plus the separate
+lookup of the subject's current teacher) against the indexed search in
+teachers.search, over --teachers rows.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import setup_django, seed_semester, seed_teachers
+
+QUERIES = ['te', 'teacher1234', 'last19999', 'bench4242@example.com', 'teacher12 last12', 'nobody-matches']
+LIMIT = 15
+
+
+def old_search(query, subject_id):
+    from django.db.models import Q
+    from semesters.models import SemesterSubject
+    from teachers.models import Teacher
+
+    teachers = Teacher.objects.filter(
+        Q(email__icontains=query) | Q(first_name__icontains=query) | Q(last_name__icontains=query),
+        is_active=True
+    )
+    semester_subject = SemesterSubject.objects.get(id=subject_id)
+    if semester_subject.teacher:
+        teachers = teachers.exclude(id=semester_subject.teacher.id)
+    return list(teachers[:LIMIT])
+
+
+def new_search(query, subject_id):
+    from teachers.models import Teacher
+    from teachers.search import search_teachers
+
+    return list(search_teachers(query, Teacher.objects.filter(is_active=True), exclude_subject=subject_id)[:LIMIT])
+
+
+def timed(func, query, subject_id, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = func(query, subject_id)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--teachers', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = setup_django()
+    teachers = seed_teachers(args.teachers)
+    print(f"Seeded {args.teachers} teachers in {db_path}")
+
+    from semesters.models import SemesterSubject
+    from subjects.models import Subject
+
+    subject_id = SemesterSubject.objects.create(
+        semester=seed_semester(), subject=Subject.objects.create(subject_name='Algebra', class_name='10'),
+        teacher=teachers[len(teachers) // 2]
+    ).id
+
+    print(f"{'query':<24} {'icontains OR':>16} {'indexed search':>16}")
+    for query in QUERIES:
+        old_ms, old_rows = timed(old_search, query, subject_id, args.repeat)
+        new_ms, new_rows = timed(new_search, query, subject_id, args.repeat)
+        print(f"{query:<24} {old_ms:9.1f} ms ({old_rows:2d}) {new_ms:9.1f} ms ({new_rows:2d})")
+
+
+if __name__ == '__main__':
+    main()
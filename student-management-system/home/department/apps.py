@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_save, post_save, post_delete
 
 
 class DepartmentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'department'
+
+    def ready(self):
+        from semesters.signals import enrollments_changed
+        from . import rollup
+
+        # Writes that move the department rollups; new departments get their row on first read
+        enrollments_changed.connect(rollup.semester_enrollments_changed, dispatch_uid='department_rollup')
+        pre_save.connect(rollup.semester_saving, sender='semesters.Semester', dispatch_uid='department_rollup_save_semester')
+        post_delete.connect(rollup.semester_deleted, sender='semesters.Semester', dispatch_uid='department_rollup_delete_semester')
+        for model in ('semesters.Batch', 'semesters.SemesterSubject'):
+            post_save.connect(rollup.semester_part_changed, sender=model, dispatch_uid=f'department_rollup_save_{model}')
+            post_delete.connect(rollup.semester_part_changed, sender=model, dispatch_uid=f'department_rollup_delete_{model}')
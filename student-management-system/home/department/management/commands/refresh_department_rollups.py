@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from department.rollup import refresh_rollups, refresh_stale
+
+
+class Command(BaseCommand):
+    help = "Recompute the rollup row of every department, or only the stale and missing ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale', action='store_true', help="Only refresh stale or missing rows")
+
+    def handle(self, *args, **options):
+        rollups = refresh_stale() if options['stale'] else refresh_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {len(rollups)} department rollup(s)"))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('department', '0002_remove_department_no_of_students_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DepartmentRollup',
+            fields=[
+                ('department', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rollup', serialize=False, to='department.department')),
+                ('semesters', models.PositiveIntegerField(default=0)),
+                ('active_semesters', models.PositiveIntegerField(default=0)),
+                ('students', models.PositiveIntegerField(default=0, help_text='Distinct students actively enrolled in current semesters')),
+                ('capacity', models.PositiveIntegerField(default=0, help_text='Seats in the active batches of current semesters')),
+                ('enrolled', models.PositiveIntegerField(default=0, help_text='Active enrollments in those batches')),
+                ('subjects', models.PositiveIntegerField(default=0)),
+                ('staffed_subjects', models.PositiveIntegerField(default=0)),
+                ('teachers', models.PositiveIntegerField(default=0)),
+                ('hours_per_week', models.PositiveIntegerField(default=0)),
+                ('is_stale', models.BooleanField(default=False)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -1,10 +1,12 @@
 from django.db import models
-from django.utils.text import slugify
 from teachers.models import Teacher
-import random
-import string
+from school.identifiers import IdentifierAllocator
+from school.lifecycle import PreparedModel, assign_identifiers, assign_slugs
 
-class Department(models.Model):
+DEPARTMENT_IDS = IdentifierAllocator('department', 'TechAI-{code}-{number:05d}', 'department.Department', 'department_id')
+
+
+class Department(PreparedModel):
     department_id = models.CharField(max_length=50, unique=True)
     department_name = models.CharField(max_length=200)
     head_of_department = models.ForeignKey(
@@ -23,23 +25,54 @@ class Department(models.Model):
     
     def generate_department_id(self, user_input):
         """Generate a unique department_id in the format TechAI-<user_input>-<5-digit-integer>"""
-        while True:
-            random_digits = ''.join(random.choices(string.digits, k=5))
-            department_id = f"TechAI-{user_input}-{random_digits}"
-            if not Department.objects.filter(department_id=department_id).exists():
-                return department_id
+        return DEPARTMENT_IDS.next(code=user_input)
     
+    @classmethod
+    def prepare_for_insert(cls, objs):
+        # Without a code from the form, the first characters of the name are used
+        assign_identifiers(
+            objs, 'department_id', DEPARTMENT_IDS,
+            lambda department: {'code': department.department_name[:10]}  # Limit to avoid overly long IDs
+        )
+        assign_slugs(objs, lambda department: f"{department.department_name}-{department.department_id}")
+
     def save(self, *args, **kwargs):
-        if not self.department_id:
-            # Assuming user_input is passed via kwargs or context; for now, use department_name as fallback
-            user_input = kwargs.pop('user_input', self.department_name[:10])  # Limit to avoid overly long IDs
+        user_input = kwargs.pop('user_input', None)
+        if not self.department_id and user_input:
             self.department_id = self.generate_department_id(user_input)
-        if not self.slug:
-            self.slug = slugify(f"{self.department_name}-{self.department_id}")
         super(Department, self).save(*args, **kwargs)
     
     def __str__(self):
         return f"{self.department_name} ({self.department_id})"
     
     class Meta:
-        ordering = ['department_name']
\ No newline at end of file
+        ordering = ['department_name']
+
+class DepartmentRollup(models.Model):
+    """
+    Semester, enrollment, capacity and teaching figures of a department,
+    precomputed by department/rollup.py and marked stale by the semester
+    signals until the next refresh. "Current" means the department's
+    upcoming and running semesters.
+    """
+    department = models.OneToOneField(Department, on_delete=models.CASCADE, primary_key=True, related_name='rollup')
+    semesters = models.PositiveIntegerField(default=0)
+    active_semesters = models.PositiveIntegerField(default=0)
+    students = models.PositiveIntegerField(default=0, help_text="Distinct students actively enrolled in current semesters")
+    capacity = models.PositiveIntegerField(default=0, help_text="Seats in the active batches of current semesters")
+    enrolled = models.PositiveIntegerField(default=0, help_text="Active enrollments in those batches")
+    subjects = models.PositiveIntegerField(default=0)
+    staffed_subjects = models.PositiveIntegerField(default=0)
+    teachers = models.PositiveIntegerField(default=0)
+    hours_per_week = models.PositiveIntegerField(default=0)
+    is_stale = models.BooleanField(default=False)
+    refreshed_at = models.DateTimeField()
+
+    def capacity_percentage(self):
+        return round(self.enrolled / self.capacity * 100, 1) if self.capacity else 0
+
+    def teacher_coverage_percentage(self):
+        return round(self.staffed_subjects / self.subjects * 100, 1) if self.subjects else 0
+
+    def __str__(self):
+        return f"Rollup of {self.department}"
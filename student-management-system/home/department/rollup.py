@@ -0,0 +1,146 @@
+# department/rollup.py
+"""
+Department rollups: semesters, students, capacity use and teacher coverage
+per department, materialized in DepartmentRollup.
+
+compute_rollups() builds the figures of any number of departments with one
+grouped query per table (Semester, SemesterEnrollment, Batch and
+SemesterSubject). Writes only mark the affected rows stale inside their
+transaction; the department pages refresh the stale or missing rows they
+read (attach_rollups) and otherwise read one precomputed row per department.
+"""
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from semesters.models import Batch, Semester, SemesterEnrollment, SemesterSubject
+from .models import Department, DepartmentRollup
+import logging
+
+logger = logging.getLogger(__name__)
+
+CURRENT_STATUSES = ('upcoming', 'running')
+FIGURES = (
+    'semesters', 'active_semesters', 'students', 'capacity', 'enrolled',
+    'subjects', 'staffed_subjects', 'teachers', 'hours_per_week',
+)
+
+
+def _grouped(queryset, department_field, department_ids, **aggregates):
+    if department_ids is not None:
+        queryset = queryset.filter(**{f'{department_field}__in': department_ids})
+    return queryset.values(rollup_department=F(department_field)).annotate(**aggregates).order_by()
+
+
+def compute_rollups(department_ids=None):
+    """{department_id: figures} for ``department_ids`` (default: every department)"""
+    if department_ids is None:
+        department_ids = list(Department.objects.values_list('pk', flat=True))
+        selected = None
+    else:
+        selected = department_ids
+    rollups = {department_id: dict.fromkeys(FIGURES, 0) for department_id in department_ids}
+
+    current = Q(semester__status__in=CURRENT_STATUSES, semester__is_active=True)
+    queries = (
+        _grouped(
+            Semester.objects.all(), 'department_id', selected,
+            semesters=Count('id'),
+            active_semesters=Count('id', filter=Q(status__in=CURRENT_STATUSES, is_active=True)),
+        ),
+        _grouped(
+            SemesterEnrollment.objects.filter(current, status='active'), 'semester__department_id', selected,
+            students=Count('student', distinct=True),
+        ),
+        _grouped(
+            Batch.objects.filter(current, is_active=True), 'semester__department_id', selected,
+            capacity=Sum('max_students'),
+            enrolled=Sum('active_enrollment_count'),
+        ),
+        _grouped(
+            SemesterSubject.objects.filter(current, is_active=True), 'semester__department_id', selected,
+            subjects=Count('id'),
+            staffed_subjects=Count('id', filter=Q(teacher__isnull=False)),
+            teachers=Count('teacher', distinct=True),
+            hours_per_week=Sum('hours_per_week'),
+        ),
+    )
+    for rows in queries:
+        for row in rows:
+            department_id = row.pop('rollup_department')
+            if department_id in rollups:
+                rollups[department_id].update((key, value or 0) for key, value in row.items())
+    return rollups
+
+
+def refresh_rollups(department_ids=None):
+    """Recompute and store the rollups of ``department_ids`` (default: all); returns them by department"""
+    now = timezone.now()
+    rollups = DepartmentRollup.objects.bulk_create(
+        [
+            DepartmentRollup(department_id=department_id, is_stale=False, refreshed_at=now, **figures)
+            for department_id, figures in compute_rollups(department_ids).items()
+        ],
+        update_conflicts=True,
+        unique_fields=['department'],
+        update_fields=[*FIGURES, 'is_stale', 'refreshed_at'],
+    )
+    logger.debug("Refreshed %d department rollup(s)", len(rollups))
+    return {rollup.department_id: rollup for rollup in rollups}
+
+
+def refresh_stale():
+    """Refresh the rollups marked stale and create the missing ones; returns them by department"""
+    department_ids = list(Department.objects.filter(
+        Q(rollup__isnull=True) | Q(rollup__is_stale=True)
+    ).values_list('pk', flat=True))
+    if not department_ids:
+        return {}
+    return refresh_rollups(department_ids)
+
+
+def attach_rollups(departments):
+    """
+    Make sure each of ``departments`` (loaded with select_related('rollup'))
+    carries a fresh rollup, refreshing only the missing or stale ones.
+    """
+    departments = list(departments)
+    stale = [
+        department for department in departments
+        if not hasattr(department, 'rollup') or department.rollup.is_stale
+    ]
+    if stale:
+        rollups = refresh_rollups([department.pk for department in stale])
+        for department in stale:
+            department.rollup = rollups[department.pk]
+    return departments
+
+
+def _mark_stale(rollups):
+    rollups.update(is_stale=True)
+
+
+def semester_saving(sender, instance, **kwargs):
+    """
+    Semester pre_save receiver: marks the department the semester is stored
+    under as well as the one it is saved with, so moving a semester to
+    another department refreshes both.
+    """
+    departments = Q(department_id=instance.department_id)
+    if instance.pk:
+        departments |= Q(department__semesters=instance.pk)
+    _mark_stale(DepartmentRollup.objects.filter(departments))
+
+
+def semester_deleted(sender, instance, **kwargs):
+    """Semester post_delete receiver"""
+    _mark_stale(DepartmentRollup.objects.filter(department_id=instance.department_id))
+
+
+def semester_part_changed(sender, instance, **kwargs):
+    """Batch and SemesterSubject post_save/post_delete receiver"""
+    _mark_stale(DepartmentRollup.objects.filter(department__semesters=instance.semester_id))
+
+
+def semester_enrollments_changed(sender, semester_id=None, **kwargs):
+    """enrollments_changed receiver"""
+    if semester_id:
+        _mark_stale(DepartmentRollup.objects.filter(department__semesters=semester_id))
@@ -1,3 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from semesters.models import Semester, SemesterSubject, SemesterEnrollment
+from student.models import Student, Parent
+from subjects.models import Subject
+from teachers.models import Teacher
+from .models import Department, DepartmentRollup
+from . import rollup
 
-# Create your tests here.
+
+class DepartmentRollupTestCase(TestCase):
+    def setUp(self):
+        self.science, self.arts = [
+            Department.objects.create(department_name=name, department_start_date='2020-01-01')
+            for name in ('Science', 'Arts')
+        ]
+        self.running = Semester.objects.create(
+            semester_name='Fall', academic_year='2025-2026', department=self.science, status='running',
+            start_date='2025-09-01', end_date='2025-12-20'
+        )
+        Semester.objects.create(
+            semester_name='Spring', academic_year='2024-2025', department=self.science, status='completed',
+            start_date='2025-01-01', end_date='2025-05-20'
+        )
+        teacher = Teacher.objects.create(
+            first_name='Anna', last_name='Smith', gender='Female', date_of_birth='1980-01-01', mobile='1234567890',
+            joining_date='2020-01-01', qualification='MSc', username='anna', email='anna@example.com',
+            address='123 Street', city='City', state='State', zip_code='12345', country='Country'
+        )
+        for i, assigned in enumerate((teacher, None)):
+            SemesterSubject.objects.create(
+                semester=self.running, teacher=assigned, hours_per_week=4,
+                subject=Subject.objects.create(subject_name=f'Subject {i}', class_name='10')
+            )
+        self.students = [
+            Student.objects.create(
+                parent=Parent.objects.create(
+                    father_name='Father', father_mobile='9876543210', father_email=f'father{i}@example.com',
+                    mother_name='Mother', mother_mobile='8765432109', mother_email=f'mother{i}@example.com',
+                    present_address='123 Street', permanent_address='456 Avenue'
+                ),
+                first_name=f'Student{i}', last_name='Last', email=f'student{i}@example.com', gender='Male',
+                date_of_birth='2000-01-01', student_class='10', religion='Unknown', joining_date='2025-08-01',
+                mobile_number='1234567890', admission_number=f'ADM{i:04d}', section='A'
+            ) for i in range(3)
+        ]
+        self.batch = self.running.batches.get()
+        for student in self.students[:2]:
+            SemesterEnrollment.objects.create(semester=self.running, student=student, batch=self.batch)
+
+    def test_every_department_in_one_grouped_query_per_table(self):
+        with self.assertNumQueries(5):
+            rollups = rollup.compute_rollups()
+
+        self.assertEqual(rollups[self.science.id], {
+            'semesters': 2, 'active_semesters': 1, 'students': 2, 'capacity': self.batch.max_students,
+            'enrolled': 2, 'subjects': 2, 'staffed_subjects': 1, 'teachers': 1, 'hours_per_week': 8,
+        })
+        self.assertEqual(set(rollups[self.arts.id].values()), {0})
+
+    def test_enrollment_signals_mark_the_row_stale(self):
+        rollup.refresh_rollups()
+        with self.captureOnCommitCallbacks(execute=True):
+            SemesterEnrollment.objects.create(semester=self.running, student=self.students[2], batch=self.batch)
+        self.assertTrue(DepartmentRollup.objects.get(department=self.science).is_stale)
+        self.assertFalse(DepartmentRollup.objects.get(department=self.arts).is_stale)
+
+        self.assertEqual(set(rollup.refresh_stale()), {self.science.id})
+        row = DepartmentRollup.objects.get(department=self.science)
+        self.assertFalse(row.is_stale)
+        self.assertEqual((row.students, row.enrolled), (3, 3))
+        self.assertEqual(row.teacher_coverage_percentage(), 50.0)
+        self.assertEqual(row.capacity_percentage(), round(3 / self.batch.max_students * 100, 1))
+
+    def test_moving_a_semester_marks_both_departments(self):
+        rollup.refresh_rollups()
+        self.running.department = self.arts
+        self.running.save()
+        self.assertEqual(set(rollup.refresh_stale()), {self.science.id, self.arts.id})
+        self.assertEqual(DepartmentRollup.objects.get(department=self.arts).students, 2)
+        self.assertEqual(DepartmentRollup.objects.get(department=self.science).students, 0)
+
+    def test_pages_read_the_precomputed_rows(self):
+        admin = get_user_model().objects.create_user(
+            username='admin@example.com', email='admin@example.com', password='adminpass123', is_admin=True
+        )
+        self.client.force_login(admin)
+        # Missing rows are built on first read
+        response = self.client.get(reverse('department_list'))
+        self.assertEqual([d.rollup.students for d in response.context['departments']], [0, 2])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('view_department', args=[self.science.slug]))
+        self.assertEqual(response.context['department'].rollup.active_semesters, 1)
+        self.assertFalse([query for query in queries if 'semesters_' in query['sql']])
+
+        # A stale row is refreshed when read
+        SemesterEnrollment.objects.filter(student=self.students[0]).delete()
+        DepartmentRollup.objects.filter(department=self.science).update(is_stale=True)
+        response = self.client.get(reverse('view_department', args=[self.science.slug]))
+        self.assertEqual(response.context['department'].rollup.students, 1)
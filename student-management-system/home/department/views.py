@@ -6,8 +6,9 @@ from django.utils.dateparse import parse_date
 import logging
 
 from .models import Department
+from . import rollup
 from teachers.models import Teacher
-from school.models import Notification
+from school.notifications import create_notification
 
 logger = logging.getLogger(__name__)
 
@@ -15,19 +16,12 @@ logger = logging.getLogger(__name__)
 def is_admin(user):
     return user.is_authenticated and getattr(user, 'is_admin', False)
 
-def create_notification(user, message):
-    """Creates a notification if user is authenticated."""
-    if user.is_authenticated:
-        Notification.objects.create(user=user, message=message)
-
 
 # -------- List Departments -------- #
 def department_list(request):
-    departments = Department.objects.select_related('head_of_department').all()
-    unread_notification = request.user.notification_set.filter(is_read=False) if request.user.is_authenticated else []
+    departments = rollup.attach_rollups(Department.objects.select_related('head_of_department', 'rollup'))
     context = {
         'departments': departments,
-        'unread_notification': unread_notification
     }
     return render(request, "departments/departments.html", context)
 
@@ -89,7 +83,8 @@ def add_department(request):
 
 # -------- View Department -------- #
 def view_department(request, slug):
-    department = get_object_or_404(Department, slug=slug)
+    department = get_object_or_404(Department.objects.select_related('head_of_department', 'rollup'), slug=slug)
+    rollup.attach_rollups([department])
     return render(request, "departments/department-details.html", {
         'department': department
     })
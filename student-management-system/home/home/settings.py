@@ -58,7 +58,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
-                # 'school.context_processors.notifications',  # Ensure this line is present           
+                'school.context_processors.notifications',
              ],
         },
     },
@@ -74,6 +74,11 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Writers queued behind a seat reservation's write lock wait this long
+            # (seconds); see school/transactions.py
+            'timeout': 20,
+        },
     }
 }
 
@@ -130,3 +135,31 @@ AUTHENTICATION_BACKENDS = (
 )
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# Processes used to hash passwords in batch account operations (imports,
+# mass resets); None means one per CPU. See home_auth/hashing.py.
+PASSWORD_HASH_WORKERS = None
+
+# Weekly teaching hours a teacher can take on across upcoming and running
+# semesters. See semesters/services/workload.py.
+TEACHER_MAX_HOURS_PER_WEEK = 20
+
+# Cached counts, search results, workloads and dashboard stats are dropped by
+# bumping a version key or deleting the entry in the process that handled the
+# write. Set REDIS_URL when running more than one worker process so they all
+# share the cache and see those invalidations. The local-memory fallback is
+# per process and only correct for a single-process deployment; other
+# processes see a change once the entry's TTL (at most five minutes) expires.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
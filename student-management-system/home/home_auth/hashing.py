@@ -0,0 +1,72 @@
+# home_auth/hashing.py
+"""
+Password hashing for batch account operations.
+
+PBKDF2 is deliberately slow and holds the GIL, so hashing thousands of
+passwords in one process is CPU bound on a single core. These helpers fan
+the work out over a ProcessPoolExecutor with PASSWORD_HASH_WORKERS processes
+(default: one per CPU). Single-account flows keep calling set_password()
+directly; small batches are hashed in-process too, since starting the pool
+would cost more than it saves.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import os
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+# Below this many passwords per worker the pool is not worth starting
+MIN_PER_WORKER = 4
+
+
+def worker_count(workers=None):
+    """Hashing processes to use: ``workers``, else PASSWORD_HASH_WORKERS, else one per CPU"""
+    workers = workers or getattr(settings, 'PASSWORD_HASH_WORKERS', None) or os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+@contextmanager
+def hashing_pool(workers=None):
+    """
+    A process pool to share across several hash_passwords() calls, e.g. one
+    per import chunk; yields None when only one worker is configured.
+    """
+    workers = worker_count(workers)
+    if workers == 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield executor
+
+
+def _map(executor, workers, passwords):
+    # A few tasks per worker keeps them all busy without pickling one password at a time
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+def hash_passwords(passwords, workers=None, executor=None):
+    """
+    Hash each of ``passwords`` (every hash gets its own salt) and return the
+    encoded hashes in order. Pass ``executor`` from hashing_pool() to reuse
+    a running pool; otherwise one is started for this call when the batch is
+    large enough.
+    """
+    passwords = list(passwords)
+    workers = worker_count(workers)
+    if executor is not None:
+        return _map(executor, workers, passwords)
+    if workers == 1 or len(passwords) < workers * MIN_PER_WORKER:
+        return [make_password(password) for password in passwords]
+    with hashing_pool(workers) as executor:
+        return _map(executor, workers, passwords)
+
+
+def reset_passwords(users, password, workers=None):
+    """Give every user in ``users`` ``password`` (hashed in parallel) with one bulk UPDATE"""
+    users = list(users)
+    for user, hashed in zip(users, hash_passwords([password] * len(users), workers)):
+        user.password = hashed
+    get_user_model().objects.bulk_update(users, ['password'], batch_size=500)
+    return len(users)
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_unread(apps, schema_editor):
+    CustomUser = apps.get_model('home_auth', 'CustomUser')
+    Notification = apps.get_model('school', 'Notification')
+    unread = Notification.objects.filter(user=OuterRef('pk'), is_read=False).order_by().values('user').annotate(
+        count=Count('pk')
+    ).values('count')
+    CustomUser.objects.update(unread_notification_count=Coalesce(Subquery(unread), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home_auth', '0050_alter_passwordresetrequest_token'),
+        ('school', '0005_identifier_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='unread_notification_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_unread, migrations.RunPython.noop),
+    ]
@@ -23,6 +23,9 @@ class CustomUser(AbstractUser):
     is_admin = models.BooleanField(default=False)
     is_teacher = models.BooleanField(default=False) 
 
+    # Unread school.Notification rows, kept in step by school.models/school.notifications
+    unread_notification_count = models.PositiveIntegerField(default=0, editable=False)
+
     # Set related_name to None to prevent reverse relationship creation
     groups = models.ManyToManyField(
         'auth.Group',
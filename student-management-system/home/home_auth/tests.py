@@ -0,0 +1,38 @@
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.test import TestCase, override_settings
+from . import hashing
+
+
+# Fast hashes keep the tests quick; forked pool workers inherit the override
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class PasswordHashingTestCase(TestCase):
+    def test_worker_count(self):
+        with override_settings(PASSWORD_HASH_WORKERS=3):
+            self.assertEqual(hashing.worker_count(), 3)
+            self.assertEqual(hashing.worker_count(2), 2)
+
+    def test_pool_hashes_match_and_are_salted(self):
+        passwords = ['secret'] * 10 + ['other'] * 2
+        hashes = hashing.hash_passwords(passwords, workers=2)
+
+        self.assertEqual(len(set(hashes)), 12)
+        self.assertTrue(all(check_password(password, hashed) for password, hashed in zip(passwords, hashes)))
+
+    def test_small_batches_stay_in_process(self):
+        with mock.patch.object(hashing, 'ProcessPoolExecutor') as pool:
+            hashes = hashing.hash_passwords(['secret'] * 3, workers=2)
+        pool.assert_not_called()
+        self.assertTrue(check_password('secret', hashes[0]))
+
+    def test_reset_passwords(self):
+        users = [
+            get_user_model().objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='old')
+            for i in range(3)
+        ]
+        with self.assertNumQueries(1):
+            self.assertEqual(hashing.reset_passwords(users, 'new', workers=1), 3)
+
+        for user in get_user_model().objects.all():
+            self.assertTrue(user.check_password('new'))
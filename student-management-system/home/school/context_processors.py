@@ -0,0 +1,16 @@
+# school/context_processors.py
+from .notifications import UnreadNotifications
+
+
+def notifications(request):
+    """Unread notifications for the header bell; costs no query unless the list is rendered"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return {
+            'unread_notification': UnreadNotifications(user),
+            'unread_notification_count': user.unread_notification_count,
+        }
+    return {
+        'unread_notification': [],
+        'unread_notification_count': 0
+    }
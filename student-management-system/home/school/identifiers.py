@@ -0,0 +1,105 @@
+# school/identifiers.py
+"""
+Sequence-backed allocation of human-readable IDs such as SEM-00042.
+
+Each family of IDs has an IdentifierSequence row holding the last number
+handed out. A block of numbers is claimed with a single F() UPDATE inside a
+transaction, so concurrent writers never draw the same number and bulk
+imports get all their IDs in one round trip instead of a query per row.
+
+IDs issued before the sequences existed were random across the whole
+number space of their format, so a sequence draws from the largest free
+range between existing numbers (its ``ceiling`` is the end of that range)
+and moves to the next largest one once it is used up. Only when no free
+range fits inside the format's width do numbers continue past it, one
+digit wider (e.g. SEM-100000).
+"""
+from string import Formatter
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F, Q
+from .models import IdentifierSequence
+
+
+class IdentifierAllocator:
+    """
+    Allocate IDs formatted with ``template``, e.g. 'SEM-{number:05d}'.
+
+    Extra template fields are passed to allocate()/next(). Numbers already
+    used in ``model.field`` are never handed out again, see the module
+    docstring.
+    """
+
+    def __init__(self, name, template, model, field):
+        self.name = name
+        self.template = template
+        self.model = model
+        self.field = field
+        # Highest number that still fits the template's width (None: no fixed width)
+        self.capacity = None
+        for _, field_name, spec, _ in Formatter().parse(template):
+            if field_name == 'number' and spec.startswith('0') and spec.endswith('d'):
+                self.capacity = 10 ** int(spec[1:-1]) - 1
+
+    def _existing_numbers(self):
+        model = apps.get_model(self.model)
+        numbers = set()
+        for value in model._default_manager.values_list(self.field, flat=True).iterator():
+            suffix = (value or '').rsplit('-', 1)[-1]
+            if suffix.isdigit():
+                numbers.add(int(suffix))
+        return sorted(numbers)
+
+    def _free_range(self, count):
+        """(first, last) of the largest run of unused numbers within the width that fits ``count``"""
+        used = self._existing_numbers()
+        if self.capacity is None:
+            return (used[-1] if used else 0) + 1, None
+        best = None
+        previous = 0
+        for number in [n for n in used if n <= self.capacity] + [self.capacity + 1]:
+            first, last = previous + 1, number - 1
+            if last - first + 1 >= count and (best is None or last - first > best[1] - best[0]):
+                best = (first, last)
+            previous = number
+        if best is None:
+            # The width is used up: continue past it, one digit wider
+            return max([self.capacity, *used]) + 1, None
+        return best
+
+    def _claim(self, count):
+        # Only claims while the block still fits under the ceiling
+        return IdentifierSequence.objects.filter(
+            Q(ceiling__isnull=True) | Q(ceiling__gte=F('last_value') + count), name=self.name
+        ).update(last_value=F('last_value') + count)
+
+    def reserve(self, count=1):
+        """Claim ``count`` consecutive numbers and return them as a range"""
+        if count < 1:
+            return range(0)
+
+        # The UPDATE locks the row until commit; no savepoint needed when nested
+        with transaction.atomic(savepoint=False):
+            if not self._claim(count):
+                # First allocation (a new row starts exhausted) or the free range is used up
+                IdentifierSequence.objects.get_or_create(name=self.name, defaults={'ceiling': 0})
+                IdentifierSequence.objects.select_for_update().filter(name=self.name).get()
+                if not self._claim(count):
+                    first, ceiling = self._free_range(count)
+                    IdentifierSequence.objects.filter(name=self.name).update(
+                        last_value=first - 1 + count, ceiling=ceiling
+                    )
+            last = IdentifierSequence.objects.filter(name=self.name).values_list('last_value', flat=True).get()
+        return range(last - count + 1, last + 1)
+
+    def format(self, number, **fields):
+        """The ID for a number returned by reserve()"""
+        return self.template.format(number=number, **fields)
+
+    def allocate(self, count, **fields):
+        """Return ``count`` new IDs"""
+        return [self.format(number, **fields) for number in self.reserve(count)]
+
+    def next(self, **fields):
+        """Return one new ID"""
+        return self.allocate(1, **fields)[0]
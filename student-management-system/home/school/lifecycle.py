@@ -0,0 +1,64 @@
+# school/lifecycle.py
+"""
+Insert-time values (human-readable IDs, slugs, dependent rows) that
+save() and bulk_create() both fill in.
+
+bulk_create() never calls save(), so models that derive columns on insert
+declare them in ``prepare_for_insert(objs)`` instead of in save().
+PreparedModel calls it for a single row on insert and
+PreparedQuerySet.bulk_create() once for the whole list, so a bulk insert
+claims all of its IDs in one round trip. Updates skip both hooks.
+"""
+from django.db import models
+from django.utils.text import slugify
+
+
+def assign_identifiers(objs, field, allocator, template_fields=None):
+    """
+    Give each of ``objs`` without a ``field`` value a new ID from
+    ``allocator``; ``template_fields(obj)`` supplies extra template fields.
+    """
+    missing = [obj for obj in objs if not getattr(obj, field)]
+    for obj, number in zip(missing, allocator.reserve(len(missing))):
+        extra = template_fields(obj) if template_fields else {}
+        setattr(obj, field, allocator.format(number, **extra))
+
+
+def assign_slugs(objs, source):
+    """Slugify ``source(obj)`` into each of ``objs`` without a slug"""
+    for obj in objs:
+        if not obj.slug:
+            obj.slug = slugify(source(obj))
+
+
+class PreparedQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self.model.prepare_for_insert(objs)
+        created = super().bulk_create(objs, *args, **kwargs)
+        # Rows skipped by ignore_conflicts come back without a pk
+        self.model.after_insert([obj for obj in created if obj.pk is not None])
+        return created
+
+
+class PreparedModel(models.Model):
+    objects = PreparedQuerySet.as_manager()
+
+    @classmethod
+    def prepare_for_insert(cls, objs):
+        """Fill in the insert-time values of the unsaved ``objs``"""
+
+    @classmethod
+    def after_insert(cls, objs):
+        """Create whatever depends on the freshly inserted ``objs``"""
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if adding:
+            type(self).prepare_for_insert([self])
+        super().save(*args, **kwargs)
+        if adding:
+            type(self).after_insert([self])
+
+    class Meta:
+        abstract = True
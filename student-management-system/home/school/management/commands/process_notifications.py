@@ -0,0 +1,43 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from school.notifications import BATCH_SIZE, drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued notifications from the outbox table, polling until stopped"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Drain the outbox once and exit instead of polling",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help="Notifications delivered per transaction",
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls of an empty outbox",
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        try:
+            while True:
+                delivered, skipped = drain_outbox(options['batch_size'])
+                if delivered or skipped or options['once']:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Delivered {delivered} notification(s), skipped {skipped} duplicate(s)"
+                    ))
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped")
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:40
+
+from django.db import migrations, models
+
+
+def reseed_sequences(apps, schema_editor):
+    # A zero ceiling makes the next allocation pick a free range below the format's width
+    IdentifierSequence = apps.get_model('school', 'IdentifierSequence')
+    IdentifierSequence.objects.update(ceiling=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0006_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='identifiersequence',
+            name='ceiling',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(reseed_sequences, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,12 @@
 # models.py
 from django.db import models
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
 import uuid
 
 class Notification(models.Model):
@@ -12,4 +17,51 @@ class Notification(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return self.message
\ No newline at end of file
+        return self.message
+
+class NotificationOutbox(models.Model):
+    """A notification waiting for the process_notifications worker, see school.notifications"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    message = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.message
+
+class IdentifierSequence(models.Model):
+    """Last number handed out for one family of human-readable IDs, see school.identifiers"""
+    name = models.CharField(max_length=50, primary_key=True)
+    last_value = models.BigIntegerField(default=0)
+    # Last number of the free range the sequence is drawing from; null when unbounded
+    ceiling = models.BigIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_value}"
+
+
+def adjust_unread_count(user_ids, delta):
+    """Apply a relative change to the users' unread_notification_count with one F() update"""
+    if user_ids and delta:
+        get_user_model().objects.filter(pk__in=user_ids).update(
+            unread_notification_count=Greatest(F('unread_notification_count') + delta, 0)
+        )
+
+
+# Single-row writes keep CustomUser.unread_notification_count in step here;
+# bulk writes go through school.notifications, which settles it per batch.
+@receiver(post_init, sender=Notification)
+def track_notification(sender, instance, **kwargs):
+    instance._counted_unread = instance.__dict__.get('is_read') is False
+
+
+@receiver(post_save, sender=Notification)
+def count_notification(sender, instance, created, **kwargs):
+    was_unread = not created and instance._counted_unread
+    instance._counted_unread = not instance.is_read
+    adjust_unread_count([instance.user_id], int(instance._counted_unread) - int(was_unread))
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_notification(sender, instance, **kwargs):
+    if instance._counted_unread:
+        adjust_unread_count([instance.user_id], -1)
@@ -0,0 +1,183 @@
+# school/notifications.py
+"""
+Notification delivery and unread counts.
+
+Views never write Notification rows themselves. create_notification(s)
+queues (user, message) pairs in memory until the surrounding transaction
+commits, then adds them to the NotificationOutbox table with one INSERT per
+call, so code notifying many users passes them all to one
+create_notifications() call; rolled back work queues nothing. The process_notifications worker drains
+the outbox in batches with process_outbox(), collapsing repeated messages
+to the same user within DEDUPE_WINDOW, and bulk inserts the notifications.
+
+Each user's unread_notification_count column follows their unread
+Notification rows: the receivers in school.models handle single-row writes
+and the helpers below settle bulk ones. The bell badge therefore reads a
+column of the already loaded request.user, and the unread rows themselves
+are only queried when a template iterates them.
+"""
+from collections import Counter
+from datetime import timedelta
+from functools import partial
+import logging
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from django.db.models import Count, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from .models import Notification, NotificationOutbox, adjust_unread_count
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_LENGTH = Notification._meta.get_field('message').max_length
+BATCH_SIZE = 500
+# An identical message to the same user within this window is delivered once
+DEDUPE_WINDOW = timedelta(minutes=5)
+
+
+def create_notifications(notifications):
+    """
+    Queue (user, message) pairs for delivery once the current transaction
+    commits (immediately outside one), with one INSERT for this call. Pairs
+    without a saved user are skipped and repeated pairs are queued once.
+    Returns how many were queued.
+    """
+    rows = {}
+    for user, message in notifications:
+        if user is None or user.pk is None:
+            continue
+        message = message[:MESSAGE_LENGTH]
+        rows.setdefault((user.pk, message), NotificationOutbox(user_id=user.pk, message=message))
+    if rows:
+        transaction.on_commit(partial(_enqueue, list(rows.values())))
+    return len(rows)
+
+
+def create_notification(user, message):
+    """Queue one notification, see create_notifications()"""
+    return create_notifications([(user, message)])
+
+
+def _enqueue(rows):
+    # Runs after the commit; a failure here must not turn a saved change into an error page
+    try:
+        NotificationOutbox.objects.bulk_create(rows)
+    except DatabaseError:
+        logger.exception("Could not queue %d notification(s)", len(rows))
+
+
+def process_outbox(batch_size=BATCH_SIZE, dedupe_window=DEDUPE_WINDOW):
+    """
+    Deliver the oldest ``batch_size`` queued notifications and return
+    ``(delivered, skipped)``. A message is skipped when it was queued within
+    ``dedupe_window`` of the same message to the same user being delivered,
+    earlier in this batch or before. Rows locked by another worker are left
+    to it.
+    """
+    with transaction.atomic():
+        queued = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True).order_by('id')
+            .values('id', 'user_id', 'message', 'created_at')[:batch_size]
+        )
+        if not queued:
+            return 0, 0
+
+        # Delivery time of earlier notifications: at or after they were queued
+        last_delivered = {
+            (row['user_id'], row['message']): row['last']
+            for row in Notification.objects.filter(
+                user_id__in={item['user_id'] for item in queued},
+                created_at__gte=min(item['created_at'] for item in queued) - dedupe_window
+            ).values('user_id', 'message').annotate(last=Max('created_at')).order_by()
+        }
+        rows = []
+        for item in queued:
+            key = (item['user_id'], item['message'])
+            last = last_delivered.get(key)
+            if last is None or item['created_at'] - last > dedupe_window:
+                last_delivered[key] = item['created_at']
+                rows.append(Notification(user_id=item['user_id'], message=item['message']))
+
+        bulk_create_notifications(rows)
+        NotificationOutbox.objects.filter(id__in=[item['id'] for item in queued]).delete()
+
+    logger.info("Delivered %d notification(s), skipped %d duplicate(s)", len(rows), len(queued) - len(rows))
+    return len(rows), len(queued) - len(rows)
+
+
+def drain_outbox(batch_size=BATCH_SIZE, dedupe_window=DEDUPE_WINDOW):
+    """Process the outbox until it is empty; returns the summed ``(delivered, skipped)``"""
+    delivered = skipped = 0
+    while True:
+        batch = process_outbox(batch_size, dedupe_window)
+        if batch == (0, 0):
+            return delivered, skipped
+        delivered += batch[0]
+        skipped += batch[1]
+
+
+def bulk_create_notifications(rows):
+    """bulk_create ``rows`` (unsaved Notifications) and bump the recipients' unread counters"""
+    with transaction.atomic():
+        created = Notification.objects.bulk_create(rows)
+        by_delta = {}
+        for user_id, count in Counter(row.user_id for row in created if not row.is_read).items():
+            by_delta.setdefault(count, []).append(user_id)
+        for count, user_ids in by_delta.items():
+            adjust_unread_count(user_ids, count)
+    return created
+
+
+def mark_all_read(user):
+    """Mark every unread notification of ``user`` as read and return how many changed"""
+    with transaction.atomic():
+        updated = Notification.objects.filter(user=user, is_read=False).update(is_read=True)
+        # Relative, so notifications delivered meanwhile stay counted
+        adjust_unread_count([user.pk], -updated)
+    user.unread_notification_count = max(user.unread_notification_count - updated, 0)
+    return updated
+
+
+def clear_all(user):
+    """Delete every notification of ``user``"""
+    with transaction.atomic():
+        # Read rows are not counted, so the delete receivers have nothing to settle
+        mark_all_read(user)
+        Notification.objects.filter(user=user).delete()
+
+
+def recount_unread(users=None):
+    """Recompute unread_notification_count from the Notification rows (all users by default)"""
+    unread = Notification.objects.filter(user=OuterRef('pk'), is_read=False).order_by().values('user').annotate(
+        count=Count('pk')
+    ).values('count')
+    queryset = get_user_model().objects.all() if users is None else get_user_model().objects.filter(pk__in=users)
+    return queryset.update(unread_notification_count=Coalesce(Subquery(unread), Value(0)))
+
+
+class UnreadNotifications:
+    """
+    Lazy stand-in for a user's unread notifications in templates: truth and
+    length come from the counter column, and the rows are only fetched (once)
+    when iterated.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._rows = None
+
+    def __bool__(self):
+        return self.user.unread_notification_count > 0
+
+    def __len__(self):
+        return self.user.unread_notification_count
+
+    def __iter__(self):
+        if self._rows is None:
+            if not self:
+                self._rows = []
+            else:
+                self._rows = list(
+                    Notification.objects.filter(user=self.user, is_read=False)
+                    .select_related('user').order_by('-created_at')
+                )
+        return iter(self._rows)
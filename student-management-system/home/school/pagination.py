@@ -0,0 +1,140 @@
+# school/pagination.py
+import base64
+import json
+from datetime import date
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def subquery_count(queryset, outer_field):
+    """
+    Count rows of ``queryset`` whose ``outer_field`` points at the outer row,
+    as a correlated subquery. Unlike Count() over a join, several of these can
+    be annotated on one queryset without multiplying its rows.
+    """
+    counts = queryset.filter(**{outer_field: OuterRef('pk')}).order_by().values(outer_field).annotate(
+        count=Count('*')
+    ).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator, iterable like a Django Page"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[-1]) if self._has_next else None
+
+    @property
+    def previous_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[0]) if self._has_previous else None
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a fixed ordering, e.g. ('-created_at', 'id').
+
+    Pages are fetched with a WHERE on the ordering columns of the last (or
+    first) row seen instead of OFFSET, so page N costs the same as page 1 and
+    no COUNT(*) is needed. The last ordering field must be unique.
+
+    Ordering names may be model fields or annotations (e.g. a search rank),
+    and the rows may be model instances or ``.values()`` dicts.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+    def _field(self, name):
+        try:
+            return self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def _value(self, obj, name):
+        if isinstance(obj, dict):
+            value = obj[name]
+        else:
+            field = self._field(name)
+            value = getattr(obj, field.attname if field else name)
+        if isinstance(value, date):
+            return value.isoformat()
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        return str(value)
+
+    def encode_cursor(self, obj):
+        raw = [self._value(obj, name) for name, _ in self.ordering]
+        return base64.urlsafe_b64encode(json.dumps(raw).encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            if not isinstance(raw, list) or len(raw) != len(self.ordering):
+                raise ValueError
+            values = []
+            for (name, _), value in zip(self.ordering, raw):
+                field = self._field(name)
+                values.append(field.to_python(value) if field else value)
+            return values
+        except Exception:
+            raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+
+    def _seek(self, values, backwards):
+        """Q matching the rows strictly after (or before) the given ordering values"""
+        condition = Q(pk__in=[])
+        for index, (name, descending) in enumerate(self.ordering):
+            lookup = 'lt' if descending != backwards else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[index]})
+            for (prev_name, _), value in zip(self.ordering[:index], values):
+                step &= Q(**{prev_name: value})
+            condition |= step
+        return condition
+
+    def _order_by(self, backwards):
+        return [('-' if descending != backwards else '') + name for name, descending in self.ordering]
+
+    def get_page(self, after=None, before=None):
+        """Return the page after the ``after`` cursor, before the ``before`` cursor, or the first page"""
+        backwards = bool(before)
+        queryset = self.queryset.order_by(*self._order_by(backwards))
+        cursor = before or after
+        if cursor:
+            queryset = queryset.filter(self._seek(self.decode_cursor(cursor), backwards))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=has_more)
+        return KeysetPage(rows, self, has_next=has_more, has_previous=bool(after))
@@ -0,0 +1,135 @@
+# school/search.py
+"""
+Substring search over a denormalised, lowercased document column.
+
+On SQLite the document is mirrored into an FTS5 table with the trigram
+tokenizer (kept in sync by triggers), on PostgreSQL it gets a pg_trgm GIN
+index. Both serve ``%term%`` matching from an index and rank the results;
+other backends fall back to a plain LIKE over the document column.
+"""
+from django.db import connection, models
+from django.db.models import F, FloatField, Func, Q, Value
+
+# FTS5 trigram tokens are three characters; shorter terms cannot use the index
+MIN_TRIGRAM_LENGTH = 3
+
+
+class FTSDocumentField(models.TextField):
+    """Document column of an FTS5 table, queried with the ``match`` lookup"""
+
+
+@FTSDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+def build_document(*parts):
+    """Join the searchable values of a row into one lowercased document"""
+    return ' '.join(str(part).strip().lower() for part in parts if part and str(part).strip())
+
+
+def search_terms(query):
+    """Lowercased, de-duplicated whitespace separated terms of a query"""
+    return list(dict.fromkeys((query or '').lower().split()))
+
+
+def _fts5_match(terms):
+    """FTS5 MATCH expression requiring every term as a quoted substring"""
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def search(queryset, query, document_field, fts_relation=None):
+    """
+    Filter ``queryset`` to rows whose document contains every term of
+    ``query`` and order them by relevance (best first).
+
+    ``document_field`` is the lookup path from the queryset's model to the
+    document column, e.g. 'search_index__document'. ``fts_relation`` is the
+    path to the unmanaged model over the SQLite FTS5 table (with ``document``
+    and ``rank`` fields), joined on rowid so the MATCH runs once per query.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+
+    indexed = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+    vendor = connection.vendor
+
+    if vendor == 'sqlite' and fts_relation and indexed:
+        queryset = queryset.filter(**{f'{fts_relation}__document__match': _fts5_match(indexed)})
+        for term in terms:
+            if term not in indexed:
+                queryset = queryset.filter(**{f'{document_field}__contains': term})
+        # bm25 rank: lower is better
+        return queryset.annotate(search_rank=F(f'{fts_relation}__rank')).order_by('search_rank', 'pk')
+
+    # LIKE '%term%' on the lowercased document; pg_trgm's GIN index serves it on PostgreSQL
+    condition = Q()
+    for term in terms:
+        condition &= Q(**{f'{document_field}__contains': term})
+    queryset = queryset.filter(condition)
+
+    if vendor == 'postgresql':
+        return queryset.annotate(search_rank=Func(
+            F(document_field), Value(' '.join(terms)),
+            function='similarity',
+            output_field=FloatField()
+        )).order_by('-search_rank', 'pk')
+    return queryset.order_by('pk')
+
+
+def install_index(schema_editor, table, document_column, rowid_column, fts_table):
+    """
+    Create the search index for ``table.document_column``: an external
+    content FTS5 trigram table with sync triggers on SQLite, a pg_trgm GIN
+    index on PostgreSQL. For use from RunPython migrations.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        statements = [
+            f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+            f"{document_column}, content='{table}', content_rowid='{rowid_column}', tokenize='trigram')",
+            f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts_table}(rowid, {document_column}) VALUES (new.{rowid_column}, new.{document_column}); END",
+            f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {document_column}) "
+            f"VALUES ('delete', old.{rowid_column}, old.{document_column}); END",
+            f"CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {table} BEGIN "
+            f"INSERT INTO {fts_table}({fts_table}, rowid, {document_column}) "
+            f"VALUES ('delete', old.{rowid_column}, old.{document_column}); "
+            f"INSERT INTO {fts_table}(rowid, {document_column}) VALUES (new.{rowid_column}, new.{document_column}); END",
+            f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')",
+        ]
+    elif vendor == 'postgresql':
+        statements = [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            f"CREATE INDEX {fts_table}_trgm ON {table} USING gin ({document_column} gin_trgm_ops)",
+        ]
+    else:
+        statements = []
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def uninstall_index(schema_editor, fts_table):
+    """Reverse of install_index"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+    elif vendor == 'postgresql':
+        schema_editor.execute(f"DROP INDEX IF EXISTS {fts_table}_trgm")
+
+
+def rebuild_fts(fts_table):
+    """Rebuild an FTS5 table from its content table (SQLite only)"""
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
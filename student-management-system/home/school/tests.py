@@ -1,3 +1,294 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from department.models import Department
+from semesters.models import Semester, Batch
+from .identifiers import IdentifierAllocator
+from .models import IdentifierSequence, Notification, NotificationOutbox, adjust_unread_count
+from . import notifications
+from .pagination import KeysetPaginator, InvalidCursor, subquery_count
 
-# Create your tests here.
+
+class KeysetPaginatorTestCase(TestCase):
+    def setUp(self):
+        department = Department.objects.create(department_name='Mathematics', department_start_date='2020-01-01')
+        for i in range(7):
+            Semester.objects.create(
+                semester_name=f'Semester {i}',
+                academic_year='2025-2026',
+                department=department,
+                start_date='2025-09-01',
+                end_date='2025-12-20'
+            )
+        # Ties on created_at are broken by id
+        now = timezone.now()
+        for i, semester in enumerate(Semester.objects.order_by('id')):
+            Semester.objects.filter(pk=semester.pk).update(created_at=now - timedelta(days=i // 2))
+        self.expected = list(Semester.objects.order_by('-created_at', 'id').values_list('id', flat=True))
+        self.paginator = KeysetPaginator(Semester.objects.all(), 3, ordering=('-created_at', 'id'))
+
+    def test_walks_forwards_and_backwards(self):
+        first = self.paginator.get_page()
+        second = self.paginator.get_page(after=first.next_cursor)
+        third = self.paginator.get_page(after=second.next_cursor)
+
+        self.assertEqual([s.id for page in (first, second, third) for s in page], self.expected)
+        self.assertFalse(first.has_previous())
+        self.assertFalse(third.has_next())
+
+        back = self.paginator.get_page(before=third.previous_cursor)
+        self.assertEqual([s.id for s in back], self.expected[3:6])
+        back = self.paginator.get_page(before=back.previous_cursor)
+        self.assertEqual([s.id for s in back], self.expected[:3])
+        self.assertFalse(back.has_previous())
+
+    def test_values_rows_and_annotation_ordering(self):
+        paginator = KeysetPaginator(
+            Semester.objects.annotate(neg_id=-F('id')).values('id', 'neg_id'), 3, ordering=('neg_id', 'id')
+        )
+        first = paginator.get_page()
+        second = paginator.get_page(after=first.next_cursor)
+        expected = list(Semester.objects.order_by('-id').values_list('id', flat=True))
+        self.assertEqual([row['id'] for row in list(first) + list(second)], expected[:6])
+
+    def test_rejects_malformed_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            self.paginator.get_page(after='not-a-cursor')
+
+    def test_subquery_count(self):
+        semester = Semester.objects.order_by('id').first()
+        Batch.objects.create(semester=semester, batch_name='Extra', academic_year='2025-2026')
+
+        counts = dict(Semester.objects.annotate(
+            batch_count=subquery_count(Batch.objects.all(), 'semester')
+        ).values_list('id', 'batch_count'))
+
+        self.assertEqual(counts[semester.id], 2)
+        self.assertEqual(set(counts.values()), {1, 2})
+
+
+class IdentifierAllocatorTestCase(TestCase):
+    def test_starts_above_existing_ids_and_hands_out_blocks(self):
+        department = Department.objects.create(department_name='Physics', department_start_date='2020-01-01')
+        Semester.objects.create(
+            semester_id='SEM-04711', semester_name='Legacy', academic_year='2024-2025',
+            department=department, start_date='2024-09-01', end_date='2024-12-20'
+        )
+        IdentifierSequence.objects.filter(name='semester').delete()
+        allocator = IdentifierAllocator('semester', 'SEM-{number:05d}', 'semesters.Semester', 'semester_id')
+
+        self.assertEqual(allocator.next(), 'SEM-04712')
+        with self.assertNumQueries(2):
+            block = allocator.allocate(3)
+        self.assertEqual(block, ['SEM-04713', 'SEM-04714', 'SEM-04715'])
+        self.assertEqual(IdentifierSequence.objects.get(name='semester').last_value, 4715)
+
+    def test_draws_from_free_ranges_before_widening(self):
+        department = Department.objects.create(department_name='Physics', department_start_date='2020-01-01')
+
+        def create(semester_id):
+            Semester.objects.create(
+                semester_id=semester_id, semester_name=semester_id, academic_year='2024-2025',
+                department=department, start_date='2024-09-01', end_date='2024-12-20'
+            )
+
+        # Legacy IDs scattered over the one-digit space: 1, 3-5 and 7-9 are free
+        for semester_id in ('SEM-2', 'SEM-6'):
+            create(semester_id)
+        allocator = IdentifierAllocator('legacy', 'SEM-{number:01d}', 'semesters.Semester', 'semester_id')
+
+        issued = []
+        for count in (1, 2, 1, 2, 1, 1):
+            block = allocator.allocate(count)
+            for semester_id in block:
+                create(semester_id)
+            issued.append(block)
+        self.assertEqual(issued, [
+            ['SEM-3'], ['SEM-4', 'SEM-5'], ['SEM-7'], ['SEM-8', 'SEM-9'], ['SEM-1'], ['SEM-10'],
+        ])
+
+    def test_model_defaults_use_the_sequences(self):
+        first = Department.objects.create(department_name='Chemistry', department_start_date='2020-01-01')
+        second = Department.objects.create(department_name='Biology', department_start_date='2020-01-01')
+
+        self.assertEqual(first.department_id.rsplit('-', 1)[0], 'TechAI-Chemistry')
+        self.assertEqual(int(second.department_id.rsplit('-', 1)[1]), int(first.department_id.rsplit('-', 1)[1]) + 1)
+        semester = Semester.objects.create(
+            semester_name='Fall', academic_year='2025-2026', department=first,
+            start_date='2025-09-01', end_date='2025-12-20'
+        )
+        self.assertRegex(semester.semester_id, r'^SEM-\d{5}$')
+        self.assertRegex(semester.batches.get().batch_id, r'^BATCH-\d{5}$')
+
+
+class PreparedModelTestCase(TestCase):
+    def setUp(self):
+        self.department = Department.objects.create(department_name='Physics', department_start_date='2020-01-01')
+
+    def test_bulk_create_assigns_ids_slugs_and_default_batches(self):
+        # Seeds the semester and batch sequences
+        Semester.objects.create(
+            semester_name='Seed', academic_year='2025-2026', department=self.department,
+            start_date='2025-09-01', end_date='2025-12-20'
+        )
+        # One block of IDs and one INSERT each for the semesters and their default batches
+        with self.assertNumQueries(6):
+            semesters = Semester.objects.bulk_create([
+                Semester(
+                    semester_name=f'Term {i}', academic_year='2025-2026', department=self.department,
+                    start_date='2025-09-01', end_date='2025-12-20'
+                ) for i in range(5)
+            ])
+
+        numbers = [int(semester.semester_id.rsplit('-', 1)[1]) for semester in semesters]
+        self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 5)))
+        self.assertEqual(semesters[0].slug, f'term-0-{semesters[0].semester_id.lower()}')
+        batches = Batch.objects.filter(semester__in=semesters, is_default=True)
+        self.assertEqual(batches.count(), 5)
+        self.assertTrue(all(batch.batch_id and batch.slug for batch in batches))
+
+        departments = Department.objects.bulk_create([
+            Department(department_name=name, department_start_date='2020-01-01') for name in ('Chemistry', 'Biology')
+        ])
+        self.assertEqual([department.department_id.rsplit('-', 1)[0] for department in departments],
+                         ['TechAI-Chemistry', 'TechAI-Biology'])
+
+    def test_update_does_not_touch_batches(self):
+        semester = Semester.objects.create(
+            semester_name='Fall', academic_year='2025-2026', department=self.department,
+            start_date='2025-09-01', end_date='2025-12-20'
+        )
+        semester.batches.all().delete()
+        semester.status = 'running'
+        # The UPDATE itself and the analytics snapshot and department rollup invalidations
+        with self.assertNumQueries(3):
+            semester.save()
+        self.assertFalse(semester.batches.exists())
+
+
+class UnreadNotificationCountTestCase(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='admin@example.com', email='admin@example.com', password='adminpass123', is_admin=True
+        )
+
+    def unread_count(self):
+        return get_user_model().objects.values_list('unread_notification_count', flat=True).get(pk=self.user.pk)
+
+    def test_counter_follows_writes(self):
+        first = Notification.objects.create(user=self.user, message='one')
+        Notification.objects.create(user=self.user, message='two')
+        notifications.bulk_create_notifications([Notification(user=self.user, message=str(i)) for i in range(3)])
+        self.assertEqual(self.unread_count(), 5)
+
+        first.is_read = True
+        first.save()
+        Notification.objects.get(message='two').delete()
+        first.delete()
+        self.assertEqual(self.unread_count(), 3)
+
+        Notification.objects.create(user=self.user, message='extra')
+        get_user_model().objects.filter(pk=self.user.pk).update(unread_notification_count=0)
+        notifications.recount_unread()
+        self.assertEqual(self.unread_count(), 4)
+
+        self.client.force_login(self.user)
+        self.client.post(reverse('mark_notification_as_read'))
+        self.assertEqual(self.unread_count(), 0)
+        Notification.objects.create(user=self.user, message='again')
+        self.client.post(reverse('clear_all_notification'))
+        self.assertEqual(self.unread_count(), 0)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_mark_all_read_keeps_concurrent_deliveries(self):
+        Notification.objects.create(user=self.user, message='one')
+        Notification.objects.create(user=self.user, message='two')
+        # Counted by a delivery whose row is not visible yet
+        adjust_unread_count([self.user.pk], 1)
+
+        self.assertEqual(notifications.mark_all_read(self.user), 2)
+        self.assertEqual(self.unread_count(), 1)
+
+    def test_pages_only_query_notifications_when_listing_them(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries if 'school_notification' in query['sql']])
+
+        Notification.objects.create(user=self.user, message='Semester created')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin_dashboard'))
+        self.assertContains(response, 'Semester created')
+        self.assertEqual(len([query for query in queries if 'school_notification' in query['sql']]), 1)
+        self.assertEqual(response.context['unread_notification_count'], 1)
+
+
+class NotificationQueueTestCase(TestCase):
+    def setUp(self):
+        self.users = [
+            get_user_model().objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='x')
+            for i in range(3)
+        ]
+
+    def test_views_only_enqueue_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertNumQueries(0):
+                queued = notifications.create_notifications(
+                    [(user, 'Exam moved') for user in self.users] + [(self.users[0], 'Exam moved'), (None, 'nobody')]
+                )
+        self.assertEqual(queued, 3)
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+        with self.assertNumQueries(1):
+            for callback in callbacks:
+                callback()
+        self.assertEqual(NotificationOutbox.objects.count(), 3)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_worker_batches_and_deduplicates_bursts(self):
+        Notification.objects.create(user=self.users[2], message='Exam moved')
+        NotificationOutbox.objects.bulk_create(
+            [NotificationOutbox(user=user, message='Exam moved') for user in self.users]
+            + [NotificationOutbox(user=self.users[0], message='Exam moved'),
+               NotificationOutbox(user=self.users[1], message='Room changed')]
+        )
+
+        self.assertEqual(notifications.process_outbox(batch_size=3), (2, 1))
+        self.assertEqual(notifications.drain_outbox(), (1, 1))
+        self.assertFalse(NotificationOutbox.objects.exists())
+        self.assertEqual(
+            sorted(Notification.objects.values_list('user__username', 'message')),
+            [('user0', 'Exam moved'), ('user1', 'Exam moved'), ('user1', 'Room changed'), ('user2', 'Exam moved')]
+        )
+        self.assertEqual(
+            list(get_user_model().objects.order_by('username').values_list('unread_notification_count', flat=True)),
+            [1, 2, 1]
+        )
+
+    def test_deduplicates_by_time_between_occurrences(self):
+        now = timezone.now()
+        delivered = Notification.objects.create(user=self.users[0], message='Exam moved')
+        Notification.objects.filter(pk=delivered.pk).update(created_at=now - timedelta(minutes=30))
+        for minutes in (20, 18, 10):
+            queued = NotificationOutbox.objects.create(user=self.users[0], message='Exam moved')
+            NotificationOutbox.objects.filter(pk=queued.pk).update(created_at=now - timedelta(minutes=minutes))
+
+        # 20 minutes ago is past the window of the earlier delivery, 18 is a repeat of it, 10 is not
+        self.assertEqual(notifications.process_outbox(), (2, 1))
+        self.assertEqual(Notification.objects.filter(user=self.users[0]).count(), 3)
+
+    def test_command(self):
+        NotificationOutbox.objects.create(user=self.users[0], message='Welcome')
+        out = StringIO()
+        call_command('process_notifications', '--once', stdout=out)
+
+        self.assertIn('Delivered 1 notification(s), skipped 0 duplicate(s)', out.getvalue())
+        self.assertTrue(Notification.objects.filter(user=self.users[0], message='Welcome').exists())
@@ -0,0 +1,35 @@
+# school/transactions.py
+"""
+Transactions that write after reading what they are about to change.
+
+SQLite ignores SELECT ... FOR UPDATE and opens transactions in DEFERRED
+mode: two writers can both read a seat counter, and the second one's
+upgrade to a write lock then fails with "database is locked" instead of
+waiting. write_atomic() opens its transaction with BEGIN IMMEDIATE, taking
+the write lock up front so such writers queue behind each other, while the
+rest of the site keeps the default mode and its reads never wait on a
+writer. Other backends get a plain atomic() and rely on row locks.
+"""
+from contextlib import contextmanager
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+
+@contextmanager
+def write_atomic(using=DEFAULT_DB_ALIAS):
+    """transaction.atomic() that takes SQLite's write lock when it opens the transaction"""
+    connection = transaction.get_connection(using)
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+
+    # Connecting reads transaction_mode from OPTIONS, so connect before overriding it
+    connection.ensure_connection()
+    mode = connection.transaction_mode
+    connection.transaction_mode = 'IMMEDIATE'
+    try:
+        with transaction.atomic(using=using):
+            connection.transaction_mode = mode
+            yield
+    finally:
+        connection.transaction_mode = mode
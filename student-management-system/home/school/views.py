@@ -3,9 +3,11 @@ from django.http import HttpResponse
 from django.shortcuts import render, redirect
 from django.http import JsonResponse
 from .models import Notification
+from . import notifications as notification_service
 from django.http import HttpResponseForbidden
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from semesters.services.dashboard import get_stats as get_dashboard_stats
 
 # Create your views here.
 
@@ -19,12 +21,8 @@ def dashboard(request):
         messages.error(request, 'Access denied. Student access required.')
         return redirect('index')
     
-    unread_notification = Notification.objects.filter(user=request.user, is_read=False)
-    unread_notification_count = unread_notification.count()
-    
+    # Unread notifications come from school.context_processors.notifications
     context = {
-        'unread_notification': unread_notification,
-        'unread_notification_count': unread_notification_count,
         'user': request.user
     }
     return render(request, "students/student-dashboard.html", context)
@@ -36,12 +34,8 @@ def teacher_dashboard(request):
         messages.error(request, 'Access denied. Teacher access required.')
         return redirect('index')
     
-    unread_notification = Notification.objects.filter(user=request.user, is_read=False)
-    unread_notification_count = unread_notification.count()
-    
+    # Unread notifications come from school.context_processors.notifications
     context = {
-        'unread_notification': unread_notification,
-        'unread_notification_count': unread_notification_count,
         'user': request.user
     }
     return render(request, "teachers/teacher-dashboard.html", context)
@@ -53,12 +47,8 @@ def admin_dashboard(request):
         messages.error(request, 'Access denied. Admin access required.')
         return redirect('index')
     
-    unread_notification = Notification.objects.filter(user=request.user, is_read=False)
-    unread_notification_count = unread_notification.count()
-    
-    # Get some statistics for admin dashboard
-    from student.models import Student
-    from teachers.models import Teacher
+    # Cached counts shared with the semesters dashboard stats endpoint
+    stats = get_dashboard_stats()
     # try:
         # from department.models import Department
         # from subjects.models import Subject
@@ -68,15 +58,11 @@ def admin_dashboard(request):
         # total_departments = 0
         # total_subjects = 0
     
-    total_students = Student.objects.count()
-    total_teachers = Teacher.objects.count() if 'teachers' in locals() else 0
-    
+    # Unread notifications come from school.context_processors.notifications
     context = {
-        'unread_notification': unread_notification,
-        'unread_notification_count': unread_notification_count,
         'user': request.user,
-        'total_students': total_students,
-        'total_teachers': total_teachers,
+        'total_students': stats['school']['total_students'],
+        'total_teachers': stats['school']['total_teachers'],
         # 'total_departments': total_departments,
         # 'total_subjects': total_subjects,
     }
@@ -84,21 +70,19 @@ def admin_dashboard(request):
 
 def mark_notification_as_read(request):
     if request.method == 'POST':
-        notification = Notification.objects.filter(user=request.user, is_read=False)
-        notification.update(is_read=True)
+        notification_service.mark_all_read(request.user)
         return JsonResponse({'status': 'success'})
     return HttpResponseForbidden()
 
 def clear_all_notification(request):
     if request.method == "POST":
-        notification = Notification.objects.filter(user=request.user)
-        notification.delete()
+        notification_service.clear_all(request.user)
         return JsonResponse({'status': 'success'})
     return HttpResponseForbidden()
 
 @login_required
 def get_notification_data(request):
-    unread_notification = Notification.objects.filter(user=request.user, is_read=False)
+    unread_notification = Notification.objects.filter(user=request.user, is_read=False).select_related('user')
     notifications_data = [
         {
             'username': n.user.username,
@@ -108,6 +92,6 @@ def get_notification_data(request):
         for n in unread_notification
     ]
     return JsonResponse({
-        'count': unread_notification.count(),
+        'count': len(notifications_data),
         'notifications': notifications_data
     })
\ No newline at end of file
@@ -3,7 +3,7 @@ from django.contrib import admin
 # Register your models here.
 # semesters/admin.py
 from django.contrib import admin
-from .models import Semester, Batch, SemesterSubject, SemesterEnrollment
+from .models import Semester, Batch, SemesterSubject, SemesterEnrollment, ArchivedSemesterEnrollment
 
 @admin.register(Semester)
 class SemesterAdmin(admin.ModelAdmin):
@@ -109,6 +109,19 @@ class SemesterEnrollmentAdmin(admin.ModelAdmin):
         queryset = super().get_queryset(request)
         return queryset.select_related('semester', 'student', 'enrolled_by')
 
+@admin.register(ArchivedSemesterEnrollment)
+class ArchivedSemesterEnrollmentAdmin(admin.ModelAdmin):
+    list_display = ('student', 'semester', 'status', 'enrollment_date', 'archived_at')
+    list_filter = ('status', 'archived_at')
+    search_fields = ('student__first_name', 'student__last_name', 'student__student_id', 'semester__semester_name')
+    list_select_related = ('student', 'semester')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 # Customize the admin site header
 admin.site.site_header = "School Management System"
 admin.site.site_title = "SMS Admin"
@@ -1,6 +1,25 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class SemestersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'semesters'
+
+    def ready(self):
+        from .services.analytics import apply_enrollment_changes
+        from .services.dashboard import invalidate_stats
+        from .services.workload import invalidate_assignment, invalidate_enrollments
+        from .signals import enrollments_changed
+        enrollments_changed.connect(apply_enrollment_changes, dispatch_uid='semester_analytics_snapshot')
+
+        # Writes that move the dashboard counts
+        enrollments_changed.connect(invalidate_stats, dispatch_uid='dashboard_stats')
+        for model in ('semesters.Semester', 'semesters.SemesterSubject', 'student.Student', 'teachers.Teacher'):
+            post_save.connect(invalidate_stats, sender=model, dispatch_uid=f'dashboard_stats_save_{model}')
+            post_delete.connect(invalidate_stats, sender=model, dispatch_uid=f'dashboard_stats_delete_{model}')
+
+        # Writes that move the cached teacher workload of a semester
+        enrollments_changed.connect(invalidate_enrollments, dispatch_uid='teacher_workload')
+        post_save.connect(invalidate_assignment, sender='semesters.SemesterSubject', dispatch_uid='teacher_workload_save')
+        post_delete.connect(invalidate_assignment, sender='semesters.SemesterSubject', dispatch_uid='teacher_workload_delete')
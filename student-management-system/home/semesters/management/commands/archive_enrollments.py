@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from semesters.models import Semester
+from semesters.services.archive import BATCH_SIZE, archive_enrollments
+
+
+class Command(BaseCommand):
+    help = "Move completed and dropped enrollments of closed semesters into the archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--semester',
+            metavar='SLUG',
+            help="Only archive the enrollments of this semester",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help="Rows moved per transaction",
+        )
+
+    def handle(self, *args, **options):
+        semesters = None
+        if options['semester']:
+            semesters = Semester.objects.filter(slug=options['semester'])
+            if not semesters.exists():
+                raise CommandError(f"Semester '{options['semester']}' does not exist")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        semester_count, subject_count = archive_enrollments(semesters, options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {semester_count} semester and {subject_count} subject enrollment(s)"
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from semesters.models import Semester
+from semesters.services.analytics import rebuild_snapshot
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed analytics snapshots of semesters from scratch"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--semester',
+            metavar='SLUG',
+            help="Only rebuild the snapshot of this semester",
+        )
+
+    def handle(self, *args, **options):
+        semesters = Semester.objects.select_related('department')
+        if options['semester']:
+            semesters = semesters.filter(slug=options['semester'])
+            if not semesters.exists():
+                raise CommandError(f"Semester '{options['semester']}' does not exist")
+
+        rebuilt = 0
+        for semester in semesters.iterator():
+            rebuild_snapshot(semester)
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} analytics snapshot(s)"))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from school.pagination import subquery_count
+from semesters.models import Batch, SemesterSubject, SemesterEnrollment, SubjectEnrollment
+
+
+class Command(BaseCommand):
+    help = "Recompute active_enrollment_count on batches and semester subjects and repair any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report drifted counters without fixing them",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        targets = [
+            (Batch, SemesterEnrollment, 'batch'),
+            (SemesterSubject, SubjectEnrollment, 'semester_subject'),
+        ]
+
+        total_drifted = 0
+        for model, enrollment_model, outer_field in targets:
+            def actual():
+                return subquery_count(enrollment_model.objects.filter(status='active'), outer_field)
+
+            drifted = list(
+                model.objects
+                .annotate(actual=actual())
+                .exclude(active_enrollment_count=F('actual'))
+                .values_list('pk', 'active_enrollment_count', 'actual')
+            )
+            for pk, stored, count in drifted:
+                self.stdout.write(f"{model.__name__} {pk}: stored={stored} actual={count}")
+
+            if drifted and not dry_run:
+                # The count is taken inside the UPDATE itself, as in migration
+                # 0004, so increments committed since the report are not lost
+                model.objects.filter(pk__in=[pk for pk, _, _ in drifted]).update(
+                    active_enrollment_count=actual()
+                )
+
+            total_drifted += len(drifted)
+            self.stdout.write(f"{model.__name__}: {len(drifted)} drifted counter(s)")
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f"Dry run: {total_drifted} counter(s) left unchanged"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {total_drifted} counter(s)"))
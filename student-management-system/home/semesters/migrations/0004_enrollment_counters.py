@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:35
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_enrollment_counts(apps, schema_editor):
+    Batch = apps.get_model('semesters', 'Batch')
+    SemesterSubject = apps.get_model('semesters', 'SemesterSubject')
+    SemesterEnrollment = apps.get_model('semesters', 'SemesterEnrollment')
+    SubjectEnrollment = apps.get_model('semesters', 'SubjectEnrollment')
+
+    batch_counts = SemesterEnrollment.objects.filter(
+        batch=OuterRef('pk'), status='active'
+    ).order_by().values('batch').annotate(total=Count('id')).values('total')
+    Batch.objects.update(active_enrollment_count=Coalesce(Subquery(batch_counts), 0))
+
+    subject_counts = SubjectEnrollment.objects.filter(
+        semester_subject=OuterRef('pk'), status='active'
+    ).order_by().values('semester_subject').annotate(total=Count('id')).values('total')
+    SemesterSubject.objects.update(active_enrollment_count=Coalesce(Subquery(subject_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('semesters', '0003_remove_semester_students_remove_semester_subjects_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='batch',
+            name='active_enrollment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='semestersubject',
+            name='active_enrollment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_enrollment_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('semesters', '0004_enrollment_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SemesterAnalyticsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.JSONField(default=dict)),
+                ('daily_enrollments', models.JSONField(default=dict, help_text='Enrollments created per day, keyed by ISO date')),
+                ('is_stale', models.BooleanField(default=False)),
+                ('computed_at', models.DateTimeField(help_text='Time of the last full rebuild')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('semester', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='analytics_snapshot', to='semesters.semester')),
+            ],
+        ),
+    ]
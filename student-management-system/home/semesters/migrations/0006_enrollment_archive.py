@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:02
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('semesters', '0005_semester_analytics_snapshot'),
+        ('student', '0008_student_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedSemesterEnrollment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('enrollment_date', models.DateTimeField()),
+                ('status', models.CharField(choices=[('active', 'Active'), ('inactive', 'Inactive'), ('dropped', 'Dropped'), ('completed', 'Completed')], max_length=20)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('batch', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='semesters.batch')),
+                ('enrolled_by', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('semester', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_enrollments', to='semesters.semester')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_semester_enrollments', to='student.student')),
+            ],
+            options={
+                'ordering': ['-enrollment_date'],
+                'indexes': [models.Index(fields=['semester', 'student'], name='semesters_a_semeste_708efe_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedSubjectEnrollment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('semester_enrollment_id', models.BigIntegerField(null=True)),
+                ('enrollment_date', models.DateTimeField()),
+                ('status', models.CharField(choices=[('active', 'Active'), ('inactive', 'Inactive'), ('dropped', 'Dropped'), ('completed', 'Completed')], max_length=20)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('enrolled_by', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('semester_subject', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_enrollments', to='semesters.semestersubject')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_subject_enrollments', to='student.student')),
+            ],
+            options={
+                'ordering': ['-enrollment_date'],
+                'indexes': [models.Index(fields=['semester_subject', 'student'], name='semesters_a_semeste_57150e_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('semesters', '0006_enrollment_archive'),
+        ('student', '0008_student_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='semesterenrollment',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['semester', 'student'], name='semenr_active_semester_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='semesterenrollment',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['batch', 'student'], name='semenr_active_batch_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectenrollment',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['semester_subject', 'student'], name='subenr_active_subject_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectenrollment',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['semester_enrollment', 'semester_subject'], name='subenr_active_semenr_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectenrollment',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['student', 'semester_enrollment'], name='subenr_active_student_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('semesters', '0007_active_enrollment_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='batch',
+            name='batch_id',
+            field=models.CharField(blank=True, max_length=20, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='semester',
+            name='semester_id',
+            field=models.CharField(blank=True, max_length=20, unique=True),
+        ),
+    ]
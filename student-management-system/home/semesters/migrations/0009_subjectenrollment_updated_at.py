@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    SubjectEnrollment = apps.get_model('semesters', 'SubjectEnrollment')
+    SubjectEnrollment.objects.update(updated_at=models.F('enrollment_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('semesters', '0008_assign_ids_on_insert'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subjectenrollment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='subjectenrollment',
+            index=models.Index(fields=['semester_subject', 'updated_at'], name='subenr_subject_updated_idx'),
+        ),
+    ]
@@ -1,34 +1,111 @@
 from django.db import models
-from django.utils.text import slugify
 from django.conf import settings
 from django.contrib.auth.models import User
 from department.models import Department
 from subjects.models import Subject
 from teachers.models import Teacher
 from student.models import Student
-import random
-import string
-from django.db.models.signals import pre_save
+from django.db import DatabaseError
+from django.db.models import F, Q
+from django.db.models.signals import pre_save, post_init, post_save, post_delete
 from django.dispatch import receiver
+from django.utils import timezone
+from .signals import enrollments_changed, in_bulk_write
+from school.identifiers import IdentifierAllocator
+from school.transactions import write_atomic
+from school.lifecycle import PreparedModel, assign_identifiers, assign_slugs
+
+
+SEMESTER_IDS = IdentifierAllocator('semester', 'SEM-{number:05d}', 'semesters.Semester', 'semester_id')
+BATCH_IDS = IdentifierAllocator('batch', 'BATCH-{number:05d}', 'semesters.Batch', 'batch_id')
 
 
 def generate_semester_id():
     """Generate a unique semester ID in the format SEM-XXXXX."""
-    while True:
-        random_digits = ''.join(random.choices(string.digits, k=5))
-        semester_id = f"SEM-{random_digits}"
-        if not Semester.objects.filter(semester_id=semester_id).exists():
-            return semester_id
+    return SEMESTER_IDS.next()
 
 def generate_batch_id():
     """Generate a unique batch ID in the format BATCH-XXXXX."""
-    while True:
-        random_digits = ''.join(random.choices(string.digits, k=5))
-        batch_id = f"BATCH-{random_digits}"
-        if not Batch.objects.filter(batch_id=batch_id).exists():
-            return batch_id
+    return BATCH_IDS.next()
+
+class SeatReservationConflict(DatabaseError):
+    """A seat counter changed although reserve_seats() held its row lock"""
+
+
+class EnrollmentCapacityMixin(models.Model):
+    """
+    Persisted count of active enrollments for a capacity-limited row.
+
+    The counter is maintained by the enrollment signals below and by the bulk
+    enrollment services, so it is never written back from a stale instance.
+    """
+    active_enrollment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'active_enrollment_count'
+            ]
+        super().save(*args, **kwargs)
+
+    def has_seat_limit(self):
+        return True
+
+    def reserve_seats(self, requested):
+        """
+        Claim up to ``requested`` seats and return how many were granted (0
+        when full).
 
-class Semester(models.Model):
+        The row stays locked from the read to the update, so concurrent
+        enrollments queue behind each other and cannot overbook it. The update
+        re-checks the counter it read and raises SeatReservationConflict if the
+        backend did not hold the lock (on SQLite, callers that already opened
+        the transaction must have done so with school.transactions.write_atomic).
+        """
+        if requested <= 0:
+            return 0
+
+        model = type(self)
+        with write_atomic():
+            row = model.objects.select_for_update().values(
+                'max_students', 'active_enrollment_count'
+            ).get(pk=self.pk)
+            self.max_students = row['max_students']
+            self.active_enrollment_count = row['active_enrollment_count']
+
+            if self.has_seat_limit():
+                granted = min(requested, self.get_available_spots())
+            else:
+                granted = requested
+            if granted == 0:
+                return 0
+
+            if not model.objects.filter(
+                pk=self.pk,
+                active_enrollment_count=row['active_enrollment_count']
+            ).update(active_enrollment_count=F('active_enrollment_count') + granted):
+                raise SeatReservationConflict(f"{model.__name__} {self.pk} changed while its seats were locked")
+        self.active_enrollment_count += granted
+        return granted
+
+    def release_seats(self, count):
+        """Give back seats claimed with reserve_seats"""
+        if count > 0:
+            adjust_enrollment_count(type(self), self.pk, -count)
+            self.active_enrollment_count = max(0, self.active_enrollment_count - count)
+
+    class Meta:
+        abstract = True
+
+
+def adjust_enrollment_count(model, pk, delta):
+    """Apply a relative change to a row's active_enrollment_count with an F() update"""
+    if pk and delta:
+        model.objects.filter(pk=pk).update(active_enrollment_count=F('active_enrollment_count') + delta)
+
+
+class Semester(PreparedModel):
     STATUS_CHOICES = [
         ('upcoming', 'Upcoming'),
         ('running', 'Running'),
@@ -36,7 +113,7 @@ class Semester(models.Model):
         ('cancelled', 'Cancelled'),
     ]
     
-    semester_id = models.CharField(max_length=20, unique=True, default=generate_semester_id)
+    semester_id = models.CharField(max_length=20, unique=True, blank=True)
     semester_name = models.CharField(max_length=200)
     department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='semesters')
     academic_year = models.CharField(max_length=20, help_text="e.g., 2024-2025")
@@ -50,24 +127,32 @@ class Semester(models.Model):
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(f"{self.semester_name}-{self.semester_id}")
-        super().save(*args, **kwargs)
-        
-        # Auto-create default batch if it doesn't exist
-        if not hasattr(self, '_skip_batch_creation') and not self.batches.exists():
-            self.create_auto_batch()
-    
-    def create_auto_batch(self):
-        """Automatically create a batch for this semester"""
-        batch_name = f"{self.semester_name} - Default Batch"
-        Batch.objects.create(
+    @classmethod
+    def prepare_for_insert(cls, objs):
+        assign_identifiers(objs, 'semester_id', SEMESTER_IDS)
+        assign_slugs(objs, lambda semester: f"{semester.semester_name}-{semester.semester_id}")
+
+    @classmethod
+    def after_insert(cls, objs):
+        # A new semester has no batches yet; updates never create one
+        Batch.objects.bulk_create([
+            semester.default_batch() for semester in objs if not hasattr(semester, '_skip_batch_creation')
+        ])
+
+    def default_batch(self):
+        """Unsaved default batch for this semester"""
+        return Batch(
             semester=self,
-            batch_name=batch_name,
+            batch_name=f"{self.semester_name} - Default Batch",
             academic_year=self.academic_year,
             is_default=True
         )
+
+    def create_auto_batch(self):
+        """Automatically create a batch for this semester"""
+        batch = self.default_batch()
+        batch.save()
+        return batch
     
     def get_student_count(self):
         """Get total students enrolled in this semester"""
@@ -92,8 +177,8 @@ class Semester(models.Model):
         ordering = ['-created_at']
         unique_together = ['semester_name', 'academic_year', 'department']
 
-class Batch(models.Model):
-    batch_id = models.CharField(max_length=20, unique=True, default=generate_batch_id)
+class Batch(EnrollmentCapacityMixin, PreparedModel):
+    batch_id = models.CharField(max_length=20, unique=True, blank=True)
     batch_name = models.CharField(max_length=200)
     semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='batches')
     academic_year = models.CharField(max_length=20)
@@ -104,22 +189,22 @@ class Batch(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(f"{self.batch_name}-{self.batch_id}")
-        super().save(*args, **kwargs)
+    @classmethod
+    def prepare_for_insert(cls, objs):
+        assign_identifiers(objs, 'batch_id', BATCH_IDS)
+        assign_slugs(objs, lambda batch: f"{batch.batch_name}-{batch.batch_id}")
     
     def get_enrolled_count(self):
         """Get number of students enrolled in this batch"""
-        return self.enrollments.filter(status='active').count()
+        return self.active_enrollment_count
     
     def get_available_spots(self):
         """Get available spots in this batch"""
-        return max(0, self.max_students - self.get_enrolled_count())
+        return max(0, self.max_students - self.active_enrollment_count)
     
     def can_enroll_student(self):
         """Check if batch can accept more students"""
-        return self.get_enrolled_count() < self.max_students
+        return self.active_enrollment_count < self.max_students
 
     def __str__(self):
         return f"{self.batch_name} ({self.batch_id})"
@@ -128,7 +213,7 @@ class Batch(models.Model):
         ordering = ['-created_at']
         unique_together = ['batch_name', 'semester']
 
-class SemesterSubject(models.Model):
+class SemesterSubject(EnrollmentCapacityMixin, models.Model):
     semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='semester_subjects')
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='semester_assignments')
     teacher = models.ForeignKey(Teacher, on_delete=models.SET_NULL, null=True, blank=True, related_name='semester_teachings')
@@ -142,17 +227,20 @@ class SemesterSubject(models.Model):
 
     def get_enrolled_count(self):
         """Get number of students enrolled in this subject"""
-        return self.subject_enrollments.filter(status='active').count()
+        return self.active_enrollment_count
     
     def get_available_spots(self):
         """Get available spots for this subject"""
         if self.max_students == 0:
             return float('inf')  # No limit
-        return max(0, self.max_students - self.get_enrolled_count())
+        return max(0, self.max_students - self.active_enrollment_count)
     
     def can_enroll_student(self):
         """Check if subject can accept more students"""
-        return self.max_students == 0 or self.get_enrolled_count() < self.max_students
+        return self.max_students == 0 or self.active_enrollment_count < self.max_students
+    
+    def has_seat_limit(self):
+        return self.max_students != 0
     
     def __str__(self):
         teacher_name = self.teacher.get_full_name() if self.teacher else "No Teacher Assigned"
@@ -185,6 +273,12 @@ class SemesterEnrollment(models.Model):
     class Meta:
         unique_together = ['semester', 'student']
         ordering = ['-enrollment_date']
+        # Partial indexes over the active rows the views filter on, covering
+        # the student column so membership checks never touch the table
+        indexes = [
+            models.Index(fields=['semester', 'student'], condition=Q(status='active'), name='semenr_active_semester_idx'),
+            models.Index(fields=['batch', 'student'], condition=Q(status='active'), name='semenr_active_batch_idx'),
+        ]
 
 class SubjectEnrollment(models.Model):
     """Students enrolled in specific subjects within a semester"""
@@ -199,6 +293,8 @@ class SubjectEnrollment(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='subject_enrollments')
     semester_enrollment = models.ForeignKey(SemesterEnrollment, on_delete=models.CASCADE, related_name='subject_enrollments',   null=True,)
     enrollment_date = models.DateTimeField(auto_now_add=True)
+    # auto_now only covers save(); bulk update() calls set it themselves
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=20, choices=ENROLLMENT_STATUS_CHOICES, default='active')
     enrolled_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
     notes = models.TextField(blank=True, null=True)
@@ -209,6 +305,71 @@ class SubjectEnrollment(models.Model):
     class Meta:
         unique_together = ['semester_subject', 'student']
         ordering = ['-enrollment_date']
+        indexes = [
+            models.Index(fields=['semester_subject', 'student'], condition=Q(status='active'), name='subenr_active_subject_idx'),
+            models.Index(fields=['semester_enrollment', 'semester_subject'], condition=Q(status='active'), name='subenr_active_semenr_idx'),
+            models.Index(fields=['student', 'semester_enrollment'], condition=Q(status='active'), name='subenr_active_student_idx'),
+            models.Index(fields=['semester_subject', 'updated_at'], name='subenr_subject_updated_idx'),
+        ]
+
+class ArchivedSemesterEnrollment(models.Model):
+    """
+    Completed or dropped SemesterEnrollment of a closed semester, moved out of
+    the hot table by the archive_enrollments command. Same columns keyed by
+    the original id; only the lookups history pages need are indexed.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name='archived_enrollments', db_index=False)
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='archived_semester_enrollments')
+    batch = models.ForeignKey(Batch, on_delete=models.SET_NULL, null=True, blank=True, related_name='+', db_index=False)
+    enrollment_date = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=SemesterEnrollment.ENROLLMENT_STATUS_CHOICES)
+    enrolled_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='+', db_index=False)
+    notes = models.TextField(blank=True, null=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.student} {self.get_status_display().lower()} {self.semester.semester_name} (archived)"
+
+    class Meta:
+        indexes = [models.Index(fields=['semester', 'student'])]
+        ordering = ['-enrollment_date']
+
+class ArchivedSubjectEnrollment(models.Model):
+    """Completed or dropped SubjectEnrollment of a closed semester, see ArchivedSemesterEnrollment"""
+    id = models.BigIntegerField(primary_key=True)
+    semester_subject = models.ForeignKey(SemesterSubject, on_delete=models.CASCADE, related_name='archived_enrollments', db_index=False)
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='archived_subject_enrollments')
+    # Hot or archived semester enrollment, hence no foreign key
+    semester_enrollment_id = models.BigIntegerField(null=True)
+    enrollment_date = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=SubjectEnrollment.ENROLLMENT_STATUS_CHOICES)
+    enrolled_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='+', db_index=False)
+    notes = models.TextField(blank=True, null=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.student} {self.get_status_display().lower()} {self.semester_subject} (archived)"
+
+    class Meta:
+        indexes = [models.Index(fields=['semester_subject', 'student'])]
+        ordering = ['-enrollment_date']
+
+class SemesterAnalyticsSnapshot(models.Model):
+    """
+    Precomputed analytics payload of a semester, kept current by the
+    enrollments_changed signal and rebuilt when marked stale.
+    """
+    semester = models.OneToOneField(Semester, on_delete=models.CASCADE, related_name='analytics_snapshot')
+    payload = models.JSONField(default=dict)
+    daily_enrollments = models.JSONField(default=dict, help_text="Enrollments created per day, keyed by ISO date")
+    is_stale = models.BooleanField(default=False)
+    computed_at = models.DateTimeField(help_text="Time of the last full rebuild")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Analytics for {self.semester}"
+
 
 # Signal to ensure subject enrollments are linked to semester enrollments
 
@@ -225,4 +386,130 @@ def ensure_semester_enrollment(sender, instance, **kwargs):
         if semester_enrollment:
             instance.semester_enrollment = semester_enrollment
         else:
-            raise ValueError(f"Student {instance.student} must be enrolled in semester {instance.semester_subject.semester} before enrolling in subjects")
\ No newline at end of file
+            raise ValueError(f"Student {instance.student} must be enrolled in semester {instance.semester_subject.semester} before enrolling in subjects")
+
+
+# Signals keeping Batch and SemesterSubject active_enrollment_count in step with
+# single-row writes. Bulk writes (bulk_create, queryset.update) bypass them and
+# adjust the counters themselves, as do bulk deletes run under signals.bulk_write().
+
+def _counted_target(instance, target_field):
+    """Return the counter row an enrollment currently counts towards, if any"""
+    if instance.__dict__.get('status') != 'active':
+        return None
+    return instance.__dict__.get(target_field)
+
+
+def _track_counted_target(instance, target_field):
+    instance._counted_target = _counted_target(instance, target_field)
+    instance._counted_active = instance.__dict__.get('status') == 'active'
+
+
+def _sync_counter(instance, model, target_field, created):
+    """Move the counted seat of an enrollment and return the {pk: delta} applied"""
+    previous = None if created else getattr(instance, '_counted_target', None)
+    current = _counted_target(instance, target_field)
+    deltas = {}
+    if previous != current:
+        adjust_enrollment_count(model, previous, -1)
+        adjust_enrollment_count(model, current, 1)
+        deltas = {pk: delta for pk, delta in ((previous, -1), (current, 1)) if pk}
+    instance._counted_target = current
+    return deltas
+
+
+def _active_delta(instance, created):
+    """Return -1, 0 or 1 for the change in the enrollment's active status"""
+    was_active = not created and getattr(instance, '_counted_active', False)
+    instance._counted_active = instance.status == 'active'
+    return int(instance._counted_active) - int(was_active)
+
+
+@receiver(post_init, sender=SemesterEnrollment)
+def track_semester_enrollment(sender, instance, **kwargs):
+    _track_counted_target(instance, 'batch_id')
+
+
+@receiver(post_save, sender=SemesterEnrollment)
+def count_semester_enrollment(sender, instance, created, **kwargs):
+    if in_bulk_write():
+        return
+    batches = _sync_counter(instance, Batch, 'batch_id', created)
+    students = _active_delta(instance, created)
+    if created or batches or students:
+        enrollments_changed.send(
+            sender=SemesterEnrollment,
+            semester_id=instance.semester_id,
+            students=students,
+            batches=batches,
+            enrolled={timezone.localdate(instance.enrollment_date): 1} if created else {}
+        )
+
+
+@receiver(post_delete, sender=SemesterEnrollment)
+def uncount_semester_enrollment(sender, instance, **kwargs):
+    if in_bulk_write():
+        return
+    batch_id = getattr(instance, '_counted_target', None)
+    adjust_enrollment_count(Batch, batch_id, -1)
+    enrollments_changed.send(
+        sender=SemesterEnrollment,
+        semester_id=instance.semester_id,
+        students=-1 if getattr(instance, '_counted_active', False) else 0,
+        batches={batch_id: -1} if batch_id else {},
+        enrolled={timezone.localdate(instance.enrollment_date): -1}
+    )
+
+
+@receiver(post_init, sender=SubjectEnrollment)
+def track_subject_enrollment(sender, instance, **kwargs):
+    _track_counted_target(instance, 'semester_subject_id')
+
+
+@receiver(post_save, sender=SubjectEnrollment)
+def count_subject_enrollment(sender, instance, created, **kwargs):
+    if in_bulk_write():
+        return
+    subjects = _sync_counter(instance, SemesterSubject, 'semester_subject_id', created)
+    if subjects:
+        enrollments_changed.send(
+            sender=SubjectEnrollment,
+            semester_id=instance.semester_subject.semester_id,
+            subjects=subjects
+        )
+
+
+@receiver(post_delete, sender=SubjectEnrollment)
+def uncount_subject_enrollment(sender, instance, **kwargs):
+    if in_bulk_write():
+        return
+    semester_subject_id = getattr(instance, '_counted_target', None)
+    adjust_enrollment_count(SemesterSubject, semester_subject_id, -1)
+    if semester_subject_id:
+        semester_id = SemesterSubject.objects.filter(pk=semester_subject_id).values_list('semester_id', flat=True).first()
+        enrollments_changed.send(
+            sender=SubjectEnrollment,
+            semester_id=semester_id,
+            subjects={semester_subject_id: -1}
+        )
+
+
+# Changes to a semester, its batches or its subjects reshape the analytics
+# payload rather than shifting counts, so the snapshot is rebuilt on next read.
+
+def _mark_analytics_stale(semester_id):
+    SemesterAnalyticsSnapshot.objects.filter(semester_id=semester_id).update(is_stale=True)
+
+
+@receiver(post_save, sender=Semester)
+def semester_changed(sender, instance, created, **kwargs):
+    if not created:
+        _mark_analytics_stale(instance.pk)
+
+
+@receiver(post_save, sender=Batch)
+@receiver(post_delete, sender=Batch)
+@receiver(post_save, sender=SemesterSubject)
+@receiver(post_delete, sender=SemesterSubject)
+def semester_structure_changed(sender, instance, **kwargs):
+    _mark_analytics_stale(instance.semester_id)
@@ -0,0 +1,194 @@
+# semesters/services/analytics.py
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from ..models import SemesterAnalyticsSnapshot, SemesterEnrollment
+import logging
+
+logger = logging.getLogger(__name__)
+
+TREND_DAYS = 30
+
+
+def _percentage(part, whole):
+    return round(part / whole * 100, 1) if whole > 0 else 0
+
+
+def summarise(payload):
+    """Recompute the derived figures of a payload from its enrolled counts"""
+    total_capacity = 0
+    for batch in payload['batches']:
+        enrolled = batch['enrolled_count']
+        batch['available_spots'] = max(0, batch['max_students'] - enrolled)
+        batch['utilization_percentage'] = _percentage(enrolled, batch['max_students'])
+        total_capacity += batch['max_students']
+
+    for subject in payload['subjects']:
+        enrolled = subject['enrolled_count']
+        if subject['max_students'] == 0:
+            subject['available_spots'] = 'Unlimited'
+            subject['utilization_percentage'] = None
+        else:
+            subject['available_spots'] = max(0, subject['max_students'] - enrolled)
+            subject['utilization_percentage'] = _percentage(enrolled, subject['max_students'])
+
+    subjects = payload['subjects']
+    total_students = payload['summary']['total_students']
+    subjects_with_teachers = sum(1 for subject in subjects if subject['teacher'])
+
+    payload['summary'] = {
+        'total_students': total_students,
+        'total_subjects': len(subjects),
+        'total_batches': len(payload['batches']),
+        'total_teachers': subjects_with_teachers,
+        'total_credits': sum(subject['credits'] for subject in subjects),
+        'total_hours_per_week': sum(subject['hours_per_week'] for subject in subjects),
+        'subjects_with_teachers': subjects_with_teachers,
+        'subjects_without_teachers': len(subjects) - subjects_with_teachers,
+        'subjects_without_students': sum(1 for subject in subjects if subject['enrolled_count'] == 0),
+        'average_students_per_subject': round(total_students / len(subjects), 2) if subjects else 0,
+        'total_capacity': total_capacity,
+        'available_capacity': max(0, total_capacity - total_students),
+        'capacity_utilization_percentage': _percentage(total_students, total_capacity),
+    }
+    return payload
+
+
+def build_payload(semester):
+    """Compute the full analytics payload of a semester"""
+    batches = semester.batches.annotate(
+        enrolled_count=Count('enrollments', filter=Q(enrollments__status='active'))
+    )
+    subjects = semester.semester_subjects.annotate(
+        enrolled_count=Count('subject_enrollments', filter=Q(subject_enrollments__status='active'))
+    ).select_related('subject', 'teacher')
+
+    payload = {
+        'semester_info': {
+            'id': semester.id,
+            'name': semester.semester_name,
+            'semester_id': semester.semester_id,
+            'department': semester.department.department_name,
+            'academic_year': semester.academic_year,
+            'status': semester.get_status_display(),
+            'start_date': semester.start_date.isoformat() if semester.start_date else None,
+            'end_date': semester.end_date.isoformat() if semester.end_date else None,
+            'created_at': semester.created_at.isoformat(),
+        },
+        'summary': {
+            'total_students': SemesterEnrollment.objects.filter(semester=semester, status='active').count(),
+        },
+        'batches': [{
+            'id': batch.id,
+            'name': batch.batch_name,
+            'max_students': batch.max_students,
+            'enrolled_count': batch.enrolled_count,
+            'is_default': batch.is_default,
+        } for batch in batches],
+        'subjects': [{
+            'id': subject.id,
+            'name': subject.subject.subject_name,
+            'code': getattr(subject.subject, 'subject_code', ''),
+            'credits': subject.credits,
+            'hours_per_week': subject.hours_per_week,
+            'max_students': subject.max_students,
+            'enrolled_count': subject.enrolled_count,
+            'teacher': {
+                'id': subject.teacher.id,
+                'name': subject.teacher.get_full_name(),
+                'email': subject.teacher.email,
+                'qualification': getattr(subject.teacher, 'qualification', ''),
+            } if subject.teacher else None,
+        } for subject in subjects],
+    }
+    return summarise(payload)
+
+
+def build_daily_enrollments(semester):
+    """Count the semester enrollments created per day"""
+    rows = SemesterEnrollment.objects.filter(semester=semester).annotate(
+        date=TruncDate('enrollment_date')
+    ).values('date').annotate(count=Count('id')).order_by('date')
+    return {row['date'].isoformat(): row['count'] for row in rows}
+
+
+def rebuild_snapshot(semester):
+    """Recompute and store the analytics snapshot of a semester"""
+    with transaction.atomic():
+        snapshot, _ = SemesterAnalyticsSnapshot.objects.select_for_update().get_or_create(
+            semester=semester,
+            defaults={'computed_at': timezone.now()}
+        )
+        snapshot.payload = build_payload(semester)
+        snapshot.daily_enrollments = build_daily_enrollments(semester)
+        snapshot.is_stale = False
+        snapshot.computed_at = timezone.now()
+        snapshot.save()
+
+    logger.info("Rebuilt analytics snapshot for %s", semester.semester_name)
+    semester.analytics_snapshot = snapshot
+    return snapshot
+
+
+def get_snapshot(semester, fresh=False):
+    """
+    Return the semester's analytics snapshot, rebuilding it when missing,
+    stale or when fresh=True. Load the semester with
+    select_related('analytics_snapshot') to serve it without extra queries.
+    """
+    snapshot = getattr(semester, 'analytics_snapshot', None)
+    if fresh or snapshot is None or snapshot.is_stale:
+        snapshot = rebuild_snapshot(semester)
+    return snapshot
+
+
+def trend_data(snapshot, days=TREND_DAYS):
+    """Daily enrollment counts of the last ``days`` days from the snapshot buckets"""
+    since = (timezone.localdate() - timedelta(days=days)).isoformat()
+    return [
+        {'date': date, 'count': count}
+        for date, count in sorted(snapshot.daily_enrollments.items())
+        if date >= since
+    ]
+
+
+def apply_enrollment_changes(sender, semester_id, students=0, batches=None, subjects=None, enrolled=None, **kwargs):
+    """
+    enrollments_changed receiver: shift the counts stored in the snapshot
+    instead of recomputing it. Snapshots that are missing or already stale
+    are left for the next read to rebuild.
+    """
+    if not semester_id:
+        return
+
+    # Senders are usually inside a transaction already; no savepoint needed
+    with transaction.atomic(savepoint=False):
+        snapshot = SemesterAnalyticsSnapshot.objects.select_for_update().filter(
+            semester_id=semester_id, is_stale=False
+        ).first()
+        if snapshot is None:
+            return
+
+        payload = snapshot.payload
+        payload['summary']['total_students'] += students
+
+        for section, deltas in (('batches', batches), ('subjects', subjects)):
+            entries = {entry['id']: entry for entry in payload[section]}
+            for pk, delta in (deltas or {}).items():
+                if pk not in entries:
+                    # Row created after the last rebuild; the payload no longer has the right shape
+                    snapshot.is_stale = True
+                    snapshot.save(update_fields=['is_stale', 'updated_at'])
+                    return
+                entries[pk]['enrolled_count'] += delta
+
+        for date, delta in (enrolled or {}).items():
+            key = date.isoformat()
+            count = snapshot.daily_enrollments.pop(key, 0) + delta
+            if count:
+                snapshot.daily_enrollments[key] = count
+
+        summarise(payload)
+        snapshot.save(update_fields=['payload', 'daily_enrollments', 'updated_at'])
@@ -0,0 +1,103 @@
+# semesters/services/archive.py
+"""
+Archival tier for enrollment history.
+
+Removing a student only changes the enrollment status, so the hot tables
+would keep every completed and dropped row forever. Once a semester is
+closed those rows are copied into the Archived* tables and deleted from the
+hot ones, in short chunked transactions.
+"""
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+from ..models import (
+    SemesterEnrollment, SubjectEnrollment, ArchivedSemesterEnrollment, ArchivedSubjectEnrollment,
+    SemesterAnalyticsSnapshot
+)
+from ..signals import bulk_write
+import logging
+
+logger = logging.getLogger(__name__)
+
+CLOSED_SEMESTER_STATUSES = ('completed', 'cancelled')
+ARCHIVED_STATUSES = ('completed', 'dropped')
+BATCH_SIZE = 1000
+
+SEMESTER_ENROLLMENT_FIELDS = ('id', 'semester_id', 'student_id', 'batch_id', 'enrollment_date', 'status', 'enrolled_by_id', 'notes')
+SUBJECT_ENROLLMENT_FIELDS = ('id', 'semester_subject_id', 'student_id', 'semester_enrollment_id', 'enrollment_date', 'status', 'enrolled_by_id', 'notes')
+
+
+def archivable_subject_enrollments(semesters=None):
+    """Completed or dropped subject enrollments of closed semesters"""
+    queryset = SubjectEnrollment.objects.filter(
+        status__in=ARCHIVED_STATUSES,
+        semester_subject__semester__status__in=CLOSED_SEMESTER_STATUSES
+    )
+    if semesters is not None:
+        queryset = queryset.filter(semester_subject__semester__in=semesters)
+    return queryset
+
+
+def archivable_semester_enrollments(semesters=None):
+    """
+    Completed or dropped semester enrollments of closed semesters, except
+    those still referenced by a subject enrollment that stays hot (deleting
+    them would cascade to it).
+    """
+    queryset = SemesterEnrollment.objects.filter(
+        status__in=ARCHIVED_STATUSES,
+        semester__status__in=CLOSED_SEMESTER_STATUSES
+    ).exclude(Exists(
+        SubjectEnrollment.objects.filter(semester_enrollment=OuterRef('pk')).exclude(status__in=ARCHIVED_STATUSES)
+    ))
+    if semesters is not None:
+        queryset = queryset.filter(semester__in=semesters)
+    return queryset
+
+
+def _move(queryset, archive_model, fields, semester_field, batch_size):
+    """Copy ``queryset`` into ``archive_model`` chunk by chunk, deleting each copied chunk"""
+    moved = 0
+    semester_ids = set()
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.order_by('id').values(*fields, closed_semester_id=F(semester_field))[:batch_size])
+            if not rows:
+                break
+
+            archived_at = timezone.now()
+            archive_model.objects.bulk_create([
+                archive_model(archived_at=archived_at, **{field: row[field] for field in fields})
+                for row in rows
+            ], ignore_conflicts=True)
+            # Archived rows are never active, so the counters have nothing to settle
+            with bulk_write():
+                queryset.model.objects.filter(id__in=[row['id'] for row in rows]).delete()
+
+        moved += len(rows)
+        semester_ids.update(row['closed_semester_id'] for row in rows)
+    return moved, semester_ids
+
+
+def archive_enrollments(semesters=None, batch_size=BATCH_SIZE):
+    """
+    Move archivable enrollments (optionally of the given semesters only) out
+    of the hot tables. Returns the number of (semester, subject) enrollments
+    archived.
+    """
+    subject_count, subject_semesters = _move(
+        archivable_subject_enrollments(semesters), ArchivedSubjectEnrollment,
+        SUBJECT_ENROLLMENT_FIELDS, 'semester_subject__semester_id', batch_size
+    )
+    semester_count, semester_semesters = _move(
+        archivable_semester_enrollments(semesters), ArchivedSemesterEnrollment,
+        SEMESTER_ENROLLMENT_FIELDS, 'semester_id', batch_size
+    )
+
+    # Daily enrollment buckets count every row of the hot table
+    SemesterAnalyticsSnapshot.objects.filter(
+        semester_id__in=subject_semesters | semester_semesters
+    ).update(is_stale=True)
+
+    logger.info("Archived %d semester and %d subject enrollment(s)", semester_count, subject_count)
+    return semester_count, subject_count
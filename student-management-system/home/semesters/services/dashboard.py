@@ -0,0 +1,90 @@
+# semesters/services/dashboard.py
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from ..models import Semester, SemesterSubject, SemesterEnrollment
+from student.models import Student
+from teachers.models import Teacher
+import logging
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'dashboard_stats:version'
+# Backstop for writes that do not invalidate the cache (raw SQL, other processes' caches)
+STATS_TTL = 60
+RECENT_DAYS = 7
+
+
+def _cache_key():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(VERSION_KEY, version, None)
+    return f'dashboard_stats:{version}'
+
+
+def compute_stats():
+    """Gather the dashboard counts with one conditional aggregate per table"""
+    since = timezone.now() - timedelta(days=RECENT_DAYS)
+
+    semester_counts = Semester.objects.aggregate(
+        total_semesters=Count('id', filter=Q(is_active=True)),
+        active_semesters=Count('id', filter=Q(status__in=['upcoming', 'running'])),
+        **{status: Count('id', filter=Q(status=status)) for status, _ in Semester.STATUS_CHOICES}
+    )
+    enrollment_counts = SemesterEnrollment.objects.filter(status='active').aggregate(
+        total_students=Count('student', distinct=True),
+        recent_enrollments=Count('id', filter=Q(enrollment_date__gte=since)),
+    )
+    subject_counts = SemesterSubject.objects.filter(is_active=True).aggregate(
+        total_teachers=Count('teacher', distinct=True),
+        recent_subjects=Count('id', filter=Q(created_at__gte=since)),
+    )
+
+    return {
+        'overview': {
+            'total_semesters': semester_counts['total_semesters'],
+            'active_semesters': semester_counts['active_semesters'],
+            'total_students': enrollment_counts['total_students'],
+            'total_teachers': subject_counts['total_teachers'],
+        },
+        'recent_activity': {
+            'new_enrollments_7_days': enrollment_counts['recent_enrollments'],
+            'new_subjects_7_days': subject_counts['recent_subjects'],
+        },
+        'semester_status_distribution': [
+            {'status': status, 'count': semester_counts[status]}
+            for status in sorted(status for status, _ in Semester.STATUS_CHOICES)
+            if semester_counts[status]
+        ],
+        'school': {
+            'total_students': Student.objects.count(),
+            'total_teachers': Teacher.objects.count(),
+        },
+        'last_updated': timezone.now().isoformat(),
+    }
+
+
+def get_stats():
+    """Return the dashboard stats, computing them only on a cache miss"""
+    key = _cache_key()
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_stats()
+        cache.set(key, stats, STATS_TTL)
+    return stats
+
+
+def _bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Version key evicted; any new value orphans the old entries
+        cache.set(VERSION_KEY, int(timezone.now().timestamp()), None)
+
+
+def invalidate_stats(**kwargs):
+    """Signal receiver: drop the cached stats once the write is committed"""
+    transaction.on_commit(_bump_version)
@@ -0,0 +1,77 @@
+# semesters/services/detail.py
+from django.db.models import Count, Prefetch, Q
+from django.shortcuts import get_object_or_404
+from ..models import Semester, Batch, SemesterSubject, SemesterEnrollment
+
+
+class SemesterDetailLoader:
+    """
+    Load a semester with its subjects, batches and headline counts in a fixed
+    number of queries, whatever the number of subjects or batches.
+
+    The student count is annotated on the semester row, subjects and batches
+    come from one prefetch query each, and per-row enrolled counts and
+    available spots are computed in Python from the persisted
+    active_enrollment_count columns instead of a COUNT per row.
+    """
+
+    def __init__(self, slug):
+        self.semester = get_object_or_404(
+            Semester.objects.select_related('department', 'created_by')
+            .annotate(student_count=Count(
+                'semester_enrollments',
+                filter=Q(semester_enrollments__status='active')
+            ))
+            .prefetch_related(
+                Prefetch(
+                    'semester_subjects',
+                    queryset=SemesterSubject.objects.select_related('subject', 'teacher'),
+                    to_attr='loaded_subjects'
+                ),
+                Prefetch('batches', queryset=Batch.objects.all(), to_attr='loaded_batches'),
+            ),
+            slug=slug
+        )
+
+    @property
+    def subjects(self):
+        return self.semester.loaded_subjects
+
+    @property
+    def batches(self):
+        return self.semester.loaded_batches
+
+    def subjects_data(self):
+        return [{
+            'semester_subject': subject,
+            'enrolled_count': subject.active_enrollment_count,
+            'available_spots': subject.get_available_spots(),
+        } for subject in self.subjects]
+
+    def batches_data(self):
+        return [{
+            'batch': batch,
+            'enrolled_count': batch.active_enrollment_count,
+            'available_spots': batch.get_available_spots(),
+        } for batch in self.batches]
+
+    def teacher_count(self):
+        return len({subject.teacher_id for subject in self.subjects if subject.teacher_id})
+
+    def active_enrollments(self):
+        """Lazy queryset of the semester's active enrollments, only hit if iterated"""
+        return SemesterEnrollment.objects.filter(
+            semester=self.semester, status='active'
+        ).select_related('student__user', 'batch')
+
+    def context(self):
+        return {
+            'semester': self.semester,
+            'active_enrollments': self.active_enrollments(),
+            'subjects_data': self.subjects_data(),
+            'batches_data': self.batches_data(),
+            'student_count': self.semester.student_count,
+            'subject_count': len(self.subjects),
+            'teacher_count': self.teacher_count(),
+            'batch_count': len(self.batches),
+        }
@@ -0,0 +1,517 @@
+# semesters/services/enrollment.py
+from django.db.models import Count, OuterRef, Subquery
+from django.utils import timezone
+from ..models import Batch, SemesterEnrollment, SemesterSubject, SubjectEnrollment, adjust_enrollment_count
+from ..signals import enrollments_changed
+from school.transactions import write_atomic
+from student.models import Student
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _unique(identifiers):
+    """Strip identifiers and drop blanks and duplicates, keeping submission order"""
+    cleaned = (str(identifier).strip() for identifier in identifiers)
+    return list(dict.fromkeys(identifier for identifier in cleaned if identifier))
+
+
+def resolve_students(identifiers, lookup='id'):
+    """
+    Map student primary keys (lookup='id') or user emails (lookup='email')
+    to active students with a single query.
+    """
+    students = Student.objects.filter(user__is_active=True).select_related('user')
+
+    if lookup == 'email':
+        students = students.filter(user__email__in=identifiers)
+        return {student.user.email: student for student in students}
+
+    ids = [identifier for identifier in identifiers if identifier.isdigit()]
+    return {str(student.id): student for student in students.filter(id__in=ids)}
+
+
+def bulk_enroll_students(semester, batch, identifiers, enrolled_by=None, lookup='id'):
+    """
+    Enroll students in a semester through a batch using set-based queries.
+
+    Students are resolved in one query, existing enrollments are found in one
+    query, seats are reserved once on the batch counter and new rows are
+    written with bulk_create, so the cost does not grow with the number of
+    students submitted.
+
+    Returns a dict with:
+        enrolled         -> students enrolled by this call
+        already_enrolled -> identifiers of students already active in the semester
+        not_found        -> identifiers that did not match an active student
+        over_capacity    -> identifiers left out because the batch is full
+        batch_full       -> True when at least one student was left out
+    """
+    identifiers = _unique(identifiers)
+    result = {
+        'enrolled': [],
+        'already_enrolled': [],
+        'not_found': [],
+        'over_capacity': [],
+        'batch_full': False,
+    }
+
+    with write_atomic():
+        students = resolve_students(identifiers, lookup)
+
+        # unique_together (semester, student) means any existing row, whatever
+        # its status, has to be reused instead of inserted again
+        existing = {
+            enrollment.student_id: enrollment
+            for enrollment in SemesterEnrollment.objects.filter(
+                semester=semester,
+                student_id__in=[student.id for student in students.values()]
+            )
+        }
+
+        candidates = []
+        for identifier in identifiers:
+            student = students.get(identifier)
+            if not student:
+                result['not_found'].append(identifier)
+                continue
+
+            enrollment = existing.get(student.id)
+            if enrollment and enrollment.status == 'active':
+                result['already_enrolled'].append(student.user.email or identifier)
+                continue
+
+            candidates.append((identifier, student))
+
+        # Claiming the seats also bumps the batch counter for the rows written below
+        granted = batch.reserve_seats(len(candidates))
+        if len(candidates) > granted:
+            result['batch_full'] = True
+            result['over_capacity'] = [identifier for identifier, _ in candidates[granted:]]
+            candidates = candidates[:granted]
+
+        new_enrollments = []
+        reactivated_ids = []
+        for identifier, student in candidates:
+            enrollment = existing.get(student.id)
+            if enrollment:
+                reactivated_ids.append(enrollment.id)
+            else:
+                new_enrollments.append(SemesterEnrollment(
+                    semester=semester,
+                    student=student,
+                    batch=batch,
+                    enrolled_by=enrolled_by,
+                    status='active'
+                ))
+            result['enrolled'].append(student)
+
+        if new_enrollments:
+            SemesterEnrollment.objects.bulk_create(new_enrollments)
+
+        if reactivated_ids:
+            SemesterEnrollment.objects.filter(id__in=reactivated_ids).update(
+                batch=batch,
+                enrolled_by=enrolled_by,
+                status='active'
+            )
+
+        # bulk_create and update() skip the model signals
+        if candidates:
+            enrollments_changed.send(
+                sender=SemesterEnrollment,
+                semester_id=semester.id,
+                students=len(candidates),
+                batches={batch.id: len(candidates)},
+                enrolled={timezone.localdate(): len(new_enrollments)}
+            )
+
+    logger.info("Bulk enrolled %d student(s) in %s (batch %s): already_enrolled=%d, not_found=%d, over_capacity=%d",
+                len(result['enrolled']), semester.semester_name, batch.batch_name,
+                len(result['already_enrolled']), len(result['not_found']), len(result['over_capacity']))
+    return result
+
+
+def bulk_enroll_in_subject(semester_subject, identifiers, enrolled_by=None):
+    """
+    Enroll students in a semester subject, reserving subject seats in one step.
+
+    Students without a semester enrollment get one (without a batch), as the
+    subject enrollment has to hang off it.
+
+    Returns a dict with:
+        enrolled         -> students enrolled by this call
+        already_enrolled -> students already active in the subject
+        not_found        -> identifiers that did not match an active student
+        semester_closed  -> students whose semester enrollment is completed or
+                            inactive; their history is left untouched
+        over_capacity    -> students left out because the subject is full
+        subject_full     -> True when at least one student was left out
+    """
+    identifiers = _unique(identifiers)
+    semester = semester_subject.semester
+    result = {
+        'enrolled': [],
+        'already_enrolled': [],
+        'not_found': [],
+        'semester_closed': [],
+        'over_capacity': [],
+        'subject_full': False,
+    }
+
+    with write_atomic():
+        students = resolve_students(identifiers)
+        student_ids = [student.id for student in students.values()]
+
+        existing = {
+            enrollment.student_id: enrollment
+            for enrollment in SubjectEnrollment.objects.filter(
+                semester_subject=semester_subject,
+                student_id__in=student_ids
+            )
+        }
+
+        candidates = []
+        for identifier in identifiers:
+            student = students.get(identifier)
+            if not student:
+                result['not_found'].append(identifier)
+                continue
+
+            enrollment = existing.get(student.id)
+            if enrollment and enrollment.status == 'active':
+                result['already_enrolled'].append(student)
+                continue
+
+            candidates.append(student)
+
+        semester_enrollments = {
+            enrollment.student_id: enrollment
+            for enrollment in SemesterEnrollment.objects.filter(
+                semester=semester,
+                student_id__in=[student.id for student in candidates]
+            )
+        }
+        # Completed or inactive semester history is not reopened by a subject enrollment
+        open_candidates = []
+        for student in candidates:
+            enrollment = semester_enrollments.get(student.id)
+            if enrollment and enrollment.status in ('completed', 'inactive'):
+                result['semester_closed'].append(student)
+            else:
+                open_candidates.append(student)
+        candidates = open_candidates
+
+        # Claiming the seats also bumps the subject counter for the rows written below
+        granted = semester_subject.reserve_seats(len(candidates))
+        if len(candidates) > granted:
+            result['subject_full'] = True
+            result['over_capacity'] = candidates[granted:]
+            candidates = candidates[:granted]
+
+        if not candidates:
+            return result
+
+        missing = [
+            SemesterEnrollment(semester=semester, student=student, enrolled_by=enrolled_by, status='active')
+            for student in candidates if student.id not in semester_enrollments
+        ]
+        for enrollment in SemesterEnrollment.objects.bulk_create(missing):
+            semester_enrollments[enrollment.student_id] = enrollment
+
+        # Dropped semester enrollments come back like new ones, outside any batch
+        rejoined = SemesterEnrollment.objects.filter(
+            id__in=[enrollment.id for enrollment in semester_enrollments.values() if enrollment.status == 'dropped'],
+            status='dropped'
+        ).update(status='active', batch=None, enrolled_by=enrolled_by)
+
+        new_enrollments = []
+        reactivated_ids = []
+        for student in candidates:
+            enrollment = existing.get(student.id)
+            if enrollment:
+                reactivated_ids.append(enrollment.id)
+            else:
+                new_enrollments.append(SubjectEnrollment(
+                    semester_subject=semester_subject,
+                    student=student,
+                    semester_enrollment=semester_enrollments[student.id],
+                    enrolled_by=enrolled_by,
+                    status='active'
+                ))
+            result['enrolled'].append(student)
+
+        if new_enrollments:
+            SubjectEnrollment.objects.bulk_create(new_enrollments)
+
+        if reactivated_ids:
+            SubjectEnrollment.objects.filter(id__in=reactivated_ids).update(
+                enrolled_by=enrolled_by,
+                status='active',
+                updated_at=timezone.now()
+            )
+
+        # bulk_create and update() skip the model signals
+        enrollments_changed.send(
+            sender=SubjectEnrollment,
+            semester_id=semester.id,
+            students=len(missing) + rejoined,
+            subjects={semester_subject.id: len(candidates)},
+            enrolled={timezone.localdate(): len(missing)}
+        )
+
+    logger.info("Enrolled %d student(s) in %s: already_enrolled=%d, not_found=%d, over_capacity=%d",
+                len(result['enrolled']), semester_subject.subject.subject_name,
+                len(result['already_enrolled']), len(result['not_found']), len(result['over_capacity']))
+    return result
+
+
+def move_students(from_batch, to_batch, identifiers):
+    """
+    Move students' active enrollments from one batch of a semester to another
+    in a constant number of queries.
+
+    The submitted IDs and their enrollments in ``from_batch`` are looked up
+    with one query, the destination's free seats are reserved once and the
+    allowed prefix is moved with a single UPDATE. Callable from rebalancing
+    scripts as well as the move view.
+
+    Returns a dict with:
+        moved         -> students moved by this call
+        not_found     -> identifiers that did not match an active student
+        not_in_batch  -> identifiers of students not active in ``from_batch``
+        over_capacity -> identifiers left behind because ``to_batch`` is full
+        batch_full    -> True when at least one student was left behind
+    """
+    if from_batch.semester_id != to_batch.semester_id:
+        raise ValueError("Students can only be moved between batches of the same semester")
+    if from_batch.pk == to_batch.pk:
+        raise ValueError("Source and destination batches cannot be the same")
+
+    identifiers = _unique(identifiers)
+    result = {
+        'moved': [],
+        'not_found': [],
+        'not_in_batch': [],
+        'over_capacity': [],
+        'batch_full': False,
+    }
+
+    with write_atomic():
+        source_enrollment = SemesterEnrollment.objects.filter(
+            student=OuterRef('pk'), batch=from_batch, status='active'
+        ).order_by().values('id')[:1]
+        students = {
+            str(student.id): student
+            for student in Student.objects.filter(
+                user__is_active=True,
+                id__in=[identifier for identifier in identifiers if identifier.isdigit()]
+            ).select_related('user').annotate(source_enrollment_id=Subquery(source_enrollment))
+        }
+
+        candidates = []
+        for identifier in identifiers:
+            student = students.get(identifier)
+            if not student:
+                result['not_found'].append(identifier)
+            elif not student.source_enrollment_id:
+                result['not_in_batch'].append(identifier)
+            else:
+                candidates.append((identifier, student))
+
+        # Claiming the seats also bumps the destination counter for the rows moved below
+        granted = to_batch.reserve_seats(len(candidates))
+        if len(candidates) > granted:
+            result['batch_full'] = True
+            result['over_capacity'] = [identifier for identifier, _ in candidates[granted:]]
+            candidates = candidates[:granted]
+
+        if not candidates:
+            return result
+
+        moved = SemesterEnrollment.objects.filter(
+            id__in=[student.source_enrollment_id for _, student in candidates],
+            batch=from_batch,
+            status='active'
+        ).update(batch=to_batch)
+        # Rows changed since the lookup above were not moved; hand their seats back
+        to_batch.release_seats(granted - moved)
+        from_batch.release_seats(moved)
+        result['moved'] = [student for _, student in candidates]
+        if moved != len(candidates):
+            moved_ids = set(SemesterEnrollment.objects.filter(
+                id__in=[student.source_enrollment_id for _, student in candidates], batch=to_batch
+            ).values_list('student_id', flat=True))
+            result['moved'] = [student for student in result['moved'] if student.id in moved_ids]
+
+        # update() skips the model signals
+        if moved:
+            enrollments_changed.send(
+                sender=SemesterEnrollment,
+                semester_id=from_batch.semester_id,
+                batches={from_batch.id: -moved, to_batch.id: moved}
+            )
+
+    logger.info("Moved %d student(s) from batch %s to %s: not_found=%d, not_in_batch=%d, over_capacity=%d",
+                moved, from_batch.batch_name, to_batch.batch_name,
+                len(result['not_found']), len(result['not_in_batch']), len(result['over_capacity']))
+    return result
+
+
+def drop_semester_enrollments(semester_id, enrollment_ids):
+    """
+    Mark active semester enrollments, and their active subject enrollments,
+    as dropped, settling the counters and enrollments_changed once for the
+    whole set.
+
+    The rows are summarised with two grouped queries and updated in bulk, so
+    the cost does not grow with the number of rows. They stay in the hot
+    tables until archive_enrollments moves them out. Returns the number of
+    semester enrollments dropped.
+    """
+    enrollment_ids = list(enrollment_ids)
+    if not enrollment_ids:
+        return 0
+
+    with write_atomic():
+        enrollments = SemesterEnrollment.objects.filter(id__in=enrollment_ids, status='active')
+        batches = {
+            row['batch_id']: -row['count']
+            for row in enrollments.order_by().values('batch_id').annotate(count=Count('id'))
+        }
+        subject_enrollments = SubjectEnrollment.objects.filter(semester_enrollment__in=enrollments, status='active')
+        subjects = {
+            row['semester_subject_id']: -row['count']
+            for row in subject_enrollments.order_by().values('semester_subject_id').annotate(count=Count('id'))
+        }
+
+        # update() skips the model signals
+        subject_enrollments.update(status='dropped', updated_at=timezone.now())
+        dropped = enrollments.update(status='dropped')
+
+        batches.pop(None, None)
+        for batch_id, delta in batches.items():
+            adjust_enrollment_count(Batch, batch_id, delta)
+        for semester_subject_id, delta in subjects.items():
+            adjust_enrollment_count(SemesterSubject, semester_subject_id, delta)
+
+        if dropped:
+            enrollments_changed.send(
+                sender=SemesterEnrollment,
+                semester_id=semester_id,
+                students=-dropped,
+                batches=batches,
+                subjects=subjects
+            )
+    return dropped
+
+
+def remove_from_batch(batch, identifiers):
+    """
+    Unenroll students from a semester through their batch, dropping their
+    subject enrollments with them, in a constant number of queries.
+
+    Returns a dict with:
+        removed      -> students removed by this call
+        not_found    -> identifiers that did not match an active student
+        not_enrolled -> emails (or identifiers) of students not active in ``batch``
+    """
+    identifiers = _unique(identifiers)
+    result = {
+        'removed': [],
+        'not_found': [],
+        'not_enrolled': [],
+    }
+
+    with write_atomic():
+        batch_enrollment = SemesterEnrollment.objects.filter(
+            student=OuterRef('pk'), batch=batch, status='active'
+        ).order_by().values('id')[:1]
+        students = {
+            str(student.id): student
+            for student in Student.objects.filter(
+                user__is_active=True,
+                id__in=[identifier for identifier in identifiers if identifier.isdigit()]
+            ).select_related('user').annotate(batch_enrollment_id=Subquery(batch_enrollment))
+        }
+
+        for identifier in identifiers:
+            student = students.get(identifier)
+            if not student:
+                result['not_found'].append(identifier)
+            elif not student.batch_enrollment_id:
+                result['not_enrolled'].append(student.user.email or identifier)
+            else:
+                result['removed'].append(student)
+
+        drop_semester_enrollments(batch.semester_id, [student.batch_enrollment_id for student in result['removed']])
+
+    logger.info("Removed %d student(s) from batch %s: not_found=%d, not_enrolled=%d",
+                len(result['removed']), batch.batch_name, len(result['not_found']), len(result['not_enrolled']))
+    return result
+
+
+def drop_subject_enrollments(semester_subject, identifiers=None):
+    """
+    Mark the active enrollments of a semester subject as dropped, along with
+    the semester enrollments of students left without any active subject.
+    Pass student ``identifiers`` to drop only those students, otherwise the
+    whole subject is emptied.
+
+    The enrollments are read in one pass and the students with remaining
+    subjects are found with one grouped query; the updates run in bulk.
+
+    Returns a dict with:
+        removed       -> students removed from the subject
+        left_semester -> those of them also removed from the semester
+        not_found     -> identifiers not matching an active student in the subject
+    """
+    semester_id = semester_subject.semester_id
+    enrollments = SubjectEnrollment.objects.filter(
+        semester_subject=semester_subject, status='active'
+    ).select_related('student__user')
+    not_found = []
+    if identifiers is not None:
+        identifiers = _unique(identifiers)
+        enrollments = enrollments.filter(
+            student__user__is_active=True,
+            student_id__in=[identifier for identifier in identifiers if identifier.isdigit()]
+        )
+
+    with write_atomic():
+        enrollments = list(enrollments)
+        if identifiers is not None:
+            found = {str(enrollment.student_id) for enrollment in enrollments}
+            not_found = [identifier for identifier in identifiers if identifier not in found]
+        semester_enrollment_ids = {enrollment.semester_enrollment_id for enrollment in enrollments}
+
+        remaining = set(SubjectEnrollment.objects.filter(
+            semester_enrollment_id__in=semester_enrollment_ids, status='active'
+        ).exclude(semester_subject=semester_subject).order_by().values('semester_enrollment_id').annotate(
+            count=Count('id')
+        ).values_list('semester_enrollment_id', flat=True))
+        orphaned = [enrollment for enrollment in enrollments if enrollment.semester_enrollment_id not in remaining]
+
+        if enrollments:
+            # update() skips the model signals
+            dropped = SubjectEnrollment.objects.filter(
+                id__in=[enrollment.id for enrollment in enrollments], status='active'
+            ).update(status='dropped', updated_at=timezone.now())
+            semester_subject.release_seats(dropped)
+            enrollments_changed.send(
+                sender=SubjectEnrollment,
+                semester_id=semester_id,
+                subjects={semester_subject.id: -dropped}
+            )
+
+        drop_semester_enrollments(semester_id, [
+            enrollment.semester_enrollment_id for enrollment in orphaned if enrollment.semester_enrollment_id
+        ])
+
+    logger.info("Dropped %d enrollment(s) of semester subject %s, %d student(s) left the semester",
+                len(enrollments), semester_subject.pk, len(orphaned))
+    return {
+        'removed': [enrollment.student for enrollment in enrollments],
+        'left_semester': [enrollment.student for enrollment in orphaned],
+        'not_found': not_found,
+    }
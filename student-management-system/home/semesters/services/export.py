@@ -0,0 +1,114 @@
+# semesters/services/export.py
+from django.db.models import FilteredRelation, Q
+import csv
+import io
+import zlib
+
+EXPORT_HEADER = [
+    'Subject Name', 'Subject Code', 'Credits', 'Hours/Week', 'Max Students',
+    'Teacher Name', 'Teacher Email', 'Teacher Qualification',
+    'Student Name', 'Student ID', 'Student Email', 'Student Class',
+    'Batch Name', 'Enrollment Date', 'Status'
+]
+
+# Column order of the values_list() rows unpacked in semester_export_rows
+EXPORT_FIELDS = (
+    'subject__subject_name',
+    'credits',
+    'hours_per_week',
+    'max_students',
+    'teacher_id',
+    'teacher__first_name',
+    'teacher__last_name',
+    'teacher__email',
+    'teacher__qualification',
+    'active_enrollment__id',
+    'active_enrollment__student__first_name',
+    'active_enrollment__student__last_name',
+    'active_enrollment__student__student_id',
+    'active_enrollment__student__user__email',
+    'active_enrollment__student__student_class',
+    'active_enrollment__semester_enrollment__batch__batch_name',
+    'active_enrollment__enrollment_date',
+    'active_enrollment__status',
+)
+
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+
+def semester_export_rows(semester, chunk_size=CHUNK_SIZE):
+    """
+    Yield one CSV row per active subject enrollment of the semester, plus one
+    row with empty student columns for each subject without enrollments.
+
+    Everything comes from a single ordered query: the active enrollments are
+    LEFT JOINed through a FilteredRelation, so subjects with no enrollments
+    still produce a row, and the rows are read with iterator() so memory stays
+    flat regardless of the semester size.
+    """
+    rows = semester.semester_subjects.annotate(
+        active_enrollment=FilteredRelation(
+            'subject_enrollments',
+            condition=Q(subject_enrollments__status='active')
+        )
+    ).order_by(
+        'subject__subject_name', 'id', '-active_enrollment__enrollment_date', '-active_enrollment__id'
+    ).values_list(*EXPORT_FIELDS)
+
+    for (subject_name, credits, hours_per_week, max_students,
+         teacher_id, teacher_first_name, teacher_last_name, teacher_email, teacher_qualification,
+         enrollment_id, first_name, last_name, student_id, student_email, student_class,
+         batch_name, enrollment_date, status) in rows.iterator(chunk_size=chunk_size):
+        subject_columns = [
+            subject_name,
+            '',
+            credits,
+            hours_per_week,
+            max_students if max_students > 0 else 'Unlimited',
+            f"{teacher_first_name} {teacher_last_name}" if teacher_id else '',
+            teacher_email or '',
+            teacher_qualification or '',
+        ]
+
+        if enrollment_id is None:
+            # Subject with no enrollments
+            yield subject_columns + ['', '', '', '', '', '', '']
+            continue
+
+        yield subject_columns + [
+            f"{first_name} {last_name}",
+            student_id,
+            student_email or '',
+            student_class or '',
+            batch_name or '',
+            enrollment_date.strftime('%Y-%m-%d %H:%M:%S'),
+            status,
+        ]
+
+
+def csv_chunks(rows, header=EXPORT_HEADER, buffer_size=BUFFER_SIZE):
+    """Encode rows as CSV and yield them in chunks of roughly buffer_size bytes"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= buffer_size:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of byte chunks without holding the whole payload"""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,127 @@
+# semesters/services/roster.py
+"""
+Bounded pages of the students enrolled in, and available for, a semester
+subject.
+
+Enrollment is excluded in SQL through a subquery on the subject's active
+enrollments, each list is keyset paginated and only the requested fields
+are selected, so a page costs the same however many students the school has.
+"""
+from django.db.models import Exists, OuterRef, Q
+from school.pagination import KeysetPaginator
+from student.models import Student
+from student import search as student_search
+from ..models import SubjectEnrollment
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# Response key -> Student lookup; 'name' is built from first_name and last_name
+FIELDS = {
+    'id': 'id',
+    'student_id': 'student_id',
+    'email': 'user__email',
+    'name': None,
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'class': 'student_class',
+}
+DEFAULT_FIELDS = ('id', 'email', 'name', 'student_id', 'class')
+
+
+def parse_limit(value):
+    """Page size from a request parameter, capped at MAX_LIMIT"""
+    if not value:
+        return DEFAULT_LIMIT
+    limit = int(value)
+    if limit < 1:
+        raise ValueError(f"limit must be positive, got {limit}")
+    return min(limit, MAX_LIMIT)
+
+
+def parse_fields(value):
+    """Requested response keys from a comma separated ``fields`` parameter"""
+    if not value:
+        return DEFAULT_FIELDS
+    fields = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown) or value!r}")
+    return fields
+
+
+def active_enrollments(semester_subject):
+    return SubjectEnrollment.objects.filter(semester_subject=semester_subject, status='active')
+
+
+def enrolled_students(semester_subject, since=None):
+    """Students actively enrolled in the subject; with ``since``, only those (re)enrolled or changed since"""
+    enrollments = active_enrollments(semester_subject)
+    queryset = Student.objects.filter(Exists(enrollments.filter(student=OuterRef('pk'))))
+    if since:
+        queryset = queryset.filter(
+            Q(updated_at__gte=since)
+            | Exists(enrollments.filter(student=OuterRef('pk'), updated_at__gte=since))
+        )
+    return queryset
+
+
+def available_students(semester_subject, since=None):
+    """Active students not enrolled in the subject; with ``since``, only those changed or dropped since"""
+    queryset = Student.objects.filter(user__is_active=True).exclude(
+        id__in=active_enrollments(semester_subject).values('student_id')
+    )
+    if since:
+        left = SubjectEnrollment.objects.filter(
+            semester_subject=semester_subject, student=OuterRef('pk'), updated_at__gte=since
+        ).exclude(status='active')
+        queryset = queryset.filter(Q(updated_at__gte=since) | Exists(left))
+    return queryset
+
+
+def removed_students(semester_subject, since):
+    """Ids of the students whose enrollment in the subject stopped being active since ``since``"""
+    return list(
+        SubjectEnrollment.objects.filter(semester_subject=semester_subject, updated_at__gte=since)
+        .exclude(status='active').order_by('student_id').values_list('student_id', flat=True)
+    )
+
+
+def _lookups(fields):
+    lookups = {'id'}
+    for name in fields:
+        if name == 'name':
+            lookups.update(('first_name', 'last_name'))
+        else:
+            lookups.add(FIELDS[name])
+    return lookups
+
+
+def _serialize(row, fields):
+    data = {}
+    for name in fields:
+        if name == 'name':
+            data[name] = f"{row['first_name']} {row['last_name']}"
+        elif name == 'email':
+            data[name] = row['user__email'] or ''
+        elif name == 'class':
+            data[name] = row['student_class'] or 'N/A'
+        else:
+            data[name] = row[FIELDS[name]]
+    return data
+
+
+def student_page(queryset, fields=DEFAULT_FIELDS, limit=DEFAULT_LIMIT, after=None, query=''):
+    """
+    One page of ``queryset`` as a list of dicts with the requested ``fields``,
+    plus the cursor of the next page (None on the last one). With ``query``
+    the students are searched and paged in relevance order.
+    """
+    if query:
+        queryset = student_search.search_students(query, queryset)
+    # search() orders by (rank, pk) where it can rank; pk breaks ties
+    ordering = tuple('id' if name == 'pk' else name for name in queryset.query.order_by) or ('id',)
+
+    lookups = _lookups(fields) | {name.lstrip('-') for name in ordering}
+    page = KeysetPaginator(queryset.values(*sorted(lookups)), limit, ordering).get_page(after=after)
+    return [_serialize(row, fields) for row in page], page.next_cursor
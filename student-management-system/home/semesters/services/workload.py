@@ -0,0 +1,121 @@
+# semesters/services/workload.py
+"""
+Teacher workload: weekly hours, credits, subjects and active students per
+teacher per semester.
+
+A semester's figures come from one grouped query over its active subject
+assignments and are cached under the semester until an assignment or a
+subject enrollment in it changes. Current load sums the upcoming and
+running semesters and is measured against TEACHER_MAX_HOURS_PER_WEEK.
+"""
+from functools import partial
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from ..models import Semester, SemesterSubject
+
+CURRENT_STATUSES = ('upcoming', 'running')
+# Backstop for writes that skip the signals (e.g. SET_NULL when a teacher is deleted)
+# and for processes that do not share the cache, see CACHES in settings
+WORKLOAD_TTL = 300
+
+
+def max_hours_per_week():
+    return getattr(settings, 'TEACHER_MAX_HOURS_PER_WEEK', 20)
+
+
+def _key(semester_id):
+    return f'teacher_workload:semester:{semester_id}'
+
+
+def _assignments():
+    return SemesterSubject.objects.filter(is_active=True, teacher__isnull=False)
+
+
+def compute_workloads(semester_ids):
+    """{semester_id: {teacher_id: totals}} for ``semester_ids``, from one grouped query"""
+    rows = _assignments().filter(semester_id__in=semester_ids).values('semester_id', 'teacher_id').annotate(
+        hours_per_week=Sum('hours_per_week'),
+        credits=Sum('credits'),
+        subjects=Count('id'),
+        students=Sum('active_enrollment_count'),
+    ).order_by()
+    workloads = {semester_id: {} for semester_id in semester_ids}
+    for row in rows:
+        workloads[row.pop('semester_id')][row['teacher_id']] = row
+    return workloads
+
+
+def semester_workloads(semester_ids):
+    """Like compute_workloads(), querying only the semesters missing from the cache"""
+    keys = {semester_id: _key(semester_id) for semester_id in semester_ids}
+    cached = cache.get_many(keys.values())
+    workloads = {semester_id: cached[key] for semester_id, key in keys.items() if key in cached}
+    missing = [semester_id for semester_id in keys if semester_id not in workloads]
+    if missing:
+        computed = compute_workloads(missing)
+        cache.set_many({keys[semester_id]: rows for semester_id, rows in computed.items()}, WORKLOAD_TTL)
+        workloads.update(computed)
+    return workloads
+
+
+def semester_report(semester):
+    """Every teacher's load in ``semester``, heaviest first"""
+    from teachers.directory import LIST_FIELDS, teacher_json
+    from teachers.models import Teacher
+
+    rows = semester_workloads([semester.id])[semester.id]
+    teachers = Teacher.objects.filter(id__in=rows).only(*LIST_FIELDS)
+    report = [{'teacher': teacher_json(teacher), **rows[teacher.id]} for teacher in teachers]
+    report.sort(key=lambda row: (-row['hours_per_week'], row['teacher']['name']))
+    return report
+
+
+def teacher_workload(teacher):
+    """
+    ``teacher``'s load in each semester they teach in, newest first, with the
+    current weekly hours and the spare hours left under the maximum.
+    """
+    semesters = Semester.objects.filter(
+        Exists(_assignments().filter(teacher=teacher, semester=OuterRef('pk')))
+    ).only('id', 'semester_name', 'slug', 'academic_year', 'status', 'is_active').order_by('-start_date', '-id')
+    semesters = list(semesters)
+    workloads = semester_workloads([semester.id for semester in semesters])
+
+    empty = {'hours_per_week': 0, 'credits': 0, 'subjects': 0, 'students': 0}
+    rows = [{'semester': semester, **workloads[semester.id].get(teacher.id, empty)} for semester in semesters]
+    current_hours = sum(
+        row['hours_per_week'] for row in rows
+        if row['semester'].is_active and row['semester'].status in CURRENT_STATUSES
+    )
+    return {
+        'semesters': rows,
+        'current_hours': current_hours,
+        'max_hours_per_week': max_hours_per_week(),
+        'spare_hours': max_hours_per_week() - current_hours,
+    }
+
+
+def with_current_hours(teachers):
+    """Annotate ``teachers`` with current_hours, their weekly hours in upcoming and running semesters"""
+    hours = _assignments().filter(
+        teacher=OuterRef('pk'), semester__status__in=CURRENT_STATUSES, semester__is_active=True
+    ).order_by().values('teacher').annotate(total=Sum('hours_per_week')).values('total')
+    return teachers.annotate(current_hours=Coalesce(Subquery(hours), 0))
+
+
+def forget_semester(semester_id):
+    cache.delete(_key(semester_id))
+
+
+def invalidate_assignment(sender, instance, **kwargs):
+    """SemesterSubject post_save/post_delete receiver"""
+    transaction.on_commit(partial(forget_semester, instance.semester_id))
+
+
+def invalidate_enrollments(sender, semester_id=None, subjects=None, **kwargs):
+    """enrollments_changed receiver: subject enrollments move the student totals"""
+    if semester_id and subjects:
+        transaction.on_commit(partial(forget_semester, semester_id))
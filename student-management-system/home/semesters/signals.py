@@ -0,0 +1,32 @@
+# semesters/signals.py
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.dispatch import Signal
+
+# Sent whenever active enrollments of a semester change, by the model signals
+# for single-row writes and by the bulk enrollment paths that bypass them.
+# Keyword arguments (all deltas, omitted keys mean "no change"):
+#   semester_id -> semester whose enrollments changed
+#   students    -> change in active semester enrollments
+#   batches     -> {batch_id: change in active enrollments}
+#   subjects    -> {semester_subject_id: change in active enrollments}
+#   enrolled    -> {date: change in semester enrollment rows created that day}
+enrollments_changed = Signal()
+
+# Set while a bulk service deletes enrollments through the ORM and settles the
+# counters (and enrollments_changed) itself, once for the whole set of rows
+_bulk_write = ContextVar('semesters_bulk_write', default=False)
+
+
+@contextmanager
+def bulk_write():
+    """Silence the per-row enrollment counter receivers for the enclosed writes"""
+    token = _bulk_write.set(True)
+    try:
+        yield
+    finally:
+        _bulk_write.reset(token)
+
+
+def in_bulk_write():
+    return _bulk_write.get()
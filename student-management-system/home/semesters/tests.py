@@ -1,3 +1,924 @@
-from django.test import TestCase
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from department.models import Department
+from school.models import Notification, NotificationOutbox
+from school.notifications import drain_outbox
+from student.models import Student, Parent
+from subjects.models import Subject
+from semesters.models import (
+    Semester, Batch, SemesterSubject, SemesterEnrollment, SubjectEnrollment, SemesterAnalyticsSnapshot,
+    ArchivedSemesterEnrollment, ArchivedSubjectEnrollment
+)
+from semesters.services.analytics import build_payload, build_daily_enrollments, get_snapshot, rebuild_snapshot
+from semesters.services.dashboard import get_stats
+from semesters.services.detail import SemesterDetailLoader
+from semesters.services.enrollment import (
+    bulk_enroll_students, bulk_enroll_in_subject, move_students, remove_from_batch, drop_subject_enrollments
+)
+from semesters.services.export import semester_export_rows
+from semesters.services import workload
+from teachers.models import Teacher
 
-# Create your tests here.
+
+def create_student(index, is_active=True):
+    """Create a student with its user account and parent record."""
+    user = get_user_model().objects.create_user(
+        username=f'student{index}@example.com',
+        email=f'student{index}@example.com',
+        password='student@1234',
+        is_student=True,
+        is_active=is_active
+    )
+    parent = Parent.objects.create(
+        father_name=f'Father{index}',
+        father_mobile='9876543210',
+        father_email=f'father{index}@example.com',
+        mother_name=f'Mother{index}',
+        mother_mobile='8765432109',
+        mother_email=f'mother{index}@example.com',
+        present_address='123 Street',
+        permanent_address='456 Avenue'
+    )
+    return Student.objects.create(
+        user=user,
+        first_name=f'Student{index}',
+        last_name=f'Last{index}',
+        student_id=f'Student-{index:06d}',
+        gender='Male',
+        date_of_birth='2000-01-01',
+        student_class='10',
+        religion='Unknown',
+        joining_date='2025-08-01',
+        mobile_number='1234567890',
+        admission_number=f'ADM{index:04d}',
+        section='A',
+        email=f'student{index}@example.com',
+        parent=parent
+    )
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class SemesterTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.admin_user = get_user_model().objects.create_user(
+            username='admin@example.com',
+            email='admin@example.com',
+            password='adminpass123',
+            is_admin=True
+        )
+        self.department = Department.objects.create(
+            department_name='Computer Science',
+            department_start_date='2020-01-01'
+        )
+        self.semester = Semester.objects.create(
+            semester_name='Fall',
+            academic_year='2025-2026',
+            department=self.department,
+            start_date='2025-09-01',
+            end_date='2025-12-20',
+            created_by=self.admin_user
+        )
+        self.batch = self.semester.batches.get()
+
+
+class BulkEnrollmentTestCase(SemesterTestCase):
+    def test_enrolls_students_and_reports_skipped_ones(self):
+        students = [create_student(i) for i in range(4)]
+        inactive = create_student(99, is_active=False)
+        SemesterEnrollment.objects.create(semester=self.semester, student=students[0], batch=self.batch)
+        self.batch.max_students = 3
+        self.batch.save()
+
+        identifiers = [str(s.id) for s in students] + [str(inactive.id), 'missing']
+        result = bulk_enroll_students(self.semester, self.batch, identifiers)
+
+        self.assertEqual([s.id for s in result['enrolled']], [students[1].id, students[2].id])
+        self.assertEqual(result['already_enrolled'], ['student0@example.com'])
+        self.assertEqual(result['not_found'], [str(inactive.id), 'missing'])
+        self.assertEqual(result['over_capacity'], [str(students[3].id)])
+        self.assertTrue(result['batch_full'])
+        self.assertEqual(self.batch.enrollments.filter(status='active').count(), 3)
+
+    def test_reactivates_dropped_enrollment(self):
+        student = create_student(1)
+        other_batch = Batch.objects.create(semester=self.semester, batch_name='B', academic_year='2025-2026')
+        SemesterEnrollment.objects.create(semester=self.semester, student=student, batch=other_batch, status='dropped')
+
+        result = bulk_enroll_students(self.semester, self.batch, ['student1@example.com'], lookup='email')
+
+        self.assertEqual(len(result['enrolled']), 1)
+        enrollment = SemesterEnrollment.objects.get(semester=self.semester, student=student)
+        self.assertEqual((enrollment.status, enrollment.batch_id), ('active', self.batch.id))
+
+    def test_query_count_does_not_grow_with_students(self):
+        students = [create_student(i) for i in range(40)]
+
+        with self.assertNumQueries(11):
+            bulk_enroll_students(self.semester, self.batch, [str(s.id) for s in students[:5]])
+        with self.assertNumQueries(11):
+            bulk_enroll_students(self.semester, self.batch, [str(s.id) for s in students[5:]])
+
+        self.assertEqual(self.batch.enrollments.count(), 40)
+
+    def test_add_student_to_batch_view(self):
+        students = [create_student(i) for i in range(3)]
+        SemesterEnrollment.objects.create(semester=self.semester, student=students[0], batch=self.batch)
+        self.client.login(username='admin@example.com', password='adminpass123')
+
+        response = self.client.post(
+            reverse('semesters:add_student_to_batch', args=[self.semester.slug, self.batch.id]),
+            {'students': [s.id for s in students] + [12345]}
+        )
+
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['enrolled_count'], 2)
+        self.assertEqual(data['warnings'], [
+            'Students already enrolled in semester: student0@example.com',
+            'Students not found: 12345',
+        ])
+
+    def test_bulk_enroll_students_view(self):
+        create_student(1)
+        self.client.login(username='admin@example.com', password='adminpass123')
+
+        self.client.post(
+            reverse('semesters:bulk_enroll_students', args=[self.semester.slug]),
+            {'student_emails': 'student1@example.com, nobody@example.com', 'batch_id': self.batch.id}
+        )
+
+        self.assertTrue(SemesterEnrollment.objects.filter(semester=self.semester, student__user__email='student1@example.com').exists())
+
+
+    def test_views_queue_notifications_with_one_insert(self):
+        students = [create_student(i) for i in range(25)]
+        target = Batch.objects.create(semester=self.semester, batch_name='B', academic_year='2025-2026')
+        semester_subject = SemesterSubject.objects.create(
+            semester=self.semester, subject=Subject.objects.create(subject_name='Algebra', class_name='10')
+        )
+        self.client.login(username='admin@example.com', password='adminpass123')
+        ids = [s.id for s in students]
+        requests = [
+            ('add_student_to_batch', [self.semester.slug, self.batch.id], {'students': ids}),
+            ('manage_subject_students', [self.semester.slug, semester_subject.id], {'action': 'add', 'students': ids}),
+            ('move_students_between_batches', [self.semester.slug],
+             {'from_batch_id': self.batch.id, 'to_batch_id': target.id, 'students': ids}),
+        ]
+        for name, args, data in requests:
+            with CaptureQueriesContext(connection) as queries:
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.client.post(reverse(f'semesters:{name}', args=args), data)
+            inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "school_notificationoutbox"')]
+            self.assertEqual(len(inserts), 1, name)
+
+        SemesterEnrollment.objects.all().delete()
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('semesters:bulk_enroll_students', args=[self.semester.slug]), {
+                    'student_emails': ', '.join(f'student{i}@example.com' for i in range(25)), 'batch_id': target.id
+                })
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "school_notificationoutbox"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(NotificationOutbox.objects.count(), 4 * 26 - 1)
+
+    def test_search_students_excludes_enrolled(self):
+        students = [create_student(i) for i in range(3)]
+        SemesterEnrollment.objects.create(semester=self.semester, student=students[0], batch=self.batch)
+        self.client.login(username='admin@example.com', password='adminpass123')
+
+        data = self.client.get(
+            reverse('semesters:search_students'),
+            {'q': 'student', 'semester_id': self.semester.id, 'batch_id': self.batch.id}
+        ).json()
+
+        self.assertEqual(sorted(s['id'] for s in data['students']), [students[1].id, students[2].id])
+
+class MoveStudentsTestCase(SemesterTestCase):
+    def setUp(self):
+        super().setUp()
+        self.target = Batch.objects.create(semester=self.semester, batch_name='B', academic_year='2025-2026', max_students=3)
+
+    def enroll(self, count):
+        students = [create_student(i) for i in range(count)]
+        bulk_enroll_students(self.semester, self.batch, [s.id for s in students])
+        return students
+
+    def test_moves_allowed_prefix_and_reports_leftovers(self):
+        students = self.enroll(5)
+        outsider = create_student(50)
+        identifiers = [s.id for s in students] + [outsider.id, 'missing']
+
+        result = move_students(self.batch, self.target, identifiers)
+
+        self.assertEqual(result['moved'], students[:3])
+        self.assertEqual(result['over_capacity'], [str(s.id) for s in students[3:]])
+        self.assertEqual(result['not_in_batch'], [str(outsider.id)])
+        self.assertEqual(result['not_found'], ['missing'])
+        self.assertTrue(result['batch_full'])
+        self.batch.refresh_from_db()
+        self.target.refresh_from_db()
+        self.assertEqual((self.batch.active_enrollment_count, self.target.active_enrollment_count), (2, 3))
+        self.assertEqual(self.target.enrollments.filter(status='active').count(), 3)
+
+    def test_query_count_does_not_grow_with_students(self):
+        self.target.max_students = 100
+        self.target.save()
+        students = self.enroll(12)
+
+        with self.assertNumQueries(11):
+            move_students(self.batch, self.target, [s.id for s in students[:2]])
+        with self.assertNumQueries(11):
+            move_students(self.batch, self.target, [s.id for s in students[2:]])
+
+    def test_view(self):
+        students = self.enroll(2)
+        self.client.login(username='admin@example.com', password='adminpass123')
+
+        data = self.client.post(reverse('semesters:move_students_between_batches', args=[self.semester.slug]), {
+            'from_batch_id': self.batch.id,
+            'to_batch_id': self.target.id,
+            'students': [s.id for s in students],
+        }).json()
+
+        self.assertTrue(data['success'])
+        self.assertEqual(data['moved_count'], 2)
+
+
+class BulkRemovalTestCase(SemesterTestCase):
+    def setUp(self):
+        super().setUp()
+        self.subjects = [
+            SemesterSubject.objects.create(
+                semester=self.semester,
+                subject=Subject.objects.create(subject_name=f'Subject {i}', class_name='10')
+            ) for i in range(2)
+        ]
+
+    def enroll(self, count, subjects):
+        offset = Student.objects.count()
+        students = [create_student(offset + i) for i in range(count)]
+        bulk_enroll_students(self.semester, self.batch, [s.id for s in students])
+        for semester_subject in subjects:
+            bulk_enroll_in_subject(semester_subject, [s.id for s in students])
+        return students
+
+    def test_drop_subject_removes_students_without_other_subjects(self):
+        only_first = self.enroll(3, self.subjects[:1])
+        both = self.enroll(2, self.subjects)
+        self.semester.refresh_from_db()
+        get_snapshot(self.semester)
+
+        result = drop_subject_enrollments(self.subjects[0])
+
+        self.assertEqual(len(result['removed']), 5)
+        self.assertEqual(set(result['left_semester']), set(only_first))
+        self.assertEqual(
+            set(SemesterEnrollment.objects.filter(status='active').values_list('student_id', flat=True)),
+            {s.id for s in both}
+        )
+        for semester_subject, count in zip(self.subjects, (0, 2)):
+            semester_subject.refresh_from_db()
+            self.assertEqual(semester_subject.active_enrollment_count, count)
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.active_enrollment_count, 2)
+        snapshot = SemesterAnalyticsSnapshot.objects.get(semester=self.semester)
+        self.assertFalse(snapshot.is_stale)
+        self.assertEqual(snapshot.payload, build_payload(self.semester))
+        self.assertEqual(snapshot.daily_enrollments, build_daily_enrollments(self.semester))
+
+    def test_query_count_does_not_grow_with_students(self):
+        self.enroll(2, self.subjects[:1])
+        with self.assertNumQueries(17):
+            drop_subject_enrollments(self.subjects[0])
+        self.enroll(20, self.subjects[1:])
+        with self.assertNumQueries(17):
+            drop_subject_enrollments(self.subjects[1])
+
+    def test_remove_from_batch_view_notifies_in_bulk(self):
+        students = self.enroll(3, self.subjects)
+        self.client.login(username='admin@example.com', password='adminpass123')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            data = self.client.post(reverse('semesters:remove_student_from_batch', args=[self.semester.slug, self.batch.id]), {
+                'students': [students[0].id, students[1].id, 'missing'],
+            }).json()
+
+        self.assertEqual(data['removed_count'], 2)
+        self.assertEqual(data['warnings'], ['Students not found: missing'])
+        self.assertEqual(NotificationOutbox.objects.count(), 3)
+        self.assertEqual(drain_outbox(), (3, 0))
+        self.assertEqual(Notification.objects.count(), 3)
+        self.assertEqual(SubjectEnrollment.objects.filter(student__in=students[:2], status='active').count(), 0)
+        self.assertEqual(SubjectEnrollment.objects.filter(student__in=students[:2], status='dropped').count(), 4)
+        self.subjects[0].refresh_from_db()
+        self.assertEqual(self.subjects[0].active_enrollment_count, 1)
+
+    def test_dropped_student_can_be_enrolled_again(self):
+        students = self.enroll(1, self.subjects[:1])
+        drop_subject_enrollments(self.subjects[0], [students[0].id])
+
+        result = bulk_enroll_in_subject(self.subjects[0], [students[0].id])
+
+        self.assertEqual(result['enrolled'], students)
+        self.assertEqual(SemesterEnrollment.objects.get().status, 'active')
+        self.subjects[0].refresh_from_db()
+        self.assertEqual(self.subjects[0].active_enrollment_count, 1)
+
+    def test_closed_semester_history_is_not_reopened(self):
+        completed, inactive = self.enroll(2, self.subjects[:1])
+        SemesterEnrollment.objects.filter(student=completed).update(status='completed')
+        SemesterEnrollment.objects.filter(student=inactive).update(status='inactive')
+
+        result = bulk_enroll_in_subject(self.subjects[1], [completed.id, inactive.id])
+
+        self.assertEqual(result['enrolled'], [])
+        self.assertEqual(result['semester_closed'], [completed, inactive])
+        self.assertEqual(
+            dict(SemesterEnrollment.objects.values_list('student_id', 'status')),
+            {completed.id: 'completed', inactive.id: 'inactive'}
+        )
+        self.assertEqual(SemesterEnrollment.objects.filter(batch=self.batch).count(), 2)
+
+    def test_archive_moves_history_of_closed_semesters(self):
+        dropped = self.enroll(2, self.subjects)
+        kept = self.enroll(1, self.subjects)
+        remove_from_batch(self.batch, [s.id for s in dropped])
+
+        # Open semesters keep their history hot
+        call_command('archive_enrollments', stdout=StringIO())
+        self.assertEqual(ArchivedSemesterEnrollment.objects.count(), 0)
+
+        Semester.objects.filter(pk=self.semester.pk).update(status='completed')
+        out = StringIO()
+        call_command('archive_enrollments', '--batch-size', '3', stdout=out)
+
+        self.assertIn('Archived 2 semester and 4 subject enrollment(s)', out.getvalue())
+        self.assertEqual(list(SemesterEnrollment.objects.values_list('student_id', flat=True)), [kept[0].id])
+        self.assertEqual(SubjectEnrollment.objects.count(), 2)
+        archived = ArchivedSemesterEnrollment.objects.get(student=dropped[0])
+        self.assertEqual((archived.status, archived.batch_id, archived.semester_id), ('dropped', self.batch.id, self.semester.id))
+        self.assertEqual(ArchivedSubjectEnrollment.objects.filter(semester_enrollment_id=archived.id).count(), 2)
+
+    def test_remove_from_batch_reports_students_not_enrolled(self):
+        outsider = create_student(50)
+        result = remove_from_batch(self.batch, [outsider.id])
+        self.assertEqual(result['not_enrolled'], ['student50@example.com'])
+
+
+class EnrollmentCounterTestCase(SemesterTestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = create_student(1)
+        self.semester_subject = SemesterSubject.objects.create(
+            semester=self.semester,
+            subject=Subject.objects.create(subject_name='Algorithms', class_name='10'),
+            max_students=2
+        )
+
+    def assertCount(self, obj, expected):
+        obj.refresh_from_db()
+        self.assertEqual(obj.active_enrollment_count, expected)
+
+    def test_semester_enrollment_lifecycle(self):
+        other_batch = Batch.objects.create(semester=self.semester, batch_name='B', academic_year='2025-2026')
+        enrollment = SemesterEnrollment.objects.create(semester=self.semester, student=self.student, batch=self.batch)
+        self.assertCount(self.batch, 1)
+
+        enrollment.batch = other_batch
+        enrollment.save()
+        self.assertCount(self.batch, 0)
+        self.assertCount(other_batch, 1)
+
+        enrollment.status = 'dropped'
+        enrollment.save()
+        self.assertCount(other_batch, 0)
+
+        enrollment.status = 'active'
+        enrollment.save()
+        self.assertCount(other_batch, 1)
+
+        SemesterEnrollment.objects.get(pk=enrollment.pk).delete()
+        self.assertCount(other_batch, 0)
+
+    def test_subject_enrollment_lifecycle(self):
+        enrollment = SemesterEnrollment.objects.create(semester=self.semester, student=self.student, batch=self.batch)
+        SubjectEnrollment.objects.create(semester_subject=self.semester_subject, student=self.student)
+        self.assertCount(self.semester_subject, 1)
+
+        # Cascade from the semester enrollment releases the subject seat too
+        enrollment.delete()
+        self.assertCount(self.semester_subject, 0)
+        self.assertCount(self.batch, 0)
+
+    def test_stale_instance_save_keeps_counter(self):
+        stale_batch = Batch.objects.get(pk=self.batch.pk)
+        SemesterEnrollment.objects.create(semester=self.semester, student=self.student, batch=self.batch)
+
+        stale_batch.max_students = 10
+        stale_batch.save()
+        self.assertCount(self.batch, 1)
+
+    def test_reserve_seats_grants_up_to_capacity(self):
+        self.assertEqual(self.semester_subject.reserve_seats(5), 2)
+        self.assertEqual(self.semester_subject.reserve_seats(1), 0)
+        self.assertCount(self.semester_subject, 2)
+
+        self.semester_subject.release_seats(1)
+        self.assertCount(self.semester_subject, 1)
+
+        self.semester_subject.max_students = 0
+        self.semester_subject.save()
+        self.assertEqual(self.semester_subject.reserve_seats(100), 100)
+
+    def test_recount_enrollments_repairs_drift(self):
+        SemesterEnrollment.objects.create(semester=self.semester, student=self.student, batch=self.batch)
+        Batch.objects.filter(pk=self.batch.pk).update(active_enrollment_count=7)
+
+        call_command('recount_enrollments', '--dry-run', stdout=StringIO())
+        self.assertCount(self.batch, 7)
+
+        with CaptureQueriesContext(connection) as ctx:
+            call_command('recount_enrollments', stdout=StringIO())
+        self.assertCount(self.batch, 1)
+        # One correlated UPDATE repairs the batch instead of writing a precomputed count
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "semesters_batch"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('SELECT COUNT(*)', updates[0])
+
+
+class ExportTestCase(SemesterTestCase):
+    def setUp(self):
+        super().setUp()
+        self.students = [create_student(i) for i in range(3)]
+        self.algorithms = SemesterSubject.objects.create(
+            semester=self.semester,
+            subject=Subject.objects.create(subject_name='Algorithms', class_name='10')
+        )
+        SemesterSubject.objects.create(
+            semester=self.semester,
+            subject=Subject.objects.create(subject_name='Databases', class_name='10')
+        )
+        for student in self.students:
+            SemesterEnrollment.objects.create(semester=self.semester, student=student, batch=self.batch)
+            SubjectEnrollment.objects.create(semester_subject=self.algorithms, student=student)
+        SubjectEnrollment.objects.filter(student=self.students[2]).update(status='dropped')
+
+    def test_rows_come_from_one_query(self):
+        with self.assertNumQueries(1):
+            rows = list(semester_export_rows(self.semester))
+
+        self.assertEqual([(row[0], row[9]) for row in rows], [
+            ('Algorithms', self.students[1].student_id),
+            ('Algorithms', self.students[0].student_id),
+            ('Databases', ''),
+        ])
+        self.assertEqual(rows[0][12], self.batch.batch_name)
+        self.assertEqual(rows[2][4], 'Unlimited')
+
+    def test_export_view_streams_csv_and_gzip(self):
+        self.client.login(username='admin@example.com', password='adminpass123')
+        url = reverse('semesters:export_semester_data', args=[self.semester.slug])
+
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertEqual(len(content.splitlines()), 4)
+
+        response = self.client.get(url, {'compress': 'gzip'})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)).decode('utf-8'), content)
+
+
+class AnalyticsSnapshotTestCase(SemesterTestCase):
+    def setUp(self):
+        super().setUp()
+        self.students = [create_student(i) for i in range(3)]
+        self.semester_subject = SemesterSubject.objects.create(
+            semester=self.semester,
+            subject=Subject.objects.create(subject_name='Algorithms', class_name='10'),
+            max_students=10
+        )
+        self.semester.refresh_from_db()
+        self.snapshot = rebuild_snapshot(self.semester)
+
+    def assertSnapshotCurrent(self):
+        """The incrementally maintained payload matches a full recompute"""
+        self.snapshot.refresh_from_db()
+        self.assertFalse(self.snapshot.is_stale)
+        self.assertEqual(self.snapshot.payload, build_payload(self.semester))
+        self.assertEqual(self.snapshot.daily_enrollments, build_daily_enrollments(self.semester))
+
+    def test_single_row_changes_update_snapshot(self):
+        enrollment = SemesterEnrollment.objects.create(semester=self.semester, student=self.students[0], batch=self.batch)
+        SubjectEnrollment.objects.create(semester_subject=self.semester_subject, student=self.students[0])
+        self.assertSnapshotCurrent()
+        self.assertEqual(self.snapshot.payload['summary']['total_students'], 1)
+
+        enrollment.status = 'dropped'
+        enrollment.save()
+        self.assertSnapshotCurrent()
+
+        enrollment.delete()
+        self.assertSnapshotCurrent()
+        self.assertEqual(self.snapshot.payload['subjects'][0]['enrolled_count'], 0)
+
+    def test_bulk_enrollment_updates_snapshot(self):
+        bulk_enroll_students(self.semester, self.batch, [str(self.students[0].id)])
+        bulk_enroll_in_subject(self.semester_subject, [str(s.id) for s in self.students])
+        self.assertSnapshotCurrent()
+        self.assertEqual(self.snapshot.payload['summary']['total_students'], 3)
+
+    def test_structure_change_marks_snapshot_stale(self):
+        Batch.objects.create(semester=self.semester, batch_name='B', academic_year='2025-2026')
+        self.snapshot.refresh_from_db()
+        self.assertTrue(self.snapshot.is_stale)
+
+        semester = Semester.objects.select_related('analytics_snapshot', 'department').get(pk=self.semester.pk)
+        self.assertEqual(get_snapshot(semester).payload['summary']['total_batches'], 2)
+        self.assertSnapshotCurrent()
+
+    def test_analytics_view_serves_snapshot(self):
+        SemesterEnrollment.objects.create(semester=self.semester, student=self.students[0], batch=self.batch)
+        self.client.login(username='admin@example.com', password='adminpass123')
+        url = reverse('semesters:get_semester_analytics', args=[self.semester.slug])
+
+        # Session, user and semester with its snapshot
+        with self.assertNumQueries(3):
+            data = self.client.get(url, {'include_trends': 'true'}).json()
+        self.assertEqual(data['summary']['total_students'], 1)
+        self.assertEqual(data['trends']['daily_enrollments'][0]['count'], 1)
+        self.assertEqual(data['computed_at'], self.snapshot.computed_at.isoformat())
+
+        data = self.client.get(url, {'fresh': '1'}).json()
+        self.assertGreater(data['computed_at'], self.snapshot.computed_at.isoformat())
+
+    def test_rebuild_command(self):
+        SemesterAnalyticsSnapshot.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_analytics_snapshots', stdout=out)
+
+        self.assertIn('Rebuilt 1 analytics snapshot(s)', out.getvalue())
+        self.assertTrue(SemesterAnalyticsSnapshot.objects.filter(semester=self.semester, is_stale=False).exists())
+
+
+class DashboardStatsTestCase(SemesterTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.student = create_student(1)
+
+    def test_stats_are_computed_once_and_cached(self):
+        with self.assertNumQueries(5):
+            stats = get_stats()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_stats(), stats)
+
+        self.assertEqual(stats['overview']['total_semesters'], 1)
+        self.assertEqual(stats['semester_status_distribution'], [{'status': 'upcoming', 'count': 1}])
+        self.assertEqual(stats['school'], {'total_students': 1, 'total_teachers': 0})
+
+    def test_enrollment_write_invalidates_cache(self):
+        self.assertEqual(get_stats()['overview']['total_students'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SemesterEnrollment.objects.create(semester=self.semester, student=self.student, batch=self.batch)
+
+        self.assertEqual(get_stats()['overview']['total_students'], 1)
+
+    def test_dashboard_endpoints_read_cached_stats(self):
+        self.client.login(username='admin@example.com', password='adminpass123')
+        get_stats()
+
+        data = self.client.get(reverse('semesters:get_dashboard_stats')).json()
+        self.assertEqual(data['overview']['active_semesters'], 1)
+
+        response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.context['total_students'], 1)
+
+
+class SemesterDetailTestCase(SemesterTestCase):
+    def add_rows(self, count):
+        for i in range(count):
+            index = SemesterSubject.objects.count()
+            SemesterSubject.objects.create(
+                semester=self.semester,
+                subject=Subject.objects.create(subject_name=f'Subject {index}', class_name='10'),
+                max_students=5
+            )
+            Batch.objects.create(semester=self.semester, batch_name=f'Batch {index}', academic_year='2025-2026')
+
+    def test_query_count_does_not_grow_with_subjects_and_batches(self):
+        self.client.login(username='admin@example.com', password='adminpass123')
+        url = reverse('semesters:semester_detail', args=[self.semester.slug])
+
+        self.add_rows(2)
+        # Session, user, semester, subjects and batches
+        with self.assertNumQueries(5):
+            self.client.get(url)
+
+        self.add_rows(10)
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+
+        self.assertEqual(response.context['subject_count'], 12)
+        self.assertEqual(response.context['batch_count'], 13)
+
+    def test_loader_counts(self):
+        student = create_student(1)
+        self.add_rows(1)
+        semester_subject = SemesterSubject.objects.get()
+        SemesterEnrollment.objects.create(semester=self.semester, student=student, batch=self.batch)
+        SubjectEnrollment.objects.create(semester_subject=semester_subject, student=student)
+
+        context = SemesterDetailLoader(self.semester.slug).context()
+
+        self.assertEqual(context['student_count'], 1)
+        self.assertEqual(context['teacher_count'], 0)
+        self.assertEqual(context['subjects_data'][0]['available_spots'], 4)
+
+
+class SemesterListTestCase(SemesterTestCase):
+    def test_counts_and_keyset_pages(self):
+        student = create_student(1)
+        SemesterEnrollment.objects.create(semester=self.semester, student=student, batch=self.batch)
+        Batch.objects.create(semester=self.semester, batch_name='B', academic_year='2025-2026')
+        for i in range(12):
+            Semester.objects.create(
+                semester_name=f'Extra {i}',
+                academic_year='2025-2026',
+                department=self.department,
+                start_date='2025-09-01',
+                end_date='2025-12-20'
+            )
+        self.client.login(username='admin@example.com', password='adminpass123')
+        url = reverse('semesters:semester_list')
+
+        # Session, user and one query for the page
+        with self.assertNumQueries(3):
+            first = self.client.get(url).context['page_obj']
+        self.assertEqual(len(first), 10)
+
+        last = self.client.get(url, {'after': first.next_cursor}).context['page_obj']
+        self.assertEqual(len(last), 3)
+        self.assertFalse(last.has_next())
+        semester = last.object_list[-1]
+        self.assertEqual((semester.pk, semester.student_count, semester.batch_count, semester.subject_count), (self.semester.pk, 1, 2, 0))
+
+
+class SubjectStudentsTestCase(SemesterTestCase):
+    def setUp(self):
+        super().setUp()
+        self.semester_subject = SemesterSubject.objects.create(
+            semester=self.semester,
+            subject=Subject.objects.create(subject_name='Algebra', class_name='10')
+        )
+        self.students = [create_student(i) for i in range(5)]
+        create_student(99, is_active=False)
+        for student in self.students:
+            SemesterEnrollment.objects.create(semester=self.semester, student=student, batch=self.batch)
+        for student in self.students[:2]:
+            SubjectEnrollment.objects.create(semester_subject=self.semester_subject, student=student)
+        self.client.login(username='admin@example.com', password='adminpass123')
+        self.url = reverse('semesters:get_subject_students', args=[self.semester.slug, self.semester_subject.id])
+
+    def test_pages_available_students_excluding_enrolled(self):
+        data = self.client.get(self.url, {'limit': 2}).json()
+
+        self.assertEqual([s['id'] for s in data['enrolled_students']], [s.id for s in self.students[:2]])
+        self.assertIsNone(data['enrolled_next'])
+        self.assertEqual(data['enrolled_count'], 2)
+        self.assertEqual(data['available_students'][0], {
+            'id': self.students[2].id,
+            'email': 'student2@example.com',
+            'name': 'Student2 Last2',
+            'student_id': 'Student-000002',
+            'class': '10',
+        })
+
+        rest = self.client.get(self.url, {
+            'limit': 2, 'include': 'available', 'available_after': data['available_next'], 'fields': 'id'
+        }).json()
+        self.assertEqual(rest['enrolled_students'], [])
+        self.assertEqual(rest['available_students'], [{'id': self.students[4].id}])
+        self.assertIsNone(rest['available_next'])
+
+    def test_search_and_since(self):
+        data = self.client.get(self.url, {'q': 'student3', 'fields': 'student_id'}).json()
+        self.assertEqual(data['available_students'], [{'student_id': 'Student-000003'}])
+        self.assertEqual(data['enrolled_students'], [])
+
+        since = data['server_time']
+        self.assertEqual(self.client.get(self.url, {'since': since}).json()['available_students'], [])
+
+        self.students[4].section = 'B'
+        self.students[4].save()
+        SubjectEnrollment.objects.create(semester_subject=self.semester_subject, student=self.students[3])
+        data = self.client.get(self.url, {'since': since, 'fields': 'id'}).json()
+        self.assertEqual(data['available_students'], [{'id': self.students[4].id}])
+        self.assertEqual(data['enrolled_students'], [{'id': self.students[3].id}])
+
+    def test_since_reports_drops_and_reenrollments(self):
+        dropped, rejoined = self.students[:2]
+        drop_subject_enrollments(self.semester_subject, [rejoined.id])
+        since = self.client.get(self.url).json()['server_time']
+
+        drop_subject_enrollments(self.semester_subject, [dropped.id])
+        bulk_enroll_in_subject(self.semester_subject, [rejoined.id])
+        data = self.client.get(self.url, {'since': since, 'fields': 'id'}).json()
+        self.assertEqual(data['enrolled_students'], [{'id': rejoined.id}])
+        self.assertEqual(data['available_students'], [{'id': dropped.id}])
+        self.assertEqual(data['removed_students'], [dropped.id])
+
+        since = data['server_time']
+        data = self.client.get(self.url, {'since': since}).json()
+        self.assertEqual(
+            (data['enrolled_students'], data['available_students'], data['removed_students']), ([], [], [])
+        )
+
+    def test_rejects_bad_parameters(self):
+        for params in ({'limit': 'x'}, {'fields': 'password'}, {'since': 'yesterday'}, {'available_after': 'bad'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertFalse(response.json()['success'])
+
+
+
+def create_teacher(index):
+    return Teacher.objects.create(
+        first_name=f'Teacher{index}', last_name=f'Last{index}', gender='Male', date_of_birth='1980-01-01',
+        mobile='1234567890', joining_date='2020-01-01', qualification='MSc', username=f'teacher{index}',
+        email=f'teacher{index}@example.com', address='123 Street', city='City', state='State',
+        zip_code='12345', country='Country'
+    )
+
+
+class TeacherWorkloadTestCase(SemesterTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.busy, self.free = create_teacher(1), create_teacher(2)
+        self.subjects = [
+            SemesterSubject.objects.create(
+                semester=self.semester, teacher=self.busy, hours_per_week=hours, credits=credits,
+                subject=Subject.objects.create(subject_name=f'Subject {i}', class_name='10')
+            ) for i, (hours, credits) in enumerate(((4, 3), (5, 2)))
+        ]
+        student = create_student(1)
+        SemesterEnrollment.objects.create(semester=self.semester, student=student, batch=self.batch)
+        SubjectEnrollment.objects.create(semester_subject=self.subjects[0], student=student)
+        self.client.login(username='admin@example.com', password='adminpass123')
+
+    def test_report_is_one_grouped_query_and_cached(self):
+        with self.assertNumQueries(1):
+            rows = workload.semester_workloads([self.semester.id])
+        self.assertEqual(rows[self.semester.id], {
+            self.busy.id: {'teacher_id': self.busy.id, 'hours_per_week': 9, 'credits': 5, 'subjects': 2, 'students': 1}
+        })
+        with self.assertNumQueries(0):
+            workload.semester_workloads([self.semester.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subjects[1].teacher = self.free
+            self.subjects[1].save()
+        rows = workload.semester_workloads([self.semester.id])[self.semester.id]
+        self.assertEqual((rows[self.busy.id]['hours_per_week'], rows[self.free.id]['hours_per_week']), (4, 5))
+
+    def test_teacher_workload(self):
+        load = workload.teacher_workload(self.busy)
+        self.assertEqual((load['current_hours'], load['spare_hours']), (9, 11))
+        self.assertEqual(load['semesters'][0]['semester'], self.semester)
+
+        self.semester.status = 'completed'
+        self.semester.save()
+        self.assertEqual(workload.teacher_workload(self.busy)['current_hours'], 0)
+
+        response = self.client.get(reverse('view_teacher', args=[self.busy.slug]))
+        self.assertEqual(response.context['workload']['current_hours'], 0)
+
+    def test_json_endpoints(self):
+        data = self.client.get(reverse('semesters:teacher_workload', args=[self.busy.id])).json()
+        self.assertEqual(data['semesters'][0]['semester']['slug'], self.semester.slug)
+        self.assertEqual(data['semesters'][0]['subjects'], 2)
+
+        data = self.client.get(reverse('semesters:semester_teacher_workload', args=[self.semester.slug])).json()
+        self.assertEqual([row['teacher']['id'] for row in data['teachers']], [self.busy.id])
+
+    def test_search_sorts_by_spare_capacity(self):
+        url = reverse('semesters:search_teachers')
+        data = self.client.get(url, {'q': 'teacher', 'sort': 'capacity'}).json()
+        self.assertEqual([t['id'] for t in data['teachers']], [self.free.id, self.busy.id])
+        self.assertEqual([t['spare_hours'] for t in data['teachers']], [20, 11])
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class SeatReservationStressTestCase(TransactionTestCase):
+    """Concurrent enrollments, on a temp-file copy of the SQLite test database or on PostgreSQL"""
+    THREADS = 8
+    STUDENTS_PER_THREAD = 5
+
+    @classmethod
+    def setUpClass(cls):
+        # Threads cannot share SQLite's in-memory test database: run this class on a file copy of it
+        cls.memory_connection = None
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            cls.db_dir = tempfile.mkdtemp(prefix='seat_reservations_')
+            path = os.path.join(cls.db_dir, 'test.sqlite3')
+            connection.ensure_connection()
+            copy = sqlite3.connect(path)
+            connection.connection.backup(copy)
+            copy.close()
+
+            cls.memory_connection = connections[DEFAULT_DB_ALIAS]
+            cls.memory_name = connections.settings[DEFAULT_DB_ALIAS]['NAME']
+            connections.settings[DEFAULT_DB_ALIAS]['NAME'] = path
+            connections[DEFAULT_DB_ALIAS] = connections.create_connection(DEFAULT_DB_ALIAS)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.memory_connection is not None:
+            connections[DEFAULT_DB_ALIAS].close()
+            connections.settings[DEFAULT_DB_ALIAS]['NAME'] = cls.memory_name
+            connections[DEFAULT_DB_ALIAS] = cls.memory_connection
+            shutil.rmtree(cls.db_dir, ignore_errors=True)
+
+    def setUp(self):
+        department = Department.objects.create(department_name='Physics', department_start_date='2020-01-01')
+        self.semester = Semester.objects.create(
+            semester_name='Spring',
+            academic_year='2025-2026',
+            department=department,
+            start_date='2026-01-10',
+            end_date='2026-05-20'
+        )
+        self.batch = self.semester.batches.get()
+        self.batch.max_students = 10
+        self.batch.save()
+        self.semester_subject = SemesterSubject.objects.create(
+            semester=self.semester,
+            subject=Subject.objects.create(subject_name='Optics', class_name='10'),
+            max_students=7
+        )
+        self.students = [create_student(i) for i in range(self.THREADS * self.STUDENTS_PER_THREAD)]
+
+    def run_concurrently(self, work):
+        barrier = threading.Barrier(self.THREADS)
+        failures = []
+
+        def worker(index):
+            try:
+                barrier.wait()
+                chunk = self.students[index * self.STUDENTS_PER_THREAD:(index + 1) * self.STUDENTS_PER_THREAD]
+                work([str(student.id) for student in chunk])
+            except Exception as e:
+                failures.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(failures, [])
+
+    def test_batch_capacity_is_never_exceeded(self):
+        self.run_concurrently(lambda ids: bulk_enroll_students(self.semester, Batch.objects.get(pk=self.batch.pk), ids))
+
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.enrollments.filter(status='active').count(), 10)
+        self.assertEqual(self.batch.active_enrollment_count, 10)
+
+    def test_subject_capacity_is_never_exceeded(self):
+        self.run_concurrently(lambda ids: bulk_enroll_in_subject(SemesterSubject.objects.get(pk=self.semester_subject.pk), ids))
+
+        self.semester_subject.refresh_from_db()
+        self.assertEqual(self.semester_subject.subject_enrollments.filter(status='active').count(), 7)
+        self.assertEqual(self.semester_subject.active_enrollment_count, 7)
+
+    def test_single_seat_reservations_are_never_oversold(self):
+        granted = []
+
+        def reserve(ids):
+            batch = Batch.objects.get(pk=self.batch.pk)
+            granted.extend(batch.reserve_seats(1) for _ in ids)
+
+        self.run_concurrently(reserve)
+
+        self.batch.refresh_from_db()
+        self.assertEqual(sum(granted), 10)
+        self.assertEqual(self.batch.active_enrollment_count, 10)
@@ -7,13 +7,15 @@ from .views.subject_views import (
     subject_detail, add_semester_subject, edit_semester_subject, delete_semester_subject, 
     remove_teacher_from_subject, manage_subject_students, get_subject_students
 )
-from .views.teacher_views import search_teachers, add_teacher, edit_teacher, delete_teacher
+from .views.teacher_views import (
+    search_teachers, add_teacher, edit_teacher, delete_teacher, teacher_workload, semester_teacher_workload
+)
 from .views.student_views import search_students, add_student, edit_student, delete_student
 from .views.batch_views import (
     batch_detail, manage_batches, add_batch, edit_batch, delete_batch, 
     add_student_to_batch, remove_student_from_batch, move_students_between_batches
 )
-from .views.analytics_views import get_semester_analytics, export_semester_data
+from .views.analytics_views import get_semester_analytics, export_semester_data, get_dashboard_stats
 
 app_name = 'semesters'
 
@@ -24,7 +26,9 @@ urlpatterns = [
     
     # Global Search URLs (before semester-specific patterns)
     path('api/teachers/search/', search_teachers, name='search_teachers'),
+    path('api/teachers/<int:teacher_id>/workload/', teacher_workload, name='teacher_workload'),
     path('api/students/search/', search_students, name='search_students'),
+    path('api/dashboard-stats/', get_dashboard_stats, name='get_dashboard_stats'),
     
     # Global Teacher Management URLs
     path('teachers/add/', add_teacher, name='add_teacher'),
@@ -50,6 +54,7 @@ urlpatterns = [
     # Analytics and Export URLs
     path('<slug:slug>/analytics/', get_semester_analytics, name='get_semester_analytics'),
     path('<slug:slug>/export/', export_semester_data, name='export_semester_data'),
+    path('<slug:slug>/workload/', semester_teacher_workload, name='semester_teacher_workload'),
     
     # Subject Management URLs
     path('<slug:slug>/subjects/add/', add_semester_subject, name='add_semester_subject'),
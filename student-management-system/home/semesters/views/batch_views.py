@@ -7,7 +7,9 @@ from django.db import transaction
 from django.contrib.auth import get_user_model
 from ..models import Semester, Batch, SemesterEnrollment, SubjectEnrollment
 from student.models import Student
-from .utils import create_notification, is_admin
+from student import search as student_search
+from ..services import enrollment as enrollment_service
+from .utils import create_notification, create_notifications, is_admin
 import logging
 
 User = get_user_model()
@@ -17,8 +19,7 @@ logger = logging.getLogger(__name__)
 def batch_detail(request, batch_slug):
     """Detailed view of a batch"""
     batch = get_object_or_404(
-        Batch.objects.select_related('semester')
-        .prefetch_related('enrollments__student__user'),
+        Batch.objects.select_related('semester'),
         slug=batch_slug
     )
     
@@ -42,7 +43,7 @@ def batch_detail(request, batch_slug):
     context = {
         'batch': batch,
         'semester': batch.semester,
-        'enrolled_count': enrolled_students.count(),
+        'enrolled_count': batch.active_enrollment_count,
         'available_spots': batch.get_available_spots(),
         'can_enroll_more': batch.can_enroll_student(),
     }
@@ -52,12 +53,12 @@ def batch_detail(request, batch_slug):
 def manage_batches(request, slug):
     """Manage batches for a semester"""
     semester = get_object_or_404(Semester, slug=slug)
-    batches = semester.batches.all().prefetch_related('enrollments')
+    batches = semester.batches.all()
     
     # Get batch statistics
     batches_data = []
     for batch in batches:
-        enrolled_count = batch.enrollments.filter(status='active').count()
+        enrolled_count = batch.active_enrollment_count
         batches_data.append({
             'batch': batch,
             'enrolled_count': enrolled_count,
@@ -151,7 +152,7 @@ def edit_batch(request, slug, batch_id):
                     })
                 
                 # Check if new max_students is less than current enrollments
-                current_enrollments = batch.enrollments.filter(status='active').count()
+                current_enrollments = batch.active_enrollment_count
                 new_max_students = int(max_students) if max_students else 50
                 
                 if new_max_students < current_enrollments:
@@ -199,7 +200,7 @@ def delete_batch(request, slug, batch_id):
     try:
         with transaction.atomic():
             # Check if batch has enrollments
-            enrolled_count = batch.enrollments.filter(status='active').count()
+            enrolled_count = batch.active_enrollment_count
             if enrolled_count > 0:
                 return JsonResponse({
                     'success': False, 
@@ -252,92 +253,43 @@ def add_student_to_batch(request, slug, batch_id):
         return JsonResponse({'success': False, 'error': 'No students provided'}, status=400)
     
     try:
-        with transaction.atomic():
-            enrolled_count = 0
-            errors = []
-            already_enrolled = []
-            not_found = []
-            batch_full = False
-            
-            for student_id in student_data:
-                try:
-                    # Check batch capacity first
-                    if not batch.can_enroll_student():
-                        batch_full = True
-                        break
-                    
-                    # Find student by ID
-                    student = Student.objects.filter(id=student_id, user__is_active=True).first()
-                    
-                    if not student:
-                        not_found.append(student_id)
-                        continue
-                    
-                    # Check if student is already enrolled in this semester
-                    existing_enrollment = SemesterEnrollment.objects.filter(
-                        semester=semester,
-                        student=student,
-                        status='active'
-                    ).first()
-                    
-                    if existing_enrollment:
-                        already_enrolled.append(student.user.email or student_id)
-                        continue
-                    
-                    # Enroll student in semester through this batch
-                    SemesterEnrollment.objects.create(
-                        semester=semester,
-                        student=student,
-                        batch=batch,
-                        enrolled_by=request.user,
-                        status='active'
-                    )
-                    enrolled_count += 1
-                    
-                    # Notify student
-                    if student.user:
-                        create_notification(
-                            student.user,
-                            f"You have been enrolled in {semester.semester_name} (Batch: {batch.batch_name})"
-                        )
-                
-                except Exception as e:
-                    logger.exception("Error processing student %s: %s", student_id, str(e))
-                    errors.append(f"Error processing student ID {student_id}: {str(e)}")
-                    continue
-            
-            # Prepare response
-            response_data = {'success': enrolled_count > 0}
-            
-            if enrolled_count > 0:
-                response_data['message'] = f'Successfully enrolled {enrolled_count} student(s)'
-                response_data['enrolled_count'] = enrolled_count
-                
-                create_notification(
-                    request.user,
-                    f"Enrolled {enrolled_count} student(s) in batch {batch.batch_name}"
-                )
-            else:
-                response_data['error'] = 'No students were enrolled'
-            
-            # Add warnings
-            warnings = []
-            if batch_full:
-                warnings.append(f"Batch reached maximum capacity ({batch.max_students} students)")
-            if already_enrolled:
-                warnings.append(f"Students already enrolled in semester: {', '.join(already_enrolled)}")
-            if not_found:
-                warnings.append(f"Students not found: {', '.join(not_found)}")
-            if errors:
-                warnings.extend(errors)
-            
-            if warnings:
-                response_data['warnings'] = warnings
-            
-            logger.info("Added students to batch %s: enrolled=%d, warnings=%s", 
-                       batch.batch_name, enrolled_count, len(warnings))
+        result = enrollment_service.bulk_enroll_students(semester, batch, student_data, enrolled_by=request.user)
+        enrolled_count = len(result['enrolled'])
+        
+        # Notify students, queued together with the summary below
+        notifications = [
+            (student.user, f"You have been enrolled in {semester.semester_name} (Batch: {batch.batch_name})")
+            for student in result['enrolled']
+        ]
+        
+        # Prepare response
+        response_data = {'success': enrolled_count > 0}
+        
+        if enrolled_count > 0:
+            response_data['message'] = f'Successfully enrolled {enrolled_count} student(s)'
+            response_data['enrolled_count'] = enrolled_count
             
-            return JsonResponse(response_data)
+            notifications.append((request.user, f"Enrolled {enrolled_count} student(s) in batch {batch.batch_name}"))
+        else:
+            response_data['error'] = 'No students were enrolled'
+        create_notifications(notifications)
+        
+        # Add warnings
+        warnings = []
+        if result['batch_full']:
+            warnings.append(f"Batch reached maximum capacity ({batch.max_students} students)")
+        if result['already_enrolled']:
+            warnings.append(f"Students already enrolled in semester: {', '.join(result['already_enrolled'])}")
+        if result['not_found']:
+            warnings.append(f"Students not found: {', '.join(result['not_found'])}")
+        
+        if warnings:
+            response_data['warnings'] = warnings
+        
+        logger.info("Added students to batch %s: enrolled=%d, warnings=%s", 
+                   batch.batch_name, enrolled_count, len(warnings))
+        
+        return JsonResponse(response_data)
             
     except Exception as e:
         logger.exception("Error in add_student_to_batch: %s", str(e))
@@ -359,86 +311,38 @@ def remove_student_from_batch(request, slug, batch_id):
         return JsonResponse({'success': False, 'error': 'No students provided'}, status=400)
     
     try:
-        with transaction.atomic():
-            removed_count = 0
-            errors = []
-            not_enrolled = []
-            not_found = []
-            
-            for student_id in student_data:
-                try:
-                    # Find student by ID
-                    student = Student.objects.filter(id=student_id, user__is_active=True).first()
-                    
-                    if not student:
-                        not_found.append(student_id)
-                        continue
-                    
-                    # Find enrollment in this batch
-                    enrollment = SemesterEnrollment.objects.filter(
-                        semester=semester,
-                        student=student,
-                        batch=batch,
-                        status='active'
-                    ).first()
-                    
-                    if not enrollment:
-                        not_enrolled.append(student.user.email or student_id)
-                        continue
-                    
-                    # Remove from all subject enrollments first
-                    SubjectEnrollment.objects.filter(
-                        semester_enrollment=enrollment,
-                        status='active'
-                    ).delete()
-                    
-                    # Remove semester enrollment
-                    enrollment.delete()
-                    removed_count += 1
-                    
-                    # Notify student
-                    if student.user:
-                        create_notification(
-                            student.user,
-                            f"You have been removed from {semester.semester_name} (Batch: {batch.batch_name})"
-                        )
-                
-                except Exception as e:
-                    logger.exception("Error processing student %s: %s", student_id, str(e))
-                    errors.append(f"Error processing student ID {student_id}: {str(e)}")
-                    continue
-            
-            # Prepare response
-            response_data = {'success': removed_count > 0}
-            
-            if removed_count > 0:
-                response_data['message'] = f'Successfully removed {removed_count} student(s)'
-                response_data['removed_count'] = removed_count
-                
-                create_notification(
-                    request.user,
-                    f"Removed {removed_count} student(s) from batch {batch.batch_name}"
-                )
-            else:
-                response_data['error'] = 'No students were removed'
-            
-            # Add warnings
-            warnings = []
-            if not_enrolled:
-                warnings.append(f"Students not enrolled in this batch: {', '.join(not_enrolled)}")
-            if not_found:
-                warnings.append(f"Students not found: {', '.join(not_found)}")
-            if errors:
-                warnings.extend(errors)
-            
-            if warnings:
-                response_data['warnings'] = warnings
-            
-            logger.info("Removed students from batch %s: removed=%d, warnings=%s", 
-                       batch.batch_name, removed_count, len(warnings))
-            
-            return JsonResponse(response_data)
-            
+        result = enrollment_service.remove_from_batch(batch, student_data)
+        removed_count = len(result['removed'])
+
+        # Prepare response
+        response_data = {'success': removed_count > 0}
+
+        if removed_count > 0:
+            response_data['message'] = f'Successfully removed {removed_count} student(s)'
+            response_data['removed_count'] = removed_count
+
+            # Notify the students and the admin
+            create_notifications([
+                (student.user, f"You have been removed from {semester.semester_name} (Batch: {batch.batch_name})")
+                for student in result['removed']
+            ] + [
+                (request.user, f"Removed {removed_count} student(s) from batch {batch.batch_name}")
+            ])
+        else:
+            response_data['error'] = 'No students were removed'
+
+        # Add warnings
+        warnings = []
+        if result['not_enrolled']:
+            warnings.append(f"Students not enrolled in this batch: {', '.join(result['not_enrolled'])}")
+        if result['not_found']:
+            warnings.append(f"Students not found: {', '.join(result['not_found'])}")
+
+        if warnings:
+            response_data['warnings'] = warnings
+
+        return JsonResponse(response_data)
+
     except Exception as e:
         logger.exception("Error in remove_student_from_batch: %s", str(e))
         return JsonResponse({'success': False, 'error': f'Server error: {str(e)}'}, status=500)
@@ -466,12 +370,7 @@ def search_students(request):
         ).select_related('user')
         
         if query:
-            students = students.filter(
-                Q(user__email__icontains=query) |
-                Q(user__first_name__icontains=query) |
-                Q(user__last_name__icontains=query) |
-                Q(student_id__icontains=query)
-            )
+            students = student_search.search_students(query, students)
         
         available_students = students.exclude(id__in=enrolled_student_ids)[:20]
         enrolled_students = Student.objects.filter(
@@ -531,86 +430,47 @@ def move_students_between_batches(request, slug):
         return JsonResponse({'success': False, 'error': 'Source and destination batches cannot be the same'}, status=400)
     
     try:
-        with transaction.atomic():
-            moved_count = 0
-            errors = []
-            not_found = []
-            batch_full = False
-            
-            for student_id in student_data:
-                try:
-                    # Check destination batch capacity
-                    if not to_batch.can_enroll_student():
-                        batch_full = True
-                        break
-                    
-                    # Find student
-                    student = Student.objects.filter(id=student_id, user__is_active=True).first()
-                    
-                    if not student:
-                        not_found.append(student_id)
-                        continue
-                    
-                    # Find enrollment in source batch
-                    enrollment = SemesterEnrollment.objects.filter(
-                        semester=semester,
-                        student=student,
-                        batch=from_batch,
-                        status='active'
-                    ).first()
-                    
-                    if not enrollment:
-                        errors.append(f"Student ID {student_id} not found in source batch")
-                        continue
-                    
-                    # Move to new batch
-                    enrollment.batch = to_batch
-                    enrollment.save()
-                    moved_count += 1
-                    
-                    # Notify student
-                    if student.user:
-                        create_notification(
-                            student.user,
-                            f"You have been moved to {to_batch.batch_name} in {semester.semester_name}"
-                        )
-                
-                except Exception as e:
-                    logger.exception("Error moving student %s: %s", student_id, str(e))
-                    errors.append(f"Error moving student ID {student_id}: {str(e)}")
-                    continue
-            
-            # Prepare response
-            response_data = {'success': moved_count > 0}
-            
-            if moved_count > 0:
-                response_data['message'] = f'Successfully moved {moved_count} student(s) from {from_batch.batch_name} to {to_batch.batch_name}'
-                response_data['moved_count'] = moved_count
-                
-                create_notification(
-                    request.user,
-                    f"Moved {moved_count} student(s) from {from_batch.batch_name} to {to_batch.batch_name}"
-                )
-            else:
-                response_data['error'] = 'No students were moved'
-            
-            # Add warnings
-            warnings = []
-            if batch_full:
-                warnings.append(f"Destination batch {to_batch.batch_name} reached maximum capacity")
-            if not_found:
-                warnings.append(f"Students not found: {', '.join(not_found)}")
-            if errors:
-                warnings.extend(errors)
-            
-            if warnings:
-                response_data['warnings'] = warnings
-            
-            logger.info("Moved students between batches: moved=%d, warnings=%s", 
-                       moved_count, len(warnings))
-            
-            return JsonResponse(response_data)
-            
+        result = enrollment_service.move_students(from_batch, to_batch, student_data)
+        moved_count = len(result['moved'])
+
+        # Notify students, queued together with the summary below
+        notifications = [
+            (student.user, f"You have been moved to {to_batch.batch_name} in {semester.semester_name}")
+            for student in result['moved']
+        ]
+
+        # Prepare response
+        response_data = {'success': moved_count > 0}
+
+        if moved_count > 0:
+            response_data['message'] = f'Successfully moved {moved_count} student(s) from {from_batch.batch_name} to {to_batch.batch_name}'
+            response_data['moved_count'] = moved_count
+
+            notifications.append(
+                (request.user, f"Moved {moved_count} student(s) from {from_batch.batch_name} to {to_batch.batch_name}")
+            )
+        else:
+            response_data['error'] = 'No students were moved'
+        create_notifications(notifications)
+
+        # Add warnings
+        warnings = []
+        if result['batch_full']:
+            warnings.append(
+                f"Destination batch {to_batch.batch_name} reached maximum capacity; "
+                f"not moved: {', '.join(result['over_capacity'])}"
+            )
+            response_data['over_capacity'] = result['over_capacity']
+        if result['not_found']:
+            warnings.append(f"Students not found: {', '.join(result['not_found'])}")
+        for student_id in result['not_in_batch']:
+            warnings.append(f"Student ID {student_id} not found in source batch")
+
+        if warnings:
+            response_data['warnings'] = warnings
+
+        return JsonResponse(response_data)
+
     except Exception as e:
         logger.exception("Error in move_students_between_batches: %s", str(e))
         return JsonResponse({'success': False, 'error': f'Server error: {str(e)}'}, status=500)
\ No newline at end of file
@@ -9,7 +9,10 @@ from department.models import Department
 from subjects.models import Subject
 from teachers.models import Teacher
 from student.models import Student
-from .utils import create_notification, is_admin
+from ..services import enrollment as enrollment_service
+from ..services.detail import SemesterDetailLoader
+from school.pagination import KeysetPaginator, InvalidCursor, subquery_count
+from .utils import create_notification, create_notifications, is_admin
 import logging
 from django.core.paginator import Paginator
 
@@ -19,15 +22,12 @@ logger = logging.getLogger(__name__)
 @login_required
 def semester_list(request):
     """List all semesters with filtering and search"""
-    semesters = Semester.objects.select_related('department', 'created_by').prefetch_related(
-        'semester_subjects__teacher',
-        'semester_subjects__subject',
-        'semester_enrollments',
-        'batches'
-    ).annotate(
-        student_count=Count('semester_enrollments', filter=Q(semester_enrollments__status='active')),
-        subject_count=Count('semester_subjects'),
-        batch_count=Count('batches')
+    # Correlated count subqueries keep one row per semester; joined Count()s
+    # across three relations would multiply them
+    semesters = Semester.objects.select_related('department').annotate(
+        student_count=subquery_count(SemesterEnrollment.objects.filter(status='active'), 'semester'),
+        subject_count=subquery_count(SemesterSubject.objects.all(), 'semester'),
+        batch_count=subquery_count(Batch.objects.all(), 'semester')
     )
     
     # Filter by status
@@ -45,10 +45,12 @@ def semester_list(request):
             Q(semester_id__icontains=search_query)
         )
     
-    # Pagination
-    paginator = Paginator(semesters, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination: ?after=/?before= cursors instead of OFFSET pages
+    paginator = KeysetPaginator(semesters, 10, ordering=('-created_at', 'id'))
+    try:
+        page_obj = paginator.get_page(after=request.GET.get('after'), before=request.GET.get('before'))
+    except InvalidCursor:
+        page_obj = paginator.get_page()
     
     context = {
         'page_obj': page_obj,
@@ -61,54 +63,8 @@ def semester_list(request):
 @login_required
 def semester_detail(request, slug):
     """Detailed view of a semester with all related data"""
-    semester = get_object_or_404(
-        Semester.objects.select_related('department', 'created_by')
-        .prefetch_related(
-            'semester_subjects__subject',
-            'semester_subjects__teacher',
-            'semester_subjects__subject_enrollments__student__user',
-            'semester_enrollments__student__user',
-            'semester_enrollments__batch',
-            'batches'
-        ),
-        slug=slug
-    )
-    
-    # Get semester statistics
-    active_enrollments = semester.semester_enrollments.filter(status='active')
-    semester_subjects = semester.semester_subjects.all()
-    batches = semester.batches.all()
-    
-    # Get subjects with enrollment counts
-    subjects_data = []
-    for subject in semester_subjects:
-        enrolled_count = subject.subject_enrollments.filter(status='active').count()
-        subjects_data.append({
-            'semester_subject': subject,
-            'enrolled_count': enrolled_count,
-            'available_spots': subject.get_available_spots()
-        })
-    
-    # Get batches with enrollment counts
-    batches_data = []
-    for batch in batches:
-        enrolled_count = batch.enrollments.filter(status='active').count()
-        batches_data.append({
-            'batch': batch,
-            'enrolled_count': enrolled_count,
-            'available_spots': batch.get_available_spots()
-        })
-    
-    context = {
-        'semester': semester,
-        'active_enrollments': active_enrollments,
-        'subjects_data': subjects_data,
-        'batches_data': batches_data,
-        'student_count': active_enrollments.count(),
-        'subject_count': semester_subjects.count(),
-        'teacher_count': semester_subjects.filter(teacher__isnull=False).values('teacher').distinct().count(),
-        'batch_count': batches.count(),
-    }
+    loader = SemesterDetailLoader(slug)
+    context = loader.context()
     return render(request, 'semesters/semester_detail.html', context)
 
 @login_required
@@ -303,81 +259,44 @@ def bulk_enroll_students(request, slug):
             return redirect('semesters:semester_detail', slug=slug)
         
         try:
-            with transaction.atomic():
-                enrolled_count = 0
-                errors = []
-                already_enrolled = []
-                not_found = []
-                
-                for email in emails:
-                    try:
-                        # Find student by email
-                        student = Student.objects.select_related('user').get(
-                            user__email=email,
-                            is_active=True
-                        )
-                        
-                        # Check if already enrolled
-                        if SemesterEnrollment.objects.filter(
-                            semester=semester,
-                            student=student,
-                            status='active'
-                        ).exists():
-                            already_enrolled.append(email)
-                            continue
-                        
-                        # Check batch capacity
-                        if not batch.can_enroll_student():
-                            errors.append(f"Batch {batch.batch_name} is full")
-                            break
-                        
-                        # Enroll student
-                        SemesterEnrollment.objects.create(
-                            semester=semester,
-                            student=student,
-                            batch=batch,
-                            enrolled_by=request.user,
-                            status='active'
-                        )
-                        enrolled_count += 1
-                        
-                        # Notify student
-                        if student.user:
-                            create_notification(
-                                student.user,
-                                f"You have been enrolled in {semester.semester_name}"
-                            )
-                    
-                    except Student.DoesNotExist:
-                        not_found.append(email)
-                    except Exception as e:
-                        errors.append(f"Error enrolling {email}: {str(e)}")
-                
-                # Create summary message
-                message_parts = []
-                if enrolled_count > 0:
-                    message_parts.append(f"Successfully enrolled {enrolled_count} students")
-                
-                if already_enrolled:
-                    message_parts.append(f"{len(already_enrolled)} students were already enrolled")
-                
-                if not_found:
-                    message_parts.append(f"{len(not_found)} students not found")
-                
-                if errors:
-                    message_parts.append(f"{len(errors)} errors occurred")
-                
-                if enrolled_count > 0:
-                    messages.success(request, ". ".join(message_parts))
-                    create_notification(
-                        request.user,
-                        f"Bulk enrolled {enrolled_count} students in {semester.semester_name}"
-                    )
-                else:
-                    messages.warning(request, ". ".join(message_parts))
-                
-                logger.info("Bulk enrollment in %s: enrolled=%d, errors=%s", 
-                          semester.semester_name, enrolled_count, errors)
+            result = enrollment_service.bulk_enroll_students(semester, batch, emails, enrolled_by=request.user, lookup='email')
+            enrolled_count = len(result['enrolled'])
+            
+            # Notify students, queued together with the summary below
+            notifications = [
+                (student.user, f"You have been enrolled in {semester.semester_name}")
+                for student in result['enrolled']
+            ]
+            
+            errors = []
+            if result['batch_full']:
+                errors.append(f"Batch {batch.batch_name} is full")
+            
+            # Create summary message
+            message_parts = []
+            if enrolled_count > 0:
+                message_parts.append(f"Successfully enrolled {enrolled_count} students")
+            
+            if result['already_enrolled']:
+                message_parts.append(f"{len(result['already_enrolled'])} students were already enrolled")
+            
+            if result['not_found']:
+                message_parts.append(f"{len(result['not_found'])} students not found")
+            
+            if errors:
+                message_parts.append(f"{len(errors)} errors occurred")
+            
+            if enrolled_count > 0:
+                messages.success(request, ". ".join(message_parts))
+                notifications.append(
+                    (request.user, f"Bulk enrolled {enrolled_count} students in {semester.semester_name}")
+                )
+            else:
+                messages.warning(request, ". ".join(message_parts))
+            create_notifications(notifications)
+            
+            logger.info("Bulk enrollment in %s: enrolled=%d, errors=%s", 
+                      semester.semester_name, enrolled_count, errors)
                 
         except Exception as e:
             messages.error(request, f"Error during bulk enrollment: {str(e)}")
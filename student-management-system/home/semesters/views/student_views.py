@@ -7,6 +7,8 @@ from django.db.models import Q
 from django.db import transaction
 from django.contrib.auth import get_user_model
 from student.models import Student
+from student import search as student_search
+from ..models import Semester, SemesterEnrollment
 from .utils import create_notification, is_admin
 import logging
 
@@ -14,9 +16,7 @@ User = get_user_model()
 logger = logging.getLogger(__name__)
 
 @login_required
-
-@login_required
-def search_students(request, slug):
+def search_students(request, slug=None):
     """Search students by email, name, or ID (AJAX)"""
     query = request.GET.get('q', '').strip()
     
@@ -24,7 +24,10 @@ def search_students(request, slug):
         return JsonResponse({'students': []})
     
     try:
-        semester = get_object_or_404(Semester, slug=slug)
+        if slug:
+            semester = get_object_or_404(Semester, slug=slug)
+        else:
+            semester = get_object_or_404(Semester, id=request.GET.get('semester_id'))
         
         # Get IDs of students already enrolled in the semester
         enrolled_student_ids = SemesterEnrollment.objects.filter(
@@ -33,14 +36,9 @@ def search_students(request, slug):
         ).values_list('student_id', flat=True)
         
         # Search for students not already enrolled
-        students = Student.objects.filter(
-            Q(user__email__icontains=query) | 
-            Q(first_name__icontains=query) | 
-            Q(last_name__icontains=query) |
-            Q(student_id__icontains=query),
-            user__is_active=True
-        ).exclude(
-            id__in=enrolled_student_ids
+        students = student_search.search_students(
+            query,
+            Student.objects.filter(user__is_active=True).exclude(id__in=enrolled_student_ids)
         ).select_related('user')
         
         # Limit results
@@ -8,11 +8,16 @@ from django.db.models import Q
 from django.db import transaction
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from ..models import Semester, SemesterSubject, SubjectEnrollment, SemesterEnrollment
 from subjects.models import Subject
 from teachers.models import Teacher
 from student.models import Student
-from .utils import create_notification, is_admin
+from ..services import enrollment as enrollment_service
+from ..services import roster as roster_service
+from school.pagination import InvalidCursor
+from .utils import create_notification, create_notifications, is_admin
 import logging
 
 User = get_user_model()
@@ -256,76 +261,28 @@ def delete_semester_subject(request, slug, subject_id):
                     'error': f'Subject has {material_count} materials and {assignment_count} assignments. Delete them first.'
                 }, status=400)
             
-            # Get all active enrollments for the subject
-            active_enrollments = SubjectEnrollment.objects.filter(
-                semester_subject=semester_subject,
-                status='active'
-            ).select_related('student__user')
-            
-            # Process each enrollment
-            for enrollment in active_enrollments:
-                student = enrollment.student
-                # Delete the subject enrollment
-                enrollment.delete()
-                logger.info("Removed student %s from subject %s in semester %s",
-                           student.get_full_name(), subject_name, semester.semester_name)
-                
-                # Check if student has other active subject enrollments in this semester
-                remaining_subjects = SubjectEnrollment.objects.filter(
-                    semester_enrollment__semester=semester,
-                    student=student,
-                    status='active'
-                ).exists()
-                
-                if not remaining_subjects:
-                    # No remaining subjects, remove semester enrollment
-                    SemesterEnrollment.objects.filter(
-                        semester=semester,
-                        student=student,
-                        status='active'
-                    ).delete()
-                    logger.info(
-                        "Removed student %s from semester %s due to no remaining subject enrollments",
-                        student.get_full_name(), semester.semester_name
-                    )
-                    if student.user:
-                        create_notification(
-                            student.user,
-                            f'You have been removed from semester {semester.semester_name} due to no remaining subject enrollments'
-                        )
-                
-                # Notify student about subject removal
-                if student.user:
-                    create_notification(
-                        student.user,
-                        f'You have been removed from {subject_name} in {semester.semester_name}'
-                    )
-            
-            # Notify teacher if assigned
+            # Drop the enrollments (and semester enrollments left without subjects) in bulk
+            result = enrollment_service.drop_subject_enrollments(semester_subject)
+
+            notifications = [
+                (student.user, f'You have been removed from {subject_name} in {semester.semester_name}')
+                for student in result['removed']
+            ] + [
+                (student.user, f'You have been removed from semester {semester.semester_name} due to no remaining subject enrollments')
+                for student in result['left_semester']
+            ]
             if teacher and teacher.user:
-                try:
-                    create_notification(
-                        teacher.user,
-                        f"You have been unassigned from {subject_name} in {semester.semester_name}",
-                        'warning'
-                    )
-                except Exception as e:
-                    logger.error("Failed to notify teacher: %s", str(e))
-            
+                notifications.append(
+                    (teacher.user, f"You have been unassigned from {subject_name} in {semester.semester_name}")
+                )
+            notifications.append((request.user, f"Deleted subject {subject_name} from {semester.semester_name}"))
+
             # Delete the subject
             semester_subject.delete()
             logger.info("Successfully deleted subject %s from semester %s", subject_name, semester.semester_name)
-            
-            # Notify admin
-            try:
-                create_notification(
-                    request.user,
-                    f"Deleted subject {subject_name} from {semester.semester_name}",
-                    'info'
-                )
-            except Exception as e:
-                logger.error("Failed to create admin notification: %s", str(e))
-            
+
+            create_notifications(notifications)
+
             return JsonResponse({
                 'success': True,
                 'message': f'Subject "{subject_name}" deleted successfully'
@@ -423,98 +380,44 @@ def manage_subject_students(request, slug, subject_id):
     processed = 0
     errors = []
 
-    with transaction.atomic():
-        for sid in student_ids:
-            try:
-                student = Student.objects.get(id=sid, user__is_active=True)
-                
-                if action == 'add':
-                    # Check if student is already enrolled
-                    if SubjectEnrollment.objects.filter(
-                        semester_subject=semester_subject,
-                        student=student,
-                        status='active'
-                    ).exists():
-                        errors.append(f'{student.get_full_name()} is already enrolled')
-                        continue
-
-                    # Check if subject has capacity
-                    if not semester_subject.can_enroll_student():
-                        errors.append('Subject is full')
-                        break
-
-                    # Find or create semester enrollment
-                    sem_enroll, created = SemesterEnrollment.objects.get_or_create(
-                        semester=semester,
-                        student=student,
-                        defaults={
-                            'enrolled_by': request.user,
-                            'status': 'active'
-                        }
-                    )
-
-                    # Create subject enrollment
-                    SubjectEnrollment.objects.create(
-                        semester_subject=semester_subject,
-                        student=student,
-                        semester_enrollment=sem_enroll,
-                        enrolled_by=request.user,
-                        status='active'
-                    )
-                    processed += 1
-
-                    # Notify student
-                    if student.user:
-                        create_notification(
-                            student.user,
-                            f'You have been enrolled in {semester_subject.subject.subject_name}'
-                        )
+    if action == 'add':
+        result = enrollment_service.bulk_enroll_in_subject(semester_subject, student_ids, enrolled_by=request.user)
+        processed = len(result['enrolled'])
 
-                elif action == 'remove':
-                    # Remove from subject
-                    rows, _ = SubjectEnrollment.objects.filter(
-                        semester_subject=semester_subject,
-                        student=student,
-                        status='active'
-                    ).delete()
-                    processed += rows
+        for student in result['already_enrolled']:
+            errors.append(f'{student.get_full_name()} is already enrolled')
+        for sid in result['not_found']:
+            errors.append(f'Student ID {sid} not found')
+        for student in result['semester_closed']:
+            errors.append(f'{student.get_full_name()} has a completed or inactive semester enrollment')
+        if result['subject_full']:
+            errors.append('Subject is full')
 
-                    if rows > 0:  # Only proceed if a subject enrollment was actually deleted
-                        # Check if student has any other active subject enrollments in this semester
-                        remaining_subjects = SubjectEnrollment.objects.filter(
-                            semester_enrollment__semester=semester,
-                            student=student,
-                            status='active'
-                        ).exists()
+        # Notify students
+        create_notifications([
+            (student.user, f'You have been enrolled in {semester_subject.subject.subject_name}')
+            for student in result['enrolled']
+        ])
 
-                        if not remaining_subjects:
-                            # No remaining subjects, remove semester enrollment
-                            SemesterEnrollment.objects.filter(
-                                semester=semester,
-                                student=student,
-                                status='active'
-                            ).delete()
-                            logger.info(
-                                "Removed student %s from semester %s due to no remaining subject enrollments",
-                                student.get_full_name(), semester.semester_name
-                            )
-                            if student.user:
-                                create_notification(
-                                    student.user,
-                                    f'You have been removed from semester {semester.semester_name} due to no remaining subject enrollments'
-                                )
+        return JsonResponse({
+            'success': True if processed > 0 else False,
+            'message': f'{processed} student(s) {action}ed',
+            'errors': errors
+        })
 
-                    # Notify student about subject removal
-                    if student.user:
-                        create_notification(
-                            student.user,
-                            f'You have been removed from {semester_subject.subject.subject_name}'
-                        )
+    result = enrollment_service.drop_subject_enrollments(semester_subject, student_ids)
+    processed = len(result['removed'])
+    for sid in result['not_found']:
+        errors.append(f'Student ID {sid} not found')
 
-            except Student.DoesNotExist:
-                errors.append(f'Student ID {sid} not found')
-            except Exception as e:
-                errors.append(f'Error processing student ID {sid}: {str(e)}')
+    # Notify students
+    create_notifications([
+        (student.user, f'You have been removed from {semester_subject.subject.subject_name}')
+        for student in result['removed']
+    ] + [
+        (student.user, f'You have been removed from semester {semester.semester_name} due to no remaining subject enrollments')
+        for student in result['left_semester']
+    ])
 
     return JsonResponse({
         'success': True if processed > 0 else False,
@@ -524,71 +427,72 @@ def manage_subject_students(request, slug, subject_id):
 
 @login_required
 def get_subject_students(request, slug, subject_id):
-    """Get students enrolled in a subject (AJAX)"""
+    """
+    Get one page each of the students enrolled in and available for a
+    subject (AJAX).
+
+    GET parameters: ``q`` to search, ``limit`` (page size), ``fields`` (comma
+    separated keys to return), ``since`` (ISO timestamp; only students enrolled,
+    dropped or changed since then, pass the previous ``server_time``; the ids of
+    students dropped since then come back in ``removed_students``), ``include``
+    ('enrolled' or 'available' to fetch one list) and ``enrolled_after`` /
+    ``available_after`` (the ``*_next`` cursors of the previous page).
+    """
     semester = get_object_or_404(Semester, slug=slug)
-    semester_subject = get_object_or_404(SemesterSubject, id=subject_id, semester=semester)
-    
-    try:
-        # Get enrolled students
-        enrolled_students = SubjectEnrollment.objects.filter(
-            semester_subject=semester_subject,
-            status='active'
-        ).select_related('student__user', 'semester_enrollment__batch')
+    semester_subject = get_object_or_404(
+        SemesterSubject.objects.select_related('subject'), id=subject_id, semester=semester
+    )
+    server_time = timezone.now()
 
-        # Get ALL active students (not just those in semester)
-        available_students = Student.objects.filter(
-            user__is_active=True
-        ).select_related('user')
+    try:
+        limit = roster_service.parse_limit(request.GET.get('limit'))
+        fields = roster_service.parse_fields(request.GET.get('fields'))
+        since = None
+        if request.GET.get('since'):
+            since = parse_datetime(request.GET['since'])
+            if since is None:
+                raise ValueError(f"Invalid since timestamp: {request.GET['since']!r}")
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        include = request.GET.get('include', '')
+        if include not in ('', 'enrolled', 'available'):
+            raise ValueError(f"Invalid include: {include!r}")
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
 
-        # Apply search filter if provided
+    try:
         query = request.GET.get('q', '').strip()
-        if query:
-            enrolled_students = enrolled_students.filter(
-                Q(student__user__email__icontains=query) |
-                Q(student__first_name__icontains=query) |
-                Q(student__last_name__icontains=query) |
-                Q(student__student_id__icontains=query))
-            
-            available_students = available_students.filter(
-                Q(user__email__icontains=query) |
-                Q(first_name__icontains=query) |
-                Q(last_name__icontains=query) |
-                Q(student_id__icontains=query))
-
-        # Format data
-        enrolled_data = []
-        for enrollment in enrolled_students:
-            enrolled_data.append({
-                'id': enrollment.student.id,
-                'email': enrollment.student.user.email if enrollment.student.user else '',
-                'name': enrollment.student.get_full_name(),
-                'student_id': enrollment.student.student_id,
-                'class': enrollment.student.student_class or 'N/A'
-            })
+        enrolled_data, enrolled_next, removed = [], None, []
+        available_data, available_next = [], None
 
-        available_data = []
-        enrolled_ids = [e['id'] for e in enrolled_data]
-        for student in available_students:
-            # Only show students not already enrolled
-            if student.id not in enrolled_ids:
-                available_data.append({
-                    'id': student.id,
-                    'email': student.user.email if student.user else '',
-                    'name': student.get_full_name(),
-                    'student_id': student.student_id,
-                    'class': student.student_class or 'N/A'
-                })
+        if include != 'available':
+            enrolled_data, enrolled_next = roster_service.student_page(
+                roster_service.enrolled_students(semester_subject, since),
+                fields, limit, request.GET.get('enrolled_after'), query
+            )
+            if since:
+                removed = roster_service.removed_students(semester_subject, since)
+        if include != 'enrolled':
+            available_data, available_next = roster_service.student_page(
+                roster_service.available_students(semester_subject, since),
+                fields, limit, request.GET.get('available_after'), query
+            )
 
         return JsonResponse({
             'success': True,
             'subject_name': semester_subject.subject.subject_name,
             'enrolled_students': enrolled_data,
             'available_students': available_data,
-            'enrolled_count': len(enrolled_data),
-            'available_count': len(available_data),
-            'can_enroll_more': semester_subject.can_enroll_student()
+            'enrolled_next': enrolled_next,
+            'available_next': available_next,
+            'removed_students': removed,
+            'enrolled_count': semester_subject.active_enrollment_count,
+            'can_enroll_more': semester_subject.can_enroll_student(),
+            'server_time': server_time.isoformat(),
         })
 
+    except InvalidCursor as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
     except Exception as e:
         logger.exception("Error fetching subject students: %s", str(e))
         return JsonResponse({
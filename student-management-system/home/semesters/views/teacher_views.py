@@ -4,54 +4,65 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.db.models import Q
 from django.db import transaction
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from teachers.models import Teacher
+from teachers import directory, search as teacher_search
+from ..models import Semester
+from ..services import workload as workload_service
 from .utils import create_notification, is_admin
+import hashlib
 import logging
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Backstop for changes that do not bump the teacher directory version (e.g. semester status)
+SEARCH_CACHE_TTL = 60
+
 @login_required
 def search_teachers(request):
     """Search teachers by email, name (AJAX)"""
-    query = request.GET.get('q', '').strip()
-    subject_id = request.GET.get('subject_id')
+    query = teacher_search.normalize(request.GET.get('q'))
+    sort = 'capacity' if request.GET.get('sort') == 'capacity' else 'relevance'
+    try:
+        subject_id = int(request.GET['subject_id']) if request.GET.get('subject_id') else None
+    except ValueError:
+        subject_id = None
     
     if len(query) < 2:
         return JsonResponse({'teachers': []})
     
+    # Autocomplete fires on every keystroke; identical queries share one response
+    # until the teacher directory changes
+    key = 'teacher_search:{}:{}:{}:{}'.format(
+        directory.cache_version(), sort, subject_id, hashlib.md5(query.encode()).hexdigest()
+    )
+    teacher_list = cache.get(key)
+    if teacher_list is not None:
+        return JsonResponse({'teachers': teacher_list})
+    
     try:
-        teachers = Teacher.objects.filter(
-            Q(email__icontains=query) | 
-            Q(first_name__icontains=query) | 
-            Q(last_name__icontains=query),
-            is_active=True
-        ).select_related('user')
-        
         # Exclude current teacher if editing subject
-        if subject_id:
-            try:
-                from ..models import SemesterSubject
-                semester_subject = SemesterSubject.objects.get(id=subject_id)
-                if semester_subject.teacher:
-                    teachers = teachers.exclude(id=semester_subject.teacher.id)
-            except SemesterSubject.DoesNotExist:
-                pass
+        teachers = teacher_search.search_teachers(
+            query, Teacher.objects.filter(is_active=True).only(*directory.LIST_FIELDS), exclude_subject=subject_id
+        )
+        teachers = workload_service.with_current_hours(teachers)
+        
+        # Least loaded first when picking a teacher for a subject
+        if sort == 'capacity':
+            teachers = teachers.order_by('current_hours', *teachers.query.order_by)
         
         # Limit results
         teachers = teachers[:15]
         
+        max_hours = workload_service.max_hours_per_week()
         teacher_list = [
-            {
-                'id': teacher.id,
-                'email': teacher.email,
-                'name': teacher.get_full_name(),
-                'qualification': teacher.qualification or 'N/A'
-            } for teacher in teachers
+            dict(directory.teacher_json(teacher), current_hours=teacher.current_hours, spare_hours=max_hours - teacher.current_hours)
+            for teacher in teachers
         ]
+        cache.set(key, teacher_list, SEARCH_CACHE_TTL)
         
         logger.debug("Found %d teachers for query: %s", len(teacher_list), query)
         return JsonResponse({'teachers': teacher_list})
@@ -205,4 +216,37 @@ def delete_teacher(request, teacher_id):
         return JsonResponse({
             'success': False, 
             'error': f'Error deactivating teacher: {str(e)}'
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+
+@login_required
+@user_passes_test(is_admin, login_url='index')
+def teacher_workload(request, teacher_id):
+    """A teacher's load per semester and their spare weekly hours (AJAX)"""
+    teacher = get_object_or_404(Teacher.objects.only(*directory.LIST_FIELDS), id=teacher_id)
+    workload = workload_service.teacher_workload(teacher)
+    workload['teacher'] = directory.teacher_json(teacher)
+    workload['semesters'] = [
+        {
+            'semester': {
+                'id': row['semester'].id,
+                'name': row['semester'].semester_name,
+                'slug': row['semester'].slug,
+                'academic_year': row['semester'].academic_year,
+                'status': row['semester'].status,
+            },
+            **{field: row[field] for field in ('hours_per_week', 'credits', 'subjects', 'students')}
+        } for row in workload['semesters']
+    ]
+    return JsonResponse(workload)
+
+
+@login_required
+@user_passes_test(is_admin, login_url='index')
+def semester_teacher_workload(request, slug):
+    """Every assigned teacher's load in a semester (AJAX)"""
+    semester = get_object_or_404(Semester.objects.only('id', 'slug'), slug=slug)
+    return JsonResponse({
+        'max_hours_per_week': workload_service.max_hours_per_week(),
+        'teachers': workload_service.semester_report(semester),
+    })
@@ -1,6 +1,7 @@
 # semesters/views/utils.py
 from django.contrib.auth.decorators import user_passes_test
 from django.contrib.auth import get_user_model
+from school.notifications import create_notification, create_notifications  # noqa: F401 (used by the views)
 import logging
 import re
 
@@ -13,19 +14,6 @@ def is_admin(user):
     return user.is_authenticated and getattr(user, "is_admin", False)
 
 
-def create_notification(user, message):
-    """Create a notification for a user"""
-    try:
-        # Example: If you later add a Notification model, you can enable this
-        # from notifications.models import Notification
-        # Notification.objects.create(user=user, message=message)
-
-        # For now, just log the notification
-        logger.info("Notification for %s: %s", user.username if user else "Unknown", message)
-    except Exception as e:
-        logger.exception("Error creating notification: %s", str(e))
-
-
 def get_user_permissions(user):
     """Get user permissions for semester management"""
     permissions = {
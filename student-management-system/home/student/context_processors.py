@@ -1,13 +1,2 @@
-from school.models import Notification
-
-def notifications(request):
-    if request.user.is_authenticated:
-        unread_notifications = Notification.objects.filter(user=request.user, is_read=False)
-        return {
-            'unread_notification': unread_notifications,
-            'unread_notification_count': unread_notifications.count()
-        }
-    return {
-        'unread_notification': [],
-        'unread_notification_count': 0
-    }
\ No newline at end of file
+# Kept for settings that still point here; see school.context_processors
+from school.context_processors import notifications  # noqa: F401
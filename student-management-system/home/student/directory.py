@@ -0,0 +1,43 @@
+# student/directory.py
+"""
+The student directory (students:student_list).
+
+Pages are keyset paginated over the primary key (or the search rank), so
+page N costs the same as page 1 however many students there are, and only
+the columns the table shows are selected: no parent join, no image path or
+address columns. The total shown above the table is a cached estimate
+rather than a COUNT(*) per page view.
+"""
+from django.core.cache import cache
+from school.pagination import KeysetPaginator
+from .models import Student
+from .search import search_students
+
+PER_PAGE = 25
+# Columns rendered by templates/students/students.html
+LIST_FIELDS = (
+    'id', 'student_id', 'slug', 'first_name', 'last_name', 'student_class', 'section', 'email', 'mobile_number',
+)
+
+COUNT_KEY = 'student_directory:count'
+# Creates and deletes drop the cached count; the TTL covers bulk writes
+COUNT_TTL = 300
+
+
+def directory_page(query='', after=None, before=None, per_page=PER_PAGE):
+    """One page of students (projected to LIST_FIELDS), searched and ranked when ``query`` is given"""
+    students = Student.objects.only(*LIST_FIELDS)
+    if query:
+        students = search_students(query, students)
+    # search() orders by (rank, pk) where it can rank; pk breaks ties
+    ordering = tuple('id' if name == 'pk' else name for name in students.query.order_by) or ('id',)
+    return KeysetPaginator(students, per_page, ordering).get_page(after=after, before=before)
+
+
+def count_estimate():
+    """Number of students, cached for up to COUNT_TTL seconds"""
+    return cache.get_or_set(COUNT_KEY, Student.objects.count, COUNT_TTL)
+
+
+def forget_count():
+    cache.delete(COUNT_KEY)
@@ -0,0 +1,263 @@
+# student/importer.py
+"""
+Bulk student import from CSV or XLSX files.
+
+Rows are read lazily and handled in chunks: each chunk is validated, its
+emails are checked against existing accounts with a single query, the
+passwords are hashed across a process pool (home_auth.hashing) and the users, parents and
+students are written with one bulk_create each. Invalid rows are reported
+with their line number and never stop the rest of the import.
+"""
+from datetime import date, datetime
+import csv
+import io
+import logging
+import os
+import time
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import DatabaseError, transaction
+from django.db.models.functions import Lower
+from home_auth import hashing
+from home_auth.models import CustomUser
+from .models import Student, Parent
+from .search import index_students
+from . import directory
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+DEFAULT_PASSWORD = 'student@1234'
+
+REQUIRED_COLUMNS = (
+    'first_name', 'last_name', 'email', 'gender', 'date_of_birth', 'student_class', 'religion',
+    'joining_date', 'mobile_number', 'admission_number', 'section',
+    'father_name', 'father_mobile', 'father_email', 'mother_name', 'mother_mobile', 'mother_email',
+    'present_address', 'permanent_address',
+)
+OPTIONAL_COLUMNS = ('father_occupation', 'mother_occupation')
+DATE_COLUMNS = ('date_of_birth', 'joining_date')
+EMAIL_COLUMNS = ('email', 'father_email', 'mother_email')
+
+PARENT_FIELDS = (
+    'father_name', 'father_occupation', 'father_mobile', 'father_email',
+    'mother_name', 'mother_occupation', 'mother_mobile', 'mother_email',
+    'present_address', 'permanent_address',
+)
+STUDENT_FIELDS = (
+    'first_name', 'last_name', 'gender', 'date_of_birth', 'student_class', 'religion',
+    'joining_date', 'mobile_number', 'admission_number', 'section', 'email',
+)
+GENDERS = {choice for choice, _ in Student._meta.get_field('gender').choices}
+
+
+class ImportFileError(ValueError):
+    """The file cannot be read as a student sheet at all"""
+
+
+def _header(names):
+    header = [str(name or '').strip().lower().replace(' ', '_') for name in names]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ImportFileError(f"Missing column(s): {', '.join(missing)}")
+    return header
+
+
+def _csv_rows(file):
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text)
+    try:
+        header = _header(next(reader, []))
+        for values in reader:
+            if any(values):
+                yield reader.line_num, dict(zip(header, values))
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Decoding runs ahead in blocks, so the line is where reading stopped
+        raise ImportFileError(f"Cannot read the CSV file after line {reader.line_num}; save it as UTF-8 CSV ({e})") from e
+
+
+def _xlsx_rows(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("Reading .xlsx files requires openpyxl")
+
+    # read_only streams the sheet instead of loading every cell
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _header(next(rows, []))
+        for line, values in enumerate(rows, start=2):
+            if any(value not in (None, '') for value in values):
+                yield line, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def read_rows(file, name):
+    """Lazily yield ``(line number, row dict)`` from an uploaded CSV or XLSX file"""
+    extension = os.path.splitext(name)[1].lower()
+    if extension == '.csv':
+        return _csv_rows(file)
+    if extension == '.xlsx':
+        return _xlsx_rows(file)
+    raise ImportFileError(f"Unsupported file type {extension or name!r}; upload a .csv or .xlsx file")
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheet cells hold phone and admission numbers as floats
+        value = int(value)
+    return str(value).strip()
+
+
+def _date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(_text(value), '%Y-%m-%d').date()
+
+
+def clean_row(row):
+    """Validated field values of one row; raises ValidationError listing every problem"""
+    errors = []
+    cleaned = {}
+    for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS:
+        value = row.get(column)
+        if column in DATE_COLUMNS:
+            try:
+                cleaned[column] = _date(value)
+            except ValueError:
+                errors.append(f"{column}: use the YYYY-MM-DD format")
+            continue
+
+        value = _text(value)
+        if not value and column in REQUIRED_COLUMNS:
+            errors.append(f"{column}: required")
+            continue
+        cleaned[column] = value
+
+    for column in EMAIL_COLUMNS:
+        if cleaned.get(column):
+            try:
+                validate_email(cleaned[column])
+            except ValidationError:
+                errors.append(f"{column}: invalid email address")
+    if 'email' in cleaned:
+        cleaned['email'] = cleaned['email'].lower()
+    if cleaned.get('gender') and cleaned['gender'] not in GENDERS:
+        errors.append(f"gender: expected one of {', '.join(sorted(GENDERS))}")
+
+    for model, fields in ((Student, STUDENT_FIELDS), (Parent, PARENT_FIELDS)):
+        for field in fields:
+            max_length = model._meta.get_field(field).max_length
+            if max_length and len(str(cleaned.get(field, ''))) > max_length:
+                errors.append(f"{field}: longer than {max_length} characters")
+
+    if errors:
+        raise ValidationError(errors)
+    return cleaned
+
+
+def _taken_emails(emails):
+    """Of ``emails`` (lower-cased), those already used in any case as a username or email by a user, or by a student"""
+    def lowered(queryset, field):
+        return queryset.annotate(taken=Lower(field)).filter(taken__in=emails).values_list('taken')
+
+    taken = lowered(CustomUser.objects.all(), 'email').union(
+        lowered(CustomUser.objects.all(), 'username'),
+        lowered(Student.objects.all(), 'email'),
+    )
+    return {email for email, in taken}
+
+
+def _write_chunk(rows, password, executor, workers):
+    """Create the accounts, parents and students of validated ``(line, cleaned)`` rows"""
+    hashes = hashing.hash_passwords([password] * len(rows), workers, executor)
+    with transaction.atomic():
+        users = CustomUser.objects.bulk_create([
+            CustomUser(
+                username=cleaned['email'], email=cleaned['email'], password=hashed, is_student=True,
+                first_name=cleaned['first_name'][:30], last_name=cleaned['last_name'][:30]
+            ) for (_, cleaned), hashed in zip(rows, hashes)
+        ])
+        parents = Parent.objects.bulk_create([
+            Parent(**{field: cleaned[field] for field in PARENT_FIELDS}) for _, cleaned in rows
+        ])
+        students = Student.objects.bulk_create([
+            Student(user=user, parent=parent, **{field: cleaned[field] for field in STUDENT_FIELDS})
+            for (_, cleaned), user, parent in zip(rows, users, parents)
+        ])
+        # bulk_create skips the post_save receiver that indexes single students
+        index_students(students)
+    return students
+
+
+def _import_chunk(chunk, password, executor, workers, result):
+    valid = []
+    for line, row in chunk:
+        try:
+            valid.append((line, clean_row(row)))
+        except ValidationError as e:
+            result['errors'].append({'line': line, 'email': _text(row.get('email')), 'errors': e.messages})
+
+    taken = _taken_emails([cleaned['email'] for _, cleaned in valid])
+    rows = []
+    for line, cleaned in valid:
+        if cleaned['email'] in taken:
+            result['errors'].append({'line': line, 'email': cleaned['email'], 'errors': ["email: already in use"]})
+        else:
+            # Later duplicates within the file are caught here too
+            taken.add(cleaned['email'])
+            rows.append((line, cleaned))
+
+    if not rows:
+        return
+    try:
+        result['created'] += len(_write_chunk(rows, password, executor, workers))
+    except DatabaseError as e:
+        logger.exception("Student import chunk starting at line %d failed", rows[0][0])
+        result['errors'].extend(
+            {'line': line, 'email': cleaned['email'], 'errors': [f"not saved: {e}"]} for line, cleaned in rows
+        )
+
+
+def import_students(rows, password=DEFAULT_PASSWORD, chunk_size=CHUNK_SIZE, workers=None):
+    """
+    Import ``(line number, row dict)`` pairs, e.g. from read_rows(). Each
+    chunk is committed on its own, so a failing chunk only loses its rows.
+
+    ``workers`` is the size of the password hashing process pool (default:
+    PASSWORD_HASH_WORKERS); 1 hashes in this process. Returns a dict with
+    the number of rows read and students created, the per-row errors, the
+    elapsed seconds and the throughput in rows per second.
+    """
+    workers = hashing.worker_count(workers)
+    result = {'rows': 0, 'created': 0, 'errors': []}
+    started = time.perf_counter()
+
+    # One pool for the whole file instead of one per chunk
+    with hashing.hashing_pool(workers) as executor:
+        chunk = []
+        for line, row in rows:
+            result['rows'] += 1
+            chunk.append((line, row))
+            if len(chunk) == chunk_size:
+                _import_chunk(chunk, password, executor, workers, result)
+                chunk = []
+        if chunk:
+            _import_chunk(chunk, password, executor, workers, result)
+
+    if result['created']:
+        directory.forget_count()
+    result['seconds'] = time.perf_counter() - started
+    result['rows_per_second'] = result['rows'] / result['seconds'] if result['seconds'] else 0.0
+    result['errors'].sort(key=lambda error: error['line'])
+    logger.info(
+        "Imported %d of %d student row(s) in %.1fs (%.0f rows/s)",
+        result['created'], result['rows'], result['seconds'], result['rows_per_second']
+    )
+    return result
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from student.importer import CHUNK_SIZE, DEFAULT_PASSWORD, ImportFileError, import_students, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import students (with their accounts and parents) from a CSV or XLSX file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or XLSX file with one student per row")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Rows validated and written together")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Password hashing processes (default: PASSWORD_HASH_WORKERS)")
+        parser.add_argument('--password', default=DEFAULT_PASSWORD, help="Initial password of the new accounts")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as file:
+                result = import_students(
+                    read_rows(file, options['path']),
+                    password=options['password'],
+                    chunk_size=options['chunk_size'],
+                    workers=options['workers']
+                )
+        except (OSError, ImportFileError) as e:
+            raise CommandError(str(e))
+
+        for error in result['errors']:
+            self.stderr.write(f"Line {error['line']} ({error['email'] or 'no email'}): {'; '.join(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} of {result['rows']} student(s) in {result['seconds']:.1f}s "
+            f"({result['rows_per_second']:.0f} rows/s)"
+        ))
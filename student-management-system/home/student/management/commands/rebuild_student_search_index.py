@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from student.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the student search index from the student and user tables"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            indexed = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} student(s)"))
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+from school import search
+
+FTS_TABLE = 'student_search_fts'
+
+
+def install_index(apps, schema_editor):
+    search.install_index(schema_editor, 'student_studentsearchindex', 'document', 'student_id', FTS_TABLE)
+
+
+def uninstall_index(apps, schema_editor):
+    search.uninstall_index(schema_editor, FTS_TABLE)
+
+
+def backfill_index(apps, schema_editor):
+    Student = apps.get_model('student', 'Student')
+    StudentSearchIndex = apps.get_model('student', 'StudentSearchIndex')
+
+    batch = []
+    for student in Student.objects.select_related('user').iterator(chunk_size=2000):
+        user = student.user
+        batch.append(StudentSearchIndex(student=student, document=search.build_document(
+            student.first_name, student.last_name, student.student_id, student.email,
+            user.email if user else '', user.first_name if user else '', user.last_name if user else '',
+        )))
+        if len(batch) == 2000:
+            StudentSearchIndex.objects.bulk_create(batch)
+            batch = []
+    StudentSearchIndex.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0006_student_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSearchIndex',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_index', serialize=False, to='student.student')),
+                ('document', models.TextField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StudentSearchMatch',
+            fields=[
+                ('student', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_match', serialize=False, to='student.student')),
+                ('document', search.FTSDocumentField()),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'student_search_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(install_index, uninstall_index),
+        migrations.RunPython(backfill_index, migrations.RunPython.noop),
+    ]
@@ -1,15 +1,14 @@
 from django.db import models
-from django.utils.text import slugify
-import random
-import string
+from school.search import FTSDocumentField
+from school.identifiers import IdentifierAllocator
+from school.lifecycle import PreparedModel, assign_identifiers, assign_slugs
+
+STUDENT_IDS = IdentifierAllocator('student', 'Student-{number:06d}', 'student.Student', 'student_id')
+
 
 def generate_student_id():
     """Generate a unique student ID in the format Student-XXXXXX."""
-    while True:
-        random_digits = ''.join(random.choices(string.digits, k=6))
-        student_id = f"Student-{random_digits}"
-        if not Student.objects.filter(student_id=student_id).exists():
-            return student_id
+    return STUDENT_IDS.next()
 
 class Parent(models.Model):
     father_name = models.CharField(max_length=100)
@@ -26,11 +25,11 @@ class Parent(models.Model):
     def __str__(self):
         return f"{self.father_name} & {self.mother_name}"
 
-class Student(models.Model):
+class Student(PreparedModel):
     user = models.ForeignKey('home_auth.CustomUser', on_delete=models.SET_NULL, null=True, blank=True)
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
-    student_id = models.CharField(max_length=20, unique=True, default=generate_student_id)
+    student_id = models.CharField(max_length=20, unique=True, blank=True)
     gender = models.CharField(max_length=10, choices=[('Male', 'Male'), ('Female', 'Female'), ('Others', 'Others')])
     date_of_birth = models.DateField()
     student_class = models.CharField(max_length=50)
@@ -43,15 +42,44 @@ class Student(models.Model):
     email = models.EmailField(max_length=255, unique=True,default="unknown@example.com")  # New field for student email
     parent = models.OneToOneField(Parent, on_delete=models.CASCADE)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(f"{self.first_name}-{self.last_name}-{self.student_id}")
-        super(Student, self).save(*args, **kwargs)
+    @classmethod
+    def prepare_for_insert(cls, objs):
+        assign_identifiers(objs, 'student_id', STUDENT_IDS)
+        assign_slugs(objs, lambda student: f"{student.first_name}-{student.last_name}-{student.student_id}")
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.student_id})"
     
 
     def get_full_name(self):
-        return f"{self.first_name} {self.last_name}"
\ No newline at end of file
+        return f"{self.first_name} {self.last_name}"
+
+class StudentSearchIndex(models.Model):
+    """
+    Lowercased search document of a student (names, IDs and emails), indexed
+    by student.search. Kept in sync by the signals in student/signals.py.
+    """
+    student = models.OneToOneField(Student, on_delete=models.CASCADE, primary_key=True, related_name='search_index')
+    document = models.TextField()
+
+    def __str__(self):
+        return self.document
+
+
+class StudentSearchMatch(models.Model):
+    """
+    Read-only mapping of the SQLite FTS5 table that mirrors
+    StudentSearchIndex (created by migration, synced by triggers).
+    """
+    student = models.OneToOneField(
+        Student, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid',
+        db_constraint=False, related_name='search_match'
+    )
+    document = FTSDocumentField()
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'student_search_fts'
@@ -0,0 +1,57 @@
+# student/search.py
+from school import search
+from .models import Student, StudentSearchIndex
+
+FTS_TABLE = 'student_search_fts'
+BATCH_SIZE = 500
+
+
+def student_document(student):
+    user = student.user
+    return search.build_document(
+        student.first_name,
+        student.last_name,
+        student.student_id,
+        student.email,
+        user.email if user else '',
+        user.first_name if user else '',
+        user.last_name if user else '',
+    )
+
+
+def index_students(students):
+    """Write (or refresh) the search documents of the given students"""
+    StudentSearchIndex.objects.bulk_create(
+        [StudentSearchIndex(student=student, document=student_document(student)) for student in students],
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['student'],
+        update_fields=['document']
+    )
+
+
+def rebuild_index():
+    """Reindex every student and return how many were indexed"""
+    StudentSearchIndex.objects.all().delete()
+    indexed = 0
+    batch = []
+    for student in Student.objects.select_related('user').iterator(chunk_size=2000):
+        batch.append(student)
+        if len(batch) == 2000:
+            index_students(batch)
+            indexed += len(batch)
+            batch = []
+    index_students(batch)
+    search.rebuild_fts(FTS_TABLE)
+    return indexed + len(batch)
+
+
+def search_students(query, queryset=None):
+    """
+    Students matching every term of ``query`` as a substring of their names,
+    student ID or emails, best match first. Pass ``queryset`` to search
+    within an already filtered set of students.
+    """
+    if queryset is None:
+        queryset = Student.objects.all()
+    return search.search(queryset, query, 'search_index__document', fts_relation='search_match')
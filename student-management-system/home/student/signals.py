@@ -0,0 +1,39 @@
+# student/signals.py
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Student
+from .search import index_students
+from . import directory
+
+# Fields of the user account that end up in the student search document
+INDEXED_USER_FIELDS = {'email', 'first_name', 'last_name'}
+# ... plus the ones that change how the student is listed (see Student.updated_at)
+LISTED_USER_FIELDS = INDEXED_USER_FIELDS | {'is_active'}
+
+
+@receiver(post_save, sender=Student)
+def index_student(sender, instance, created, **kwargs):
+    index_students([instance])
+    if created:
+        directory.forget_count()
+
+
+@receiver(post_delete, sender=Student)
+def uncount_student(sender, instance, **kwargs):
+    directory.forget_count()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def index_user_students(sender, instance, created, update_fields=None, **kwargs):
+    # Logins only touch last_login
+    if created or (update_fields is not None and not LISTED_USER_FIELDS.intersection(update_fields)):
+        return
+    # Roster endpoints read the user's email and active flag; let ``since`` clients see the change
+    Student.objects.filter(user=instance).update(updated_at=timezone.now())
+    students = list(Student.objects.filter(user=instance))
+    for student in students:
+        student.user = instance
+    if students:
+        index_students(students)
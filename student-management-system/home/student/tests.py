@@ -1,10 +1,19 @@
-from django.test import TestCase, Client
+from io import BytesIO, StringIO
+import os
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.contrib import messages
-from student.models import Student, Parent
+from student.models import Student, Parent, StudentSearchIndex
+from student.search import index_students, search_students
+from student import directory, importer
 from home_auth.models import CustomUser
 from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 class StudentViewsTestCase(TestCase):
     def setUp(self):
@@ -72,4 +81,233 @@ class StudentViewsTestCase(TestCase):
         # Verify 10 CustomUsers, Students, and Parents were created
         self.assertEqual(self.user_model.objects.filter(is_student=True).count(), 10)
         self.assertEqual(Student.objects.count(), 10)
-        self.assertEqual(Parent.objects.count(), 10)
\ No newline at end of file
+        self.assertEqual(Parent.objects.count(), 10)
+
+class StudentSearchTestCase(TestCase):
+    def create_student(self, first_name, last_name, email, student_id):
+        user = get_user_model().objects.create_user(username=email, email=email, password='student@1234', is_student=True)
+        parent = Parent.objects.create(
+            father_name='Father', father_mobile='9876543210', father_email='father@example.com',
+            mother_name='Mother', mother_mobile='8765432109', mother_email='mother@example.com',
+            present_address='123 Street', permanent_address='456 Avenue'
+        )
+        return Student.objects.create(
+            user=user, parent=parent, first_name=first_name, last_name=last_name, student_id=student_id,
+            email=email, gender='Female', date_of_birth='2000-01-01', student_class='10', religion='Unknown',
+            joining_date='2025-08-01', mobile_number='1234567890', admission_number='ADM0001', section='A'
+        )
+
+    def setUp(self):
+        self.ada = self.create_student('Ada', 'Lovelace', 'ada@example.com', 'Student-000001')
+        self.grace = self.create_student('Grace', 'Hopper', 'grace@navy.example.com', 'Student-000002')
+
+    def ids(self, query):
+        return [student.id for student in search_students(query)]
+
+    def test_matches_substrings_of_names_ids_and_emails(self):
+        self.assertEqual(self.ids('LOVE'), [self.ada.id])
+        self.assertEqual(self.ids('navy'), [self.grace.id])
+        self.assertEqual(self.ids('000002'), [self.grace.id])
+        self.assertEqual(self.ids('ada love'), [self.ada.id])
+        self.assertEqual(self.ids('ada hopper'), [])
+        # Terms shorter than a trigram still filter
+        self.assertEqual(self.ids('gr'), [self.grace.id])
+        self.assertEqual(sorted(self.ids('example')), [self.ada.id, self.grace.id])
+
+    def test_ranks_better_matches_first(self):
+        hopkins = self.create_student('Hop', 'Hopkins', 'hopkins@example.com', 'Student-000003')
+        self.assertEqual(self.ids('hopkins')[0], hopkins.id)
+        self.assertEqual(self.ids('hop'), [hopkins.id, self.grace.id])
+
+    def test_index_follows_student_and_user_changes(self):
+        self.ada.last_name = 'Byron'
+        self.ada.save()
+        self.assertEqual(self.ids('byron'), [self.ada.id])
+        self.assertEqual(self.ids('lovelace'), [])
+
+        self.grace.user.email = 'amazing.grace@example.com'
+        self.grace.user.save()
+        self.assertEqual(self.ids('amazing'), [self.grace.id])
+
+        self.grace.delete()
+        self.assertEqual(self.ids('grace'), [])
+
+    def test_rebuild_command(self):
+        StudentSearchIndex.objects.all().delete()
+        self.assertEqual(self.ids('ada'), [])
+
+        out = StringIO()
+        call_command('rebuild_student_search_index', stdout=out)
+
+        self.assertIn('Indexed 2 student(s)', out.getvalue())
+        self.assertEqual(self.ids('ada'), [self.ada.id])
+
+    def test_student_list_uses_search(self):
+        admin = get_user_model().objects.create_user(
+            username='admin@example.com', email='admin@example.com', password='adminpass123', is_admin=True
+        )
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse('students:student_list'), {'q': 'grace hop'})
+
+        self.assertEqual([student.id for student in response.context['page_obj']], [self.grace.id])
+
+
+# Fast hashes keep the tests quick; forked pool workers inherit the override
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class StudentImportTestCase(TestCase):
+    HEADER = ','.join(importer.REQUIRED_COLUMNS + importer.OPTIONAL_COLUMNS)
+
+    def row(self, i, **overrides):
+        values = {
+            'first_name': f'Import{i}', 'last_name': f'Last{i}', 'email': f'import{i}@example.com',
+            'gender': 'Female', 'date_of_birth': '2001-02-03', 'student_class': '10', 'religion': 'Unknown',
+            'joining_date': '2025-08-01', 'mobile_number': '1234567890', 'admission_number': f'ADM{i:05d}',
+            'section': 'A', 'father_name': f'Father{i}', 'father_mobile': '9876543210',
+            'father_email': f'father{i}@example.com', 'mother_name': f'Mother{i}', 'mother_mobile': '8765432109',
+            'mother_email': f'mother{i}@example.com', 'present_address': '1 Street', 'permanent_address': '2 Avenue',
+            'father_occupation': '', 'mother_occupation': 'Teacher',
+        }
+        values.update(overrides)
+        return ','.join(values[column] for column in importer.REQUIRED_COLUMNS + importer.OPTIONAL_COLUMNS)
+
+    def csv_file(self, rows):
+        return BytesIO('\n'.join([self.HEADER] + rows).encode())
+
+    def test_imports_valid_rows_and_reports_the_rest(self):
+        get_user_model().objects.create_user(username='Taken@Example.com', email='Taken@Example.com', password='x')
+        rows = [self.row(i) for i in range(5)] + [
+            self.row(5, email='taken@example.com'),
+            self.row(6, email='import0@example.com'),
+            self.row(7, date_of_birth='03/02/2001', gender='Robot'),
+        ]
+
+        result = importer.import_students(importer.read_rows(self.csv_file(rows), 'intake.csv'), chunk_size=3, workers=1)
+
+        self.assertEqual((result['rows'], result['created']), (8, 5))
+        self.assertEqual([(error['line'], error['email']) for error in result['errors']], [
+            (7, 'taken@example.com'), (8, 'import0@example.com'), (9, 'import7@example.com'),
+        ])
+        self.assertEqual(len(result['errors'][2]['errors']), 2)
+        self.assertGreater(result['rows_per_second'], 0)
+
+        student = Student.objects.select_related('user', 'parent').get(email='import3@example.com')
+        self.assertTrue(student.user.is_student)
+        self.assertTrue(student.user.check_password(importer.DEFAULT_PASSWORD))
+        self.assertEqual(student.parent.mother_occupation, 'Teacher')
+        self.assertTrue(student.student_id and student.slug)
+        self.assertEqual([s.id for s in search_students('import3')], [student.id])
+
+    def test_chunk_query_count_is_constant(self):
+        # The first import seeds the student ID sequence
+        importer.import_students(importer.read_rows(self.csv_file([self.row(0)]), 'intake.csv'), workers=1)
+        rows = [self.row(i) for i in range(1, 41)]
+        # Email lookup, savepoint, users, parents, ID block (update + select), students, search index, release
+        with self.assertNumQueries(9):
+            importer.import_students(importer.read_rows(self.csv_file(rows), 'intake.csv'), chunk_size=40, workers=1)
+        self.assertEqual(Student.objects.count(), 41)
+
+    def test_hashes_in_a_process_pool(self):
+        rows = [self.row(i) for i in range(4)]
+        result = importer.import_students(importer.read_rows(self.csv_file(rows), 'intake.csv'), workers=2)
+
+        self.assertEqual(result['created'], 4)
+        hashes = set(get_user_model().objects.filter(is_student=True).values_list('password', flat=True))
+        self.assertEqual(len(hashes), 4)
+        self.assertTrue(get_user_model().objects.get(email='import2@example.com').check_password('student@1234'))
+
+    def test_rejects_missing_columns_and_unknown_types(self):
+        with self.assertRaises(importer.ImportFileError):
+            list(importer.read_rows(BytesIO(b'first_name,last_name\nA,B'), 'intake.csv'))
+        with self.assertRaises(importer.ImportFileError):
+            importer.read_rows(BytesIO(b''), 'intake.txt')
+
+    def test_rejects_files_that_are_not_utf8(self):
+        latin1 = '\n'.join([self.HEADER, self.row(0, first_name='José')]).encode('latin-1')
+        with self.assertRaises(importer.ImportFileError):
+            importer.import_students(importer.read_rows(BytesIO(latin1), 'intake.csv'), workers=1)
+
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as file:
+            file.write(latin1)
+        self.addCleanup(os.remove, file.name)
+        with self.assertRaisesMessage(CommandError, 'UTF-8'):
+            call_command('import_students', file.name, '--workers', '1', stdout=StringIO())
+
+    def test_command_and_upload_view(self):
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as file:
+            file.write(self.csv_file([self.row(0), self.row(1, email='bad')]).getvalue())
+        self.addCleanup(os.remove, file.name)
+        out, err = StringIO(), StringIO()
+        call_command('import_students', file.name, '--workers', '1', stdout=out, stderr=err)
+        self.assertIn('Imported 1 of 2 student(s)', out.getvalue())
+        self.assertIn('Line 3 (bad): email: invalid email address', err.getvalue())
+
+        admin = get_user_model().objects.create_user(
+            username='admin@example.com', email='admin@example.com', password='adminpass123', is_admin=True
+        )
+        self.client.force_login(admin)
+        upload = SimpleUploadedFile('intake.csv', self.csv_file([self.row(2), self.row(0)]).getvalue())
+        response = self.client.post(reverse('students:import_students'), {'file': upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['result']['created'], 1)
+        self.assertContains(response, 'email: already in use')
+        self.assertTrue(Student.objects.filter(email='import2@example.com').exists())
+
+
+class StudentDirectoryTestCase(TestCase):
+    def setUp(self):
+        parents = Parent.objects.bulk_create([
+            Parent(
+                father_name=f'Father{i}', father_mobile='9876543210', father_email=f'father{i}@example.com',
+                mother_name=f'Mother{i}', mother_mobile='8765432109', mother_email=f'mother{i}@example.com',
+                present_address='123 Street', permanent_address='456 Avenue'
+            ) for i in range(60)
+        ])
+        self.students = Student.objects.bulk_create([
+            Student(
+                parent=parent, first_name=f'Student{i}', last_name=f'Last{i}', email=f'student{i}@example.com',
+                gender='Male', date_of_birth='2000-01-01', student_class='10', religion='Unknown',
+                joining_date='2025-08-01', mobile_number='1234567890', admission_number=f'ADM{i:04d}', section='A'
+            ) for i, parent in enumerate(parents)
+        ])
+        index_students(self.students)
+        directory.forget_count()
+
+    def test_pages_are_one_narrow_query(self):
+        first = directory.directory_page()
+        self.assertEqual([student.id for student in first], [student.id for student in self.students[:25]])
+
+        with CaptureQueriesContext(connection) as queries:
+            last = directory.directory_page(after=directory.directory_page(after=first.next_cursor).next_cursor)
+            self.assertEqual([student.last_name for student in last], [f'Last{i}' for i in range(50, 60)])
+        self.assertEqual(len(queries), 2)
+        self.assertFalse(last.has_next())
+        sql = queries[-1]['sql']
+        self.assertNotIn('student_parent', sql)
+        self.assertNotIn('permanent_address', sql)
+
+    def test_count_estimate_is_cached_until_students_change(self):
+        self.assertEqual(directory.count_estimate(), 60)
+        with self.assertNumQueries(0):
+            self.assertEqual(directory.count_estimate(), 60)
+        Student.objects.get(id=self.students[0].id).delete()
+        self.assertEqual(directory.count_estimate(), 59)
+
+    def test_view_pages_and_searches(self):
+        admin = get_user_model().objects.create_user(
+            username='admin@example.com', email='admin@example.com', password='adminpass123', is_admin=True
+        )
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse('students:student_list'))
+        self.assertEqual(len(response.context['page_obj']), 25)
+        self.assertContains(response, 'About 60 students')
+        response = self.client.get(reverse('students:student_list'), {'after': response.context['page_obj'].next_cursor})
+        self.assertEqual(list(response.context['page_obj'])[0].first_name, 'Student25')
+
+        response = self.client.get(reverse('students:student_list'), {'q': 'student42@'})
+        self.assertEqual([student.id for student in response.context['page_obj']], [self.students[42].id])
+        self.assertIsNone(response.context['student_count'])
+        response = self.client.get(reverse('students:student_list'), {'after': 'garbage'})
+        self.assertEqual(len(response.context['page_obj']), 25)
@@ -1,8 +1,10 @@
 from django.http import HttpResponseForbidden
 from django.shortcuts import render, get_object_or_404, redirect
 from .models import Student, Parent
+from . import directory, importer
+from school.pagination import InvalidCursor
 from django.contrib import messages
-from school.models import Notification
+from school.notifications import create_notification
 from django.contrib.auth.decorators import login_required, user_passes_test
 from home_auth.models import CustomUser
 from django.utils.crypto import get_random_string
@@ -13,9 +15,6 @@ from datetime import datetime
 def is_admin(user):
     return user.is_authenticated and user.is_admin
 
-def create_notification(user, message):
-    if user and user.is_authenticated:
-        Notification.objects.create(user=user, message=message)
 
 @login_required
 @user_passes_test(is_admin, login_url='index')
@@ -122,6 +121,32 @@ def add_student(request):
 
     return render(request, "students/add-student.html")
 
+@login_required
+@user_passes_test(is_admin, login_url='index')
+def import_students(request):
+    result = None
+    if request.method == "POST":
+        upload = request.FILES.get('file')
+        if not upload:
+            messages.error(request, "Choose a CSV or XLSX file to import.")
+        else:
+            try:
+                result = importer.import_students(importer.read_rows(upload, upload.name))
+            except importer.ImportFileError as e:
+                messages.error(request, str(e))
+            else:
+                create_notification(request.user, f"Imported {result['created']} student(s) from {upload.name}")
+                messages.success(
+                    request,
+                    f"Imported {result['created']} of {result['rows']} student(s) in {result['seconds']:.1f}s "
+                    f"({result['rows_per_second']:.0f} rows/s)"
+                )
+
+    return render(request, "students/import-students.html", {
+        'result': result,
+        'columns': importer.REQUIRED_COLUMNS + importer.OPTIONAL_COLUMNS,
+    })
+
 @login_required
 @user_passes_test(is_admin, login_url='index')
 def student_list(request):
@@ -131,29 +156,21 @@ def student_list(request):
     
     # Get search query from GET parameters
     query = request.GET.get('q', '').strip()
-    student_list = Student.objects.select_related('parent').all()
-    
-    if query:
-        # Split query into parts for first and last name
-        query_parts = query.split()
-        if len(query_parts) >= 2:
-            # Assume first part is for first_name, second for last_name
-            first_name_query = query_parts[0]
-            last_name_query = query_parts[1]
-            student_list = student_list.filter(
-                Q(first_name__icontains=first_name_query) &
-                Q(last_name__icontains=last_name_query)
-            )
-        else:
-            # Single query searches student_id or email
-            student_list = student_list.filter(
-                Q(student_id__icontains=query) |
-                Q(email__icontains=query)
-            )
-        if not student_list:
-            messages.info(request, f"No students found matching '{query}'.")
+
+    # Keyset pagination: ?after=/?before= cursors instead of OFFSET pages;
+    # every word of a query must match a name, student ID or email, best matches first
+    try:
+        page_obj = directory.directory_page(query, after=request.GET.get('after'), before=request.GET.get('before'))
+    except InvalidCursor:
+        page_obj = directory.directory_page(query)
+    if query and not page_obj.object_list:
+        messages.info(request, f"No students found matching '{query}'.")
     
-    context = {'student_list': student_list}
+    context = {
+        'page_obj': page_obj,
+        'search_query': query,
+        'student_count': None if query else directory.count_estimate(),
+    }
     return render(request, "students/students.html", context)
 
 @login_required
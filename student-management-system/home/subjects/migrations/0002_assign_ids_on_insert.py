@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subjects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='subject',
+            name='subject_id',
+            field=models.CharField(blank=True, max_length=20, unique=True),
+        ),
+    ]
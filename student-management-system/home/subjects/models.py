@@ -1,18 +1,16 @@
 from django.db import models
-from django.utils.text import slugify
-import random
-import string
+from school.identifiers import IdentifierAllocator
+from school.lifecycle import PreparedModel, assign_identifiers, assign_slugs
+
+SUBJECT_IDS = IdentifierAllocator('subject', 'Subject-{number:05d}', 'subjects.Subject', 'subject_id')
+
 
 def generate_subject_id():
     """Generate a unique subject ID in the format Subject-XXXXX."""
-    while True:
-        random_digits = ''.join(random.choices(string.digits, k=5))
-        subject_id = f"Subject-{random_digits}"
-        if not Subject.objects.filter(subject_id=subject_id).exists():
-            return subject_id
+    return SUBJECT_IDS.next()
 
-class Subject(models.Model):
-    subject_id = models.CharField(max_length=20, unique=True, default=generate_subject_id)
+class Subject(PreparedModel):
+    subject_id = models.CharField(max_length=20, unique=True, blank=True)
     subject_name = models.CharField(max_length=200)
     class_name = models.CharField(max_length=50)
     description = models.TextField(blank=True, null=True)
@@ -22,10 +20,10 @@ class Subject(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(f"{self.subject_name}-{self.subject_id}")
-        super(Subject, self).save(*args, **kwargs)
+    @classmethod
+    def prepare_for_insert(cls, objs):
+        assign_identifiers(objs, 'subject_id', SUBJECT_IDS)
+        assign_slugs(objs, lambda subject: f"{subject.subject_name}-{subject.subject_id}")
     
     def __str__(self):
         return f"{self.subject_name} ({self.class_name})"
\ No newline at end of file
@@ -2,16 +2,13 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.http import HttpResponseForbidden
 from .models import Subject
-from school.models import Notification
+from school.notifications import create_notification
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.utils.dateparse import parse_date
 
 def is_admin(user):
     return user.is_authenticated and user.is_admin
 
-def create_notification(user, message):
-    if user.is_authenticated:
-        Notification.objects.create(user=user, message=message)
 
 @login_required
 @user_passes_test(is_admin, login_url='index')
@@ -20,10 +17,8 @@ def subject_list(request):
         messages.error(request, 'Access denied. Admin access required')
         return redirect('index')
     subjects = Subject.objects.all()
-    unread_notification = request.user.notification_set.filter(is_read=False) if request.user.is_authenticated else []
     context = {
         'subjects': subjects,
-        'unread_notification': unread_notification
     }
     return render(request, "subjects/subjects.html", context)
 
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class TeachersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'teachers'
+
+    def ready(self):
+        from .directory import invalidate_counts
+
+        # Writes that move the directory totals; the department filter also follows assignments
+        for model in ('teachers.Teacher', 'semesters.SemesterSubject', 'department.Department'):
+            post_save.connect(invalidate_counts, sender=model, dispatch_uid=f'teacher_directory_save_{model}')
+            post_delete.connect(invalidate_counts, sender=model, dispatch_uid=f'teacher_directory_delete_{model}')
@@ -0,0 +1,102 @@
+# teachers/directory.py
+"""
+The teacher directory (teacher_list and its JSON variant).
+
+Like the student directory, pages are keyset paginated over the primary key
+and select only the listed columns, so address blocks, login details and
+timestamps never leave the database. Totals are cached per filter and
+dropped whenever teachers, departments or subject assignments change.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from school.pagination import KeysetPaginator
+from .models import Teacher
+
+PER_PAGE = 25
+MAX_PER_PAGE = 100
+# Columns rendered by templates/teachers/teachers.html and teacher_json()
+LIST_FIELDS = (
+    'id', 'teacher_id', 'slug', 'first_name', 'last_name', 'qualification', 'gender', 'mobile', 'address',
+    'email', 'teacher_image', 'is_active',
+)
+
+VERSION_KEY = 'teacher_directory:version'
+# Backstop for writes that skip the model signals (bulk_create, queryset.update)
+COUNT_TTL = 300
+
+
+def filtered_teachers(department=None, active=None):
+    """
+    Teachers, optionally only those of the ``department`` pk (its head, or
+    teaching a subject in one of its semesters) and/or with the given active
+    flag.
+    """
+    from department.models import Department
+    from semesters.models import SemesterSubject
+
+    teachers = Teacher.objects.all()
+    if department is not None:
+        teachers = teachers.filter(
+            Exists(Department.objects.filter(pk=department, head_of_department=OuterRef('pk')))
+            | Exists(SemesterSubject.objects.filter(teacher=OuterRef('pk'), semester__department=department))
+        )
+    if active is not None:
+        teachers = teachers.filter(is_active=active)
+    return teachers
+
+
+def parse_filters(params):
+    """(department pk, active flag) from request parameters; raises ValueError on bad values"""
+    department = params.get('department') or None
+    if department is not None:
+        department = int(department)
+    active = {'': None, '1': True, 'true': True, '0': False, 'false': False}[params.get('active', '').lower()]
+    return department, active
+
+
+def directory_page(department=None, active=None, after=None, before=None, per_page=PER_PAGE):
+    """One page of filtered teachers, projected to LIST_FIELDS"""
+    teachers = filtered_teachers(department, active).only(*LIST_FIELDS)
+    return KeysetPaginator(teachers, per_page, ('id',)).get_page(after=after, before=before)
+
+
+def cache_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(VERSION_KEY, version, None)
+    return version
+
+
+def count(department=None, active=None):
+    """Number of filtered teachers, cached until the teachers change"""
+    key = f'teacher_directory:{cache_version()}:count:{department}:{active}'
+    return cache.get_or_set(key, lambda: filtered_teachers(department, active).count(), COUNT_TTL)
+
+
+def forget_counts():
+    """Drop every cached total"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Version key evicted; any new value orphans the old entries
+        cache.set(VERSION_KEY, int(timezone.now().timestamp()), None)
+
+
+def invalidate_counts(**kwargs):
+    """Signal receiver: drop the cached totals once the write is committed"""
+    transaction.on_commit(forget_counts)
+
+
+def teacher_json(teacher):
+    """A teacher as the semesters teacher picker expects it"""
+    return {
+        'id': teacher.id,
+        'teacher_id': teacher.teacher_id,
+        'email': teacher.email,
+        'name': teacher.get_full_name(),
+        'qualification': teacher.qualification or 'N/A',
+        'is_active': teacher.is_active,
+    }
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teachers', '0003_alter_teacher_teacher_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='teacher',
+            name='teacher_id',
+            field=models.CharField(blank=True, max_length=20, unique=True),
+        ),
+    ]
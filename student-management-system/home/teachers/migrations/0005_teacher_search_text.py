@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+from school import search
+
+FTS_TABLE = 'teacher_search_fts'
+
+
+def backfill_search_text(apps, schema_editor):
+    Teacher = apps.get_model('teachers', 'Teacher')
+
+    batch = []
+    for teacher in Teacher.objects.only('first_name', 'last_name', 'email', 'teacher_id').iterator(chunk_size=2000):
+        teacher.search_text = search.build_document(teacher.first_name, teacher.last_name, teacher.email, teacher.teacher_id)
+        batch.append(teacher)
+        if len(batch) == 2000:
+            Teacher.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    Teacher.objects.bulk_update(batch, ['search_text'])
+
+
+def install_index(apps, schema_editor):
+    search.install_index(schema_editor, 'teachers_teacher', 'search_text', 'id', FTS_TABLE)
+
+
+def uninstall_index(apps, schema_editor):
+    search.uninstall_index(schema_editor, FTS_TABLE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teachers', '0004_assign_ids_on_insert'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teacher',
+            name='search_text',
+            field=models.TextField(db_index=True, default='', editable=False),
+        ),
+        migrations.CreateModel(
+            name='TeacherSearchMatch',
+            fields=[
+                ('teacher', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_match', serialize=False, to='teachers.teacher')),
+                ('document', search.FTSDocumentField(db_column='search_text')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'teacher_search_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        # Installed after the backfill so its rebuild indexes every document
+        migrations.RunPython(install_index, uninstall_index),
+    ]
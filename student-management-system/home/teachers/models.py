@@ -1,25 +1,24 @@
 from django.db import models
-from django.utils.text import slugify
 from django.conf import settings
-import random
-import string
+from school.identifiers import IdentifierAllocator
+from school.lifecycle import PreparedModel, assign_identifiers, assign_slugs
+from school.search import FTSDocumentField, build_document
+
+TEACHER_IDS = IdentifierAllocator('teacher', 'Teacher-{number:05d}', 'teachers.Teacher', 'teacher_id')
+
 
 def generate_teacher_id():
     """Generate a unique teacher ID in the format Teacher-XXXXX."""
-    while True:
-        random_digits = ''.join(random.choices(string.digits, k=5))
-        teacher_id = f"Teacher-{random_digits}"
-        if not Teacher.objects.filter(teacher_id=teacher_id).exists():
-            return teacher_id
+    return TEACHER_IDS.next()
 
-class Teacher(models.Model):
+class Teacher(PreparedModel):
     GENDER_CHOICES = [
         ('Male', 'Male'),
         ('Female', 'Female'),
         ('Others', 'Others'),
     ]
     
-    teacher_id = models.CharField(max_length=20, unique=True, default=generate_teacher_id)
+    teacher_id = models.CharField(max_length=20, unique=True, blank=True)
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
     gender = models.CharField(max_length=10, choices=GENDER_CHOICES)
@@ -46,14 +45,49 @@ class Teacher(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
-    
+    # Lowercased names, email and ID, searched by teachers/search.py
+    search_text = models.TextField(default='', editable=False, db_index=True)
+
+    SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'teacher_id')
+
+    @classmethod
+    def prepare_for_insert(cls, objs):
+        assign_identifiers(objs, 'teacher_id', TEACHER_IDS)
+        assign_slugs(objs, lambda teacher: f"{teacher.first_name}-{teacher.last_name}-{teacher.teacher_id}")
+        for teacher in objs:
+            teacher.search_text = teacher.build_search_text()
+
+    def build_search_text(self):
+        return build_document(*(getattr(self, field) for field in self.SEARCH_FIELDS))
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(f"{self.first_name}-{self.last_name}-{self.teacher_id}")
-        super(Teacher, self).save(*args, **kwargs)
+        # Inserts get their document from prepare_for_insert, once the ID is assigned
+        if not self._state.adding:
+            self.search_text = self.build_search_text()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and set(update_fields) & set(self.SEARCH_FIELDS):
+                kwargs['update_fields'] = {*update_fields, 'search_text'}
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.teacher_id})"
 
     def get_full_name(self):
-        return f"{self.first_name} {self.last_name}"
\ No newline at end of file
+        return f"{self.first_name} {self.last_name}"
+
+
+class TeacherSearchMatch(models.Model):
+    """
+    Read-only mapping of the SQLite FTS5 table that mirrors
+    Teacher.search_text (created by migration, synced by triggers).
+    """
+    teacher = models.OneToOneField(
+        Teacher, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid',
+        db_constraint=False, related_name='search_match'
+    )
+    document = FTSDocumentField(db_column='search_text')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'teacher_search_fts'
@@ -0,0 +1,59 @@
+# teachers/search.py
+"""
+Autocomplete search over Teacher.search_text.
+
+Queries with a term of three or more characters go through the trigram
+index of school.search; exact email hits rank first, then name prefix hits,
+then the rest by index rank. Shorter queries are too short for trigrams;
+each of their terms must start a word of the document (names, email or
+ID), and hits come in document order so an index walk can stop at LIMIT.
+"""
+from django.db import connection
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from school import search
+from .models import Teacher
+
+
+def normalize(query):
+    """The query as the search and its cache key see it"""
+    return ' '.join(search.search_terms(query))
+
+
+def _prefix(prefix):
+    if connection.vendor == 'sqlite':
+        # SQLite's LIKE cannot use the index; a range over the lowercased document can
+        return Q(search_text__gte=prefix, search_text__lt=prefix[:-1] + chr(ord(prefix[-1]) + 1))
+    return Q(search_text__startswith=prefix)
+
+
+def search_teachers(query, queryset=None, exclude_subject=None):
+    """
+    Teachers matching every term of ``query``, best match first. Pass
+    ``exclude_subject`` (a SemesterSubject pk) to leave out the teacher
+    currently assigned to it, in the same query.
+    """
+    from semesters.models import SemesterSubject
+
+    if queryset is None:
+        queryset = Teacher.objects.all()
+    query = normalize(query)
+    if not query:
+        return queryset.none()
+
+    if exclude_subject is not None:
+        queryset = queryset.exclude(
+            Exists(SemesterSubject.objects.filter(pk=exclude_subject, teacher=OuterRef('pk')))
+        )
+    terms = query.split()
+    if all(len(term) < search.MIN_TRIGRAM_LENGTH for term in terms):
+        for term in terms:
+            # Words of the document are separated by single spaces
+            queryset = queryset.filter(_prefix(term) | Q(search_text__contains=f' {term}'))
+        return queryset.order_by('search_text', 'pk')
+
+    queryset = search.search(queryset, query, 'search_text', fts_relation='search_match')
+    return queryset.annotate(search_priority=Case(
+        When(email__iexact=query, then=Value(0)),
+        When(Q(search_text__startswith=query) | Q(last_name__istartswith=query), then=Value(1)),
+        default=Value(2),
+    )).order_by('search_priority', *queryset.query.order_by)
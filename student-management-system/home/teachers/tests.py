@@ -1,3 +1,155 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from department.models import Department
+from semesters.models import Semester, SemesterSubject
+from subjects.models import Subject
+from teachers import directory, search
+from teachers.models import Teacher
 
-# Create your tests here.
+
+class TeacherDirectoryTestCase(TestCase):
+    def setUp(self):
+        self.teachers = Teacher.objects.bulk_create([
+            Teacher(
+                first_name=f'Teacher{i}', last_name=f'Last{i}', gender='Male', date_of_birth='1980-01-01',
+                mobile='1234567890', joining_date='2020-01-01', qualification='MSc',
+                username=f'teacher{i}', email=f'teacher{i}@example.com', address='123 Street',
+                city='City', state='State', zip_code='12345', country='Country', is_active=i % 10 != 0
+            ) for i in range(40)
+        ])
+        self.department = Department.objects.create(
+            department_name='Computer Science', department_start_date='2020-01-01',
+            head_of_department=self.teachers[1]
+        )
+        semester = Semester.objects.create(
+            semester_name='Fall', academic_year='2025-2026', department=self.department,
+            start_date='2025-09-01', end_date='2025-12-20'
+        )
+        SemesterSubject.objects.create(
+            semester=semester, subject=Subject.objects.create(subject_name='Algorithms', class_name='10'),
+            teacher=self.teachers[2]
+        )
+        self.admin = get_user_model().objects.create_user(
+            username='admin@example.com', email='admin@example.com', password='adminpass123', is_admin=True
+        )
+        directory.forget_counts()
+
+    def test_pages_are_projected(self):
+        with CaptureQueriesContext(connection) as queries:
+            first = directory.directory_page()
+            self.assertEqual([teacher.id for teacher in first], [teacher.id for teacher in self.teachers[:25]])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"search_text"', queries[0]['sql'])
+
+        second = directory.directory_page(after=first.next_cursor)
+        self.assertEqual(len(second), 15)
+        self.assertFalse(second.has_next())
+
+    def test_filters(self):
+        self.assertEqual(
+            {teacher.id for teacher in directory.directory_page(department=self.department.id)},
+            {self.teachers[1].id, self.teachers[2].id}
+        )
+        self.assertEqual(len(directory.directory_page(active=False)), 4)
+        self.assertEqual(directory.count(active=True), 36)
+        self.assertEqual(directory.parse_filters({'department': '3', 'active': '0'}), (3, False))
+        with self.assertRaises(KeyError):
+            directory.parse_filters({'active': 'maybe'})
+
+    def test_counts_are_cached_until_teachers_change(self):
+        self.assertEqual(directory.count(), 40)
+        with self.assertNumQueries(0):
+            self.assertEqual(directory.count(), 40)
+        with self.captureOnCommitCallbacks(execute=True):
+            Teacher.objects.get(id=self.teachers[0].id).delete()
+        self.assertEqual(directory.count(), 39)
+
+    def test_list_view(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('teacher_list'), {'active': '1'})
+        self.assertEqual(len(response.context['page_obj']), 25)
+        self.assertEqual(response.context['filter_query'], 'active=1')
+        self.assertContains(response, '36 teachers')
+
+        response = self.client.get(reverse('teacher_list'), {'after': 'garbage', 'department': 'x'})
+        self.assertEqual(len(response.context['page_obj']), 25)
+
+    def test_json_view(self):
+        self.client.force_login(self.admin)
+        data = self.client.get(reverse('teacher_list_json'), {'limit': 30}).json()
+        self.assertEqual(len(data['teachers']), 30)
+        self.assertEqual(data['count'], 40)
+        self.assertEqual(data['teachers'][0]['email'], 'teacher0@example.com')
+
+        data = self.client.get(reverse('teacher_list_json'), {'after': data['next']}).json()
+        self.assertEqual(len(data['teachers']), 10)
+        self.assertIsNone(data['next'])
+
+        self.assertEqual(self.client.get(reverse('teacher_list_json'), {'limit': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('teacher_list_json'), {'after': 'garbage'}).status_code, 400)
+
+
+class TeacherSearchTestCase(TestCase):
+    def setUp(self):
+        names = [('Anna', 'Smith'), ('Smitha', 'Rao'), ('John', 'Annas'), ('Maria', 'Lopez')]
+        self.teachers = [
+            Teacher.objects.create(
+                first_name=first, last_name=last, gender='Female', date_of_birth='1980-01-01',
+                mobile='1234567890', joining_date='2020-01-01', qualification='MSc', username=f'{first}{i}',
+                email=f'{first.lower()}@example.com', address='123 Street', city='City', state='State',
+                zip_code='12345', country='Country'
+            ) for i, (first, last) in enumerate(names)
+        ]
+        self.admin = get_user_model().objects.create_user(
+            username='admin@example.com', email='admin@example.com', password='adminpass123', is_admin=True
+        )
+        # Fresh cache keys for the search responses
+        directory.forget_counts()
+
+    def ids(self, query, **kwargs):
+        return [teacher.id for teacher in search.search_teachers(query, **kwargs)]
+
+    def test_search_text_follows_saves(self):
+        anna = self.teachers[0]
+        self.assertEqual(anna.search_text, f'anna smith anna@example.com {anna.teacher_id.lower()}')
+        anna.last_name = 'Jones'
+        anna.save(update_fields=['last_name'])
+        anna.refresh_from_db()
+        self.assertIn('jones', anna.search_text)
+        self.assertEqual(self.ids('jones'), [anna.id])
+
+    def test_ranks_email_and_name_prefix_hits_first(self):
+        anna, smitha, john, _ = self.teachers
+        self.assertEqual(self.ids('anna@example.com'), [anna.id])
+        self.assertEqual(self.ids('smit'), [smitha.id, anna.id])
+        self.assertEqual(self.ids('anna')[:1], [anna.id])
+        self.assertEqual(set(self.ids('anna')), {anna.id, john.id})
+        # Too short for trigrams: matches the start of any word, in document order
+        self.assertEqual(self.ids('JO'), [john.id])
+        self.assertEqual(self.ids('sm'), [anna.id, smitha.id])
+        self.assertEqual(self.ids('ma lo'), [self.teachers[3].id])
+
+    def test_exclusion_is_part_of_the_query(self):
+        semester = Semester.objects.create(
+            semester_name='Fall', academic_year='2025-2026', start_date='2025-09-01', end_date='2025-12-20',
+            department=Department.objects.create(department_name='Science', department_start_date='2020-01-01')
+        )
+        subject = SemesterSubject.objects.create(
+            semester=semester, subject=Subject.objects.create(subject_name='Algebra', class_name='10'),
+            teacher=self.teachers[0]
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(self.ids('smit', exclude_subject=subject.id), [self.teachers[1].id])
+
+    def test_view_caches_by_normalized_query(self):
+        self.client.force_login(self.admin)
+        url = reverse('semesters:search_teachers')
+        data = self.client.get(url, {'q': 'Smit'}).json()
+        self.assertEqual([teacher['id'] for teacher in data['teachers']], [self.teachers[1].id, self.teachers[0].id])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url, {'q': '  sMIT '}).json(), data)
+        self.assertFalse([query for query in queries if 'teachers_teacher' in query['sql']])
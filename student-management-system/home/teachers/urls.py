@@ -3,6 +3,7 @@ from . import views
 
 urlpatterns = [
     path("", views.teacher_list, name='teacher_list'),
+    path("json/", views.teacher_list_json, name='teacher_list_json'),
     path("add/", views.add_teacher, name="add_teacher"),
     path('view/<str:slug>/', views.view_teacher, name='view_teacher'),
     path('edit/<str:slug>/', views.edit_teacher, name='edit_teacher'),
@@ -1,8 +1,13 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseForbidden, JsonResponse
+from urllib.parse import urlencode
 from .models import Teacher
-from school.models import Notification
+from . import directory
+from department.models import Department
+from school.pagination import InvalidCursor
+from semesters.services import workload as workload_service
+from school.notifications import create_notification
 from home_auth.models import CustomUser
 from django.contrib.auth.hashers import make_password
 from django.utils.dateparse import parse_date
@@ -13,10 +18,6 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 def is_admin(user):
     return user.is_authenticated and user.is_admin
 
-def create_notification(user, message):
-    if user.is_authenticated:
-        Notification.objects.create(user=user, message=message)
-
 
 @login_required
 @user_passes_test(is_admin, login_url='index')
@@ -24,15 +25,55 @@ def teacher_list(request):
     if not request.user.is_admin:
         messages.error(request, 'Access denied. Admin access required')
         return redirect('index')
-    teachers = Teacher.objects.all()
-    unread_notification = request.user.notification_set.filter(is_read=False) if request.user.is_authenticated else []
+    try:
+        department, active = directory.parse_filters(request.GET)
+    except (KeyError, ValueError):
+        department, active = None, None
+
+    # Keyset pagination: ?after=/?before= cursors instead of OFFSET pages
+    try:
+        page_obj = directory.directory_page(department, active, request.GET.get('after'), request.GET.get('before'))
+    except InvalidCursor:
+        page_obj = directory.directory_page(department, active)
+
+    filters = {}
+    if department is not None:
+        filters['department'] = department
+    if active is not None:
+        filters['active'] = int(active)
+
     context = {
-        'teachers': teachers,
-        'unread_notification': unread_notification
+        'page_obj': page_obj,
+        'teacher_count': directory.count(department, active),
+        'departments': Department.objects.only('id', 'department_name'),
+        'current_department': department,
+        'current_active': filters.get('active', ''),
+        # Carried over to the pager links
+        'filter_query': urlencode(filters),
     }
     return render(request, "teachers/teachers.html", context)
 
 
+@login_required
+@user_passes_test(is_admin, login_url='index')
+def teacher_list_json(request):
+    """The teacher directory as JSON, in the shape the semesters teacher picker uses"""
+    try:
+        department, active = directory.parse_filters(request.GET)
+        per_page = min(int(request.GET.get('limit') or directory.PER_PAGE), directory.MAX_PER_PAGE)
+        if per_page < 1:
+            raise ValueError(per_page)
+        page = directory.directory_page(department, active, request.GET.get('after'), per_page=per_page)
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Invalid parameters'}, status=400)
+
+    return JsonResponse({
+        'teachers': [directory.teacher_json(teacher) for teacher in page],
+        'next': page.next_cursor,
+        'count': directory.count(department, active),
+    })
+
+
 @login_required
 @user_passes_test(is_admin, login_url='index')
 def add_teacher(request):
@@ -194,7 +235,8 @@ def view_teacher(request, slug):
         messages.error(request, 'Access denied. Admin login required')
     teacher = get_object_or_404(Teacher, slug=slug)
     context = {
-        'teacher': teacher
+        'teacher': teacher,
+        'workload': workload_service.teacher_workload(teacher),
     }
     return render(request, "teachers/teacher-details.html", context)
 